@@ -0,0 +1,120 @@
+"""Concurrent batch evaluation of many questions through the RAG workflow."""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from graph.budget import initial_state
+from graph.doc_refs import load_documents
+from utils import latency_summary
+from utils.events import bind_run
+from utils.telemetry import RunTelemetry, export_run, metrics
+
+
+def load_questions(path: Path) -> List[Dict[str, Any]]:
+    """
+    Read questions from a JSONL file.
+
+    Each line is an object with a ``question`` field and an optional ``id``
+    (defaults to the line number). Blank lines are skipped.
+
+    Args:
+        path: Input JSONL file
+
+    Returns:
+        List of ``{"id", "question"}`` records
+    """
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            records.append({"id": record.get("id", line_number), "question": record["question"]})
+    return records
+
+
+async def run_batch(
+    app,
+    questions: List[Dict[str, Any]],
+    output_path: Path,
+    concurrency: int = 8,
+) -> Dict[str, Any]:
+    """
+    Run questions through the compiled graph concurrently.
+
+    At most ``concurrency`` graph runs are in flight. Each result is appended to
+    ``output_path`` as soon as it completes, so partial output survives a crash.
+    A failed question is written with an ``error`` field and does not stop the batch.
+
+    Args:
+        app: Compiled LangGraph application
+        questions: Records from :func:`load_questions`
+        output_path: Output JSONL file (overwritten)
+        concurrency: Maximum concurrent graph runs
+
+    Returns:
+        Summary with counts, wall time, throughput, latency percentiles,
+        per-node latency percentiles and total estimated LLM cost
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run(record: Dict[str, Any]) -> Dict[str, Any]:
+        async with semaphore:
+            start = time.perf_counter()
+            telemetry = RunTelemetry()
+            try:
+                with bind_run(str(record["id"])):
+                    result = await app.ainvoke(
+                        initial_state(record["question"]), config={"callbacks": [telemetry]}
+                    )
+                output = {
+                    **record,
+                    "generation": result.get("generation"),
+                    "verified": result.get("verified", True),
+                    "web_search": result.get("web_search", False),
+                    "sources": document_sources(load_documents(result)),
+                }
+            except Exception as e:
+                output = {**record, "error": str(e)}
+            output["latency_s"] = round(time.perf_counter() - start, 4)
+            output["telemetry"] = telemetry.summary()
+            export_run(telemetry)
+            return output
+
+    latencies: List[float] = []
+    errors = 0
+    cost = 0.0
+    start = time.perf_counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as out:
+        for next_result in asyncio.as_completed([_run(record) for record in questions]):
+            output = await next_result
+            out.write(json.dumps(output, ensure_ascii=False) + "\n")
+            out.flush()
+            latencies.append(output["latency_s"])
+            errors += "error" in output
+            cost += output["telemetry"]["cost_usd"]
+    wall_time = time.perf_counter() - start
+
+    return {
+        "questions": len(questions),
+        "errors": errors,
+        "wall_time_s": wall_time,
+        "questions_per_s": len(questions) / wall_time if wall_time else 0.0,
+        "latency_s": latency_summary(latencies),
+        "node_latency_s": metrics.node_latency(),
+        "cost_usd": cost,
+    }
+
+
+def document_sources(documents: list) -> List[str]:
+    """Unique source URLs of a result's documents, in first-seen order."""
+    sources: List[str] = []
+    for doc in documents:
+        source: Optional[str] = getattr(doc, "metadata", {}).get("source")
+        if source and source not in sources:
+            sources.append(source)
+    return sources
@@ -0,0 +1,99 @@
+"""
+Benchmark approximate FAISS index types against the exact flat index.
+
+Uses synthetic clustered vectors (no API calls). For each index type it
+reports build time, serialized size, recall@k against flat search and
+single-query p50/p99 latency, across a few nprobe / efSearch settings.
+
+Usage:
+    python -m benchmarks.bench_ann_index
+    python -m benchmarks.bench_ann_index --vectors 200000 --dim 1536 --queries 1000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from retrieval.index import (
+    FLAT,
+    HNSW,
+    IVF_FLAT,
+    IVF_PQ,
+    configure_search,
+    create_index,
+    index_size_bytes,
+)
+from utils.stats import percentile
+
+
+def make_dataset(n: int, dim: int, queries: int, seed: int = 0):
+    """Gaussian clusters, roughly like topic-grouped document embeddings."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(8, n // 500), dim)).astype(np.float32)
+    assignments = rng.integers(len(centers), size=n + queries)
+    data = centers[assignments] + 0.35 * rng.normal(size=(n + queries, dim)).astype(np.float32)
+    data /= np.linalg.norm(data, axis=1, keepdims=True)
+    return np.ascontiguousarray(data[:n]), np.ascontiguousarray(data[n:])
+
+
+def measure(index, queries: np.ndarray, truth: np.ndarray, k: int) -> dict:
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        _, found = index.search(query[None, :], k)
+        latencies.append(time.perf_counter() - start)
+        hits += len(set(found[0]) & set(expected))
+    return {
+        "recall": hits / (len(queries) * k),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark ANN index types")
+    parser.add_argument("--vectors", type=int, default=50000, help="Indexed vectors")
+    parser.add_argument("--dim", type=int, default=256, help="Vector dimension")
+    parser.add_argument("--queries", type=int, default=500, help="Query vectors")
+    parser.add_argument("--k", type=int, default=20, help="Neighbours per query (fetch_k)")
+    args = parser.parse_args()
+
+    data, queries = make_dataset(args.vectors, args.dim, args.queries)
+
+    flat = create_index(data, FLAT)
+    flat.add(data)
+    _, truth = flat.search(queries, args.k)
+
+    settings = {
+        FLAT: [{}],
+        IVF_FLAT: [{"nprobe": p} for p in (4, 16, 64)],
+        HNSW: [{"ef_search": ef} for ef in (32, 64, 128)],
+        IVF_PQ: [{"nprobe": p} for p in (4, 16, 64)],
+    }
+
+    print(f"{args.vectors} vectors, dim {args.dim}, {args.queries} queries, recall@{args.k}\n")
+    print(
+        f"{'index':<9} {'setting':<14} {'build (s)':>9} {'size (MB)':>10} "
+        f"{'recall':>7} {'p50 (ms)':>9} {'p99 (ms)':>9}"
+    )
+    for index_type, search_settings in settings.items():
+        start = time.perf_counter()
+        index = create_index(data, index_type)
+        index.add(data)
+        build_time = time.perf_counter() - start
+        size_mb = index_size_bytes(index) / 1e6
+
+        for setting in search_settings:
+            configure_search(index, nprobe=setting.get("nprobe"), ef_search=setting.get("ef_search"))
+            result = measure(index, queries, truth, args.k)
+            label = ",".join(f"{key}={value}" for key, value in setting.items()) or "exact"
+            print(
+                f"{index_type:<9} {label:<14} {build_time:>9.2f} {size_mb:>10.1f} "
+                f"{result['recall']:>7.3f} {result['p50_ms']:>9.3f} {result['p99_ms']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark serial vs concurrent source fetching against a local HTTP fixture server.
+
+The fixture serves small HTML pages after a fixed delay, supports ETag
+revalidation (304 responses) and returns 404 for ``/missing/*`` so the
+failed-URL skip path is exercised. No external network access is needed.
+
+Usage:
+    python -m benchmarks.bench_fetch
+    python -m benchmarks.bench_fetch --pages 200 --latency 0.05 --workers 16
+"""
+
+import argparse
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from retrieval.sources import FAILED, UNCHANGED, HostThrottle, fetch_sources, new_session
+
+
+def make_handler(latency: float):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            if self.path.startswith("/missing/"):
+                self.send_error(404)
+                return
+
+            body = (
+                f"<html lang='en'><head><title>{self.path}</title></head>"
+                f"<body><p>Fixture page {self.path}</p></body></html>"
+            ).encode("utf-8")
+            etag = '"' + hashlib.md5(body).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def run(urls, workers: int, previous=None) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = fetch_sources(
+        urls,
+        previous=previous,
+        session=new_session(pool_size=workers, max_retries=0),
+        max_workers=workers,
+        # The fixture is a single host, so let every worker hit it at once
+        throttle=HostThrottle(max_concurrent=workers, min_interval=0.0),
+    )
+    return time.perf_counter() - start, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent source fetching")
+    parser.add_argument("--pages", type=int, default=50, help="Number of fixture pages")
+    parser.add_argument("--latency", type=float, default=0.05, help="Server delay per request (s)")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent fetch workers")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    urls = [f"{base}/page/{i}" for i in range(args.pages)] + [f"{base}/missing/0"]
+
+    try:
+        serial_time, serial_results = run(urls, workers=1)
+        parallel_time, parallel_results = run(urls, workers=args.workers)
+
+        failed = [r.url for r in parallel_results if r.status == FAILED]
+        assert failed == [f"{base}/missing/0"], failed
+        assert [r.url for r in serial_results] == [r.url for r in parallel_results] == urls
+
+        previous = {r.url: r.fingerprint for r in parallel_results if r.fingerprint}
+        revalidate_time, revalidated = run(urls, workers=args.workers, previous=previous)
+        unchanged = sum(r.status == UNCHANGED for r in revalidated)
+    finally:
+        server.shutdown()
+
+    print(f"Fixture: {len(urls)} URLs, {args.latency * 1000:.0f} ms server latency")
+    print(f"  serial (1 worker):        {serial_time:7.2f} s")
+    print(f"  concurrent ({args.workers} workers):  {parallel_time:7.2f} s "
+          f"({serial_time / parallel_time:.1f}x)")
+    print(f"  revalidation (ETag/304):  {revalidate_time:7.2f} s, {unchanged} unchanged")
+    print(f"  failed URLs skipped:      {len(failed)}")
+
+
+if __name__ == "__main__":
+    main()
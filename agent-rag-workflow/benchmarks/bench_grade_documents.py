@@ -0,0 +1,71 @@
+"""
+Benchmark sequential vs concurrent document grading.
+
+Uses a fake grader with a fixed per-call latency so no API calls are made.
+Sequential grading (max_concurrency=1) grows linearly with k; concurrent
+grading stays close to a single grader round-trip until k exceeds the cap.
+
+Usage:
+    python -m benchmarks.bench_grade_documents
+    python -m benchmarks.bench_grade_documents --latency 0.2 --concurrency 8
+"""
+
+import argparse
+import os
+import time
+
+# The grader module builds the shared ChatOpenAI client on import; no request is sent.
+os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.runnables import RunnableLambda  # noqa: E402
+
+from graph.chains.retrieval_grader import (  # noqa: E402
+    GradeDocuments,
+    grade_documents_batch,
+)
+
+
+def make_fake_grader(latency: float) -> RunnableLambda:
+    """Grader that sleeps for a fixed latency, then marks odd documents irrelevant."""
+
+    def _grade(inputs: dict) -> GradeDocuments:
+        time.sleep(latency)
+        relevant = int(inputs["document"].split()[-1]) % 2 == 0
+        return GradeDocuments(binary_score="yes" if relevant else "no")
+
+    return RunnableLambda(_grade)
+
+
+def time_grading(grader, documents, max_concurrency: int) -> tuple[float, list]:
+    start = time.perf_counter()
+    scores = grade_documents_batch(grader, "benchmark question", documents, max_concurrency)
+    return time.perf_counter() - start, scores
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark document grading concurrency")
+    parser.add_argument("--latency", type=float, default=0.1, help="Fake grader latency (s)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrency cap")
+    parser.add_argument(
+        "--k", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Documents per question"
+    )
+    args = parser.parse_args()
+
+    grader = make_fake_grader(args.latency)
+
+    print(f"Fake grader latency: {args.latency * 1000:.0f} ms, concurrency cap: {args.concurrency}")
+    print(f"{'k':>4} {'sequential (s)':>16} {'concurrent (s)':>16} {'speedup':>9}")
+    for k in args.k:
+        documents = [Document(page_content=f"chunk {i}") for i in range(k)]
+        seq_time, seq_scores = time_grading(grader, documents, max_concurrency=1)
+        con_time, con_scores = time_grading(grader, documents, args.concurrency)
+
+        # Concurrency must not change the grades or their order
+        assert [s.binary_score for s in seq_scores] == [s.binary_score for s in con_scores]
+
+        print(f"{k:>4} {seq_time:>16.3f} {con_time:>16.3f} {seq_time / con_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
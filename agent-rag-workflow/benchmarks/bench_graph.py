@@ -0,0 +1,209 @@
+"""
+End-to-end benchmark of the adaptive RAG graph, fully offline.
+
+Runs the compiled production graph against the fakes in :mod:`benchmarks.fakes`
+(scripted chat model with fixed latency, hash embeddings, canned web search)
+for each routing path:
+
+- vectorstore-happy: route -> retrieve -> grade -> generate -> useful
+- websearch:         route -> web search -> generate -> useful
+- regenerate-loop:   two ungrounded answers, regenerated until grounded
+- not-useful-loop:   answer misses the question -> web search -> generate
+
+For every scenario it records end-to-end latency percentiles, mean time per
+node, LLM calls per run and the node path, and writes them as JSON. With
+``--baseline`` it compares against an earlier result file and exits non-zero
+when latency regresses beyond the tolerance or the LLM-call count or path
+changes.
+
+Usage:
+    python -m benchmarks.bench_graph --output bench_graph.json
+    python -m benchmarks.bench_graph --baseline bench_graph.json --tolerance 0.2
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+from benchmarks.fakes import install_fakes
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "vectorstore-happy": {
+        "question": "How do agents use memory and planning?",
+        "script": {},
+    },
+    "websearch": {
+        "question": "Who won the most recent football world cup?",
+        "script": {"RouteQuery": [{"datasource": "websearch"}]},
+    },
+    "regenerate-loop": {
+        "question": "What is chain of thought prompting?",
+        "script": {
+            "GradeHallucinations": [
+                {"binary_score": False},
+                {"binary_score": False},
+                {"binary_score": True},
+            ]
+        },
+    },
+    "not-useful-loop": {
+        "question": "What are jailbreak attacks on LLMs?",
+        "script": {"GradeAnswer": [{"binary_score": False}, {"binary_score": True}]},
+    },
+}
+
+
+def run_scenario(app, fakes, name: str, iterations: int) -> Dict[str, Any]:
+    """
+    Run one scenario repeatedly and summarize it.
+
+    Args:
+        app: Compiled graph built against the fakes
+        fakes: Installed fakes (the LLM script is replaced per iteration)
+        name: Key into :data:`SCENARIOS`
+        iterations: Timed runs
+
+    Returns:
+        Latency summary, mean per-node time, LLM calls per run and node path
+    """
+    from graph.budget import initial_state
+    from utils import latency_summary
+    from utils.telemetry import RunTelemetry
+
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    node_times: Dict[str, List[float]] = defaultdict(list)
+    llm_calls = set()
+    paths = set()
+
+    for _ in range(iterations):
+        fakes.llm.set_script(scenario["script"])
+        telemetry = RunTelemetry()
+
+        start = time.perf_counter()
+        app.invoke(initial_state(scenario["question"]), config={"callbacks": [telemetry]})
+        latencies.append(time.perf_counter() - start)
+
+        summary = telemetry.summary()
+        for node, stats in summary["nodes"].items():
+            node_times[node].append(stats["time_s"])
+        llm_calls.add(summary["llm_calls"])
+        node_spans = sorted(
+            (span for span in telemetry.spans.values() if span.kind == "node"),
+            key=lambda span: span.start_ns,
+        )
+        paths.add(tuple(span.name for span in node_spans if not span.name.startswith("__")))
+
+    # Scripted runs are deterministic; more than one path or call count is a bug
+    assert len(paths) == 1 and len(llm_calls) == 1, f"{name}: nondeterministic run"
+
+    return {
+        "latency_s": latency_summary(latencies),
+        "node_time_s": {node: sum(times) / iterations for node, times in node_times.items()},
+        "llm_calls": llm_calls.pop(),
+        "path": list(paths.pop()),
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline file's results.
+
+    Args:
+        results: Output of this run
+        baseline: Output of an earlier run
+        tolerance: Allowed relative p50/p95 latency increase (0.2 = 20%)
+
+    Returns:
+        Human-readable regressions (empty if none)
+    """
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["path"] != previous["path"]:
+            regressions.append(f"{name}: path {previous['path']} -> {current['path']}")
+        if current["llm_calls"] > previous["llm_calls"]:
+            regressions.append(
+                f"{name}: LLM calls {previous['llm_calls']} -> {current['llm_calls']}"
+            )
+        for stat in ("p50", "p95"):
+            before, after = previous["latency_s"][stat], current["latency_s"][stat]
+            if before and after > before * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {stat} latency {before * 1000:.0f} ms -> {after * 1000:.0f} ms "
+                    f"(+{(after / before - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline end-to-end RAG graph benchmark")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed runs per scenario")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency (s)")
+    parser.add_argument(
+        "--search-latency", type=float, default=0.1, help="Fake web search latency (s)"
+    )
+    parser.add_argument(
+        "--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", type=Path, help="Write results JSON to this file")
+    parser.add_argument("--baseline", type=Path, help="Results JSON to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Allowed relative latency regression"
+    )
+    args = parser.parse_args()
+
+    fakes = install_fakes(llm_latency=args.llm_latency, search_latency=args.search_latency)
+    from graph.graph import app  # built against the fakes installed above
+
+    results = {
+        "config": {
+            "iterations": args.iterations,
+            "llm_latency_s": args.llm_latency,
+            "search_latency_s": args.search_latency,
+            "python": platform.python_version(),
+        },
+        "scenarios": {},
+    }
+
+    print(
+        f"Fake LLM latency {args.llm_latency * 1000:.0f} ms, "
+        f"search latency {args.search_latency * 1000:.0f} ms, {args.iterations} runs each\n"
+    )
+    print(f"{'scenario':<18} {'p50 (ms)':>9} {'p95 (ms)':>9} {'LLM calls':>10}  path")
+    for name in args.scenario:
+        # Warm-up run: first-call costs (prompt loading, index matrix) are not measured
+        run_scenario(app, fakes, name, iterations=1)
+        result = run_scenario(app, fakes, name, args.iterations)
+        results["scenarios"][name] = result
+        latency = result["latency_s"]
+        print(
+            f"{name:<18} {latency['p50'] * 1000:>9.1f} {latency['p95'] * 1000:>9.1f} "
+            f"{result['llm_calls']:>10}  {' -> '.join(result['path'])}"
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
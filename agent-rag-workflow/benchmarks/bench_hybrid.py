@@ -0,0 +1,151 @@
+"""
+Benchmark web-search fallbacks with dense vs hybrid (dense + BM25) retrieval.
+
+Runs a fixed set of keyword-heavy questions through the production graph with
+the offline fakes (:mod:`benchmarks.fakes`), once with the MMR retriever and
+once with it fused with a BM25 index (``RETRIEVAL_MODE=hybrid``). The document
+grader is a deterministic judge instead of a scripted "yes": a chunk is
+relevant when it mentions a corpus topic that the question names. Any
+irrelevant chunk makes ``grade_documents`` fall back to web search, as in
+production.
+
+For each mode it reports the fallback rate, mean relevant chunks per question,
+end-to-end latency percentiles and LLM calls per question.
+
+Usage:
+    python -m benchmarks.bench_hybrid
+    python -m benchmarks.bench_hybrid --llm-latency 0.2 --search-latency 0.5
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from langchain_core.messages import BaseMessage
+
+from benchmarks.fakes import TOPICS, build_fake_retriever, install_fakes
+
+# Each names one corpus topic, padded with words every chunk template shares
+QUESTIONS = [
+    "How do researchers evaluate jailbreak robustness with benchmarks?",
+    "What are practical tips for red teaming LLM systems?",
+    "When does prompt injection fail because the context window is exhausted?",
+    "Define token manipulation and its variants.",
+    "How is self-consistency measured for accuracy on benchmarks?",
+    "Give practical tips for few-shot prompting: start simple and iterate.",
+    "What is a common failure mode of chain of thought?",
+    "How are gradient-based attack methods evaluated for robustness?",
+    "What is task decomposition in LLM systems?",
+    "Practical tips for tool use: how should I measure and iterate?",
+    "How is instruction prompting defined, and what are its variants?",
+    "Which benchmarks measure retrieval augmentation accuracy?",
+]
+
+TOPIC_TERMS = [topic for topics in TOPICS.values() for topic in topics]
+
+
+def is_relevant(question: str, text: str) -> bool:
+    """A chunk is relevant when it mentions a topic the question names."""
+    question, text = question.lower(), text.lower()
+    return any(term in question and term in text for term in TOPIC_TERMS)
+
+
+def judge_relevance(messages: List[BaseMessage]) -> Dict[str, str]:
+    """Scripted GradeDocuments output applying :func:`is_relevant` to the grader prompt."""
+    document, _, question = str(messages[-1].content).rpartition("question:")
+    return {"binary_score": "yes" if is_relevant(question, document) else "no"}
+
+
+def run_mode(app, fakes, retriever_slot: list, retriever) -> Dict[str, Any]:
+    """
+    Run every question with one retriever.
+
+    Args:
+        app: Compiled graph built against the fakes
+        fakes: Installed fakes
+        retriever_slot: One-item list the patched ``get_retriever`` returns from
+        retriever: Retriever to use for this mode
+
+    Returns:
+        Fallback rate, mean relevant chunks, latency summary and mean LLM calls
+    """
+    from graph.budget import initial_state
+    from utils import latency_summary
+    from utils.telemetry import RunTelemetry
+
+    retriever_slot[0] = retriever
+    latencies: List[float] = []
+    fallbacks = relevant = llm_calls = 0
+    for question in QUESTIONS:
+        fakes.llm.set_script({"GradeDocuments": [judge_relevance]})
+        telemetry = RunTelemetry()
+        start = time.perf_counter()
+        result = app.invoke(initial_state(question), config={"callbacks": [telemetry]})
+        latencies.append(time.perf_counter() - start)
+
+        fallbacks += bool(result.get("web_search"))
+        documents = retriever.invoke(question)
+        relevant += sum(is_relevant(question, doc.page_content) for doc in documents)
+        llm_calls += telemetry.summary()["llm_calls"]
+
+    n = len(QUESTIONS)
+    return {
+        "fallback_rate": fallbacks / n,
+        "relevant_chunks": relevant / n,
+        "latency_s": latency_summary(latencies),
+        "llm_calls": llm_calls / n,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Web-search fallbacks: dense vs hybrid retrieval")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency (s)")
+    parser.add_argument(
+        "--search-latency", type=float, default=0.3, help="Fake web search latency (s)"
+    )
+    parser.add_argument(
+        "--candidates", type=int, default=10, help="Results per retriever before fusion"
+    )
+    args = parser.parse_args()
+
+    fakes = install_fakes(llm_latency=args.llm_latency, search_latency=args.search_latency)
+    import ingestion
+
+    # The retrieve node binds get_retriever when the graph is imported; swap what it returns
+    retriever_slot = [fakes.retriever]
+    ingestion.get_retriever = lambda *args, **kwargs: retriever_slot[0]
+    from graph.graph import app
+
+    modes = {
+        "dense": fakes.retriever,
+        "hybrid": build_fake_retriever(hybrid=True, candidates=args.candidates),
+    }
+
+    print(
+        f"{len(QUESTIONS)} questions, fake LLM latency {args.llm_latency * 1000:.0f} ms, "
+        f"search latency {args.search_latency * 1000:.0f} ms\n"
+    )
+    print(
+        f"{'mode':<8} {'fallbacks':>10} {'relevant/4':>11} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+        f"{'LLM calls':>10}"
+    )
+    results = {}
+    for mode, retriever in modes.items():
+        result = results[mode] = run_mode(app, fakes, retriever_slot, retriever)
+        latency = result["latency_s"]
+        print(
+            f"{mode:<8} {result['fallback_rate']:>10.0%} {result['relevant_chunks']:>11.2f} "
+            f"{latency['p50'] * 1000:>9.1f} {latency['p95'] * 1000:>9.1f} "
+            f"{result['llm_calls']:>10.1f}"
+        )
+
+    dense, hybrid = results["dense"], results["hybrid"]
+    print(
+        f"\nHybrid retrieval changes the fallback rate by "
+        f"{(hybrid['fallback_rate'] - dense['fallback_rate']) * 100:+.0f} points and mean "
+        f"latency by {(hybrid['latency_s']['mean'] - dense['latency_s']['mean']) * 1000:+.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
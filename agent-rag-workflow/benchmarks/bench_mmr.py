@@ -0,0 +1,61 @@
+"""
+Microbenchmark LangChain's MMR selection against the vectorized implementation.
+
+For each fetch_k, runs MMR for a batch of synthetic queries with both
+implementations, checks that they select the same candidates in the same
+order, and reports time per query.
+
+Usage:
+    python -m benchmarks.bench_mmr
+    python -m benchmarks.bench_mmr --fetch-k 20 200 2000 --k 10 --queries 64
+"""
+
+import argparse
+import time
+
+import numpy as np
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
+
+from retrieval.mmr import mmr_select, normalize_rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MMR implementations")
+    parser.add_argument("--fetch-k", type=int, nargs="+", default=[20, 100, 500, 2000])
+    parser.add_argument("--k", type=int, default=4, help="Documents selected per query")
+    parser.add_argument("--lambda-mult", type=float, default=0.7)
+    parser.add_argument("--queries", type=int, default=32, help="Queries per batch")
+    parser.add_argument("--dim", type=int, default=1536, help="Embedding dimension")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"k={args.k}, lambda_mult={args.lambda_mult}, {args.queries} queries, dim {args.dim}\n")
+    print(f"{'fetch_k':>8} {'langchain (ms/q)':>17} {'native (ms/q)':>14} {'speedup':>8} {'match':>6}")
+
+    for fetch_k in args.fetch_k:
+        queries = normalize_rows(rng.normal(size=(args.queries, args.dim)))
+        candidates = normalize_rows(rng.normal(size=(args.queries, fetch_k, args.dim)))
+        valid = np.ones((args.queries, fetch_k), dtype=bool)
+
+        start = time.perf_counter()
+        expected = [
+            maximal_marginal_relevance(
+                queries[b : b + 1], list(candidates[b]), lambda_mult=args.lambda_mult, k=args.k
+            )
+            for b in range(args.queries)
+        ]
+        langchain_time = (time.perf_counter() - start) / args.queries
+
+        start = time.perf_counter()
+        selected = mmr_select(queries, candidates, valid, args.k, args.lambda_mult)
+        native_time = (time.perf_counter() - start) / args.queries
+
+        matches = sum(list(row) == picks for row, picks in zip(selected.tolist(), expected))
+        print(
+            f"{fetch_k:>8} {langchain_time * 1000:>17.3f} {native_time * 1000:>14.3f} "
+            f"{langchain_time / native_time:>7.1f}x {matches:>3}/{args.queries}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark the cost of a mid-run failure with and without checkpointing.
+
+Uses the offline fakes (:mod:`benchmarks.fakes`). The answer grader fails once
+with a simulated API error, after the router, retrieval, document grading,
+generation and hallucination grading have already been paid for. Then the run
+is recovered two ways:
+
+- restart: invoke the graph again from scratch (no checkpointer)
+- resume:  checkpoint to SQLite and continue the failed thread with invoke(None)
+
+For each strategy it reports the time, LLM calls and prompt/completion tokens
+spent on recovery, i.e. after the failure, and how much resuming saves.
+
+Usage:
+    python -m benchmarks.bench_resume
+    python -m benchmarks.bench_resume --llm-latency 0.2 --runs 5
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+from benchmarks.fakes import install_fakes
+
+QUESTION = "How do agents use memory and planning?"
+
+# Everything passes except the first answer-grader call, which raises
+FAILING_SCRIPT = {"GradeAnswer": [RuntimeError("simulated API outage"), {"binary_score": True}]}
+
+
+def _recover(app, fakes, config: Dict[str, Any], resume: bool) -> Dict[str, Any]:
+    from graph.budget import initial_state
+    from utils.telemetry import RunTelemetry
+
+    fakes.llm.set_script(FAILING_SCRIPT)
+    try:
+        app.invoke(initial_state(QUESTION), config=config)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("the scripted failure did not happen")
+
+    telemetry = RunTelemetry()
+    start = time.perf_counter()
+    recovery_input = None if resume else initial_state(QUESTION)
+    result = app.invoke(recovery_input, config={**config, "callbacks": [telemetry]})
+    elapsed = time.perf_counter() - start
+
+    assert result.get("generation"), "recovery did not produce an answer"
+    summary = telemetry.summary()
+    return {
+        "time_s": elapsed,
+        "llm_calls": summary["llm_calls"],
+        "tokens": summary["prompt_tokens"] + summary["completion_tokens"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark resume-after-failure savings")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM latency (s)")
+    parser.add_argument("--runs", type=int, default=3, help="Failures recovered per strategy")
+    args = parser.parse_args()
+
+    fakes = install_fakes(llm_latency=args.llm_latency)
+    from graph.checkpoint import new_thread_id, open_checkpointer, thread_config
+    from graph.graph import app, build_app
+
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpointed_app = build_app(open_checkpointer(str(Path(tmp) / "checkpoints.sqlite")))
+
+        totals = {"restart": [], "resume": []}
+        for _ in range(args.runs):
+            totals["restart"].append(_recover(app, fakes, {}, resume=False))
+            config = thread_config(new_thread_id())
+            totals["resume"].append(_recover(checkpointed_app, fakes, config, resume=True))
+
+    print(f"Fake LLM latency {args.llm_latency * 1000:.0f} ms, {args.runs} failures each\n")
+    print(f"{'strategy':<10} {'recovery (ms)':>14} {'LLM calls':>10} {'tokens':>8}")
+    means = {}
+    for strategy, runs in totals.items():
+        means[strategy] = {key: sum(r[key] for r in runs) / len(runs) for key in runs[0]}
+        mean = means[strategy]
+        print(
+            f"{strategy:<10} {mean['time_s'] * 1000:>14.1f} {mean['llm_calls']:>10.1f} "
+            f"{mean['tokens']:>8.0f}"
+        )
+
+    restart, resume = means["restart"], means["resume"]
+    print(
+        f"\nResuming saves {(restart['time_s'] - resume['time_s']) * 1000:.0f} ms, "
+        f"{restart['llm_calls'] - resume['llm_calls']:.0f} LLM calls and "
+        f"{restart['tokens'] - resume['tokens']:.0f} tokens per failure"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark the embedding fast path of route_question against the router LLM.
+
+Uses the offline fakes (:mod:`benchmarks.fakes`); topic centroids come from
+the synthetic corpus the way a vectorstore save computes them. A fixed set of
+on-topic and off-topic questions is routed:
+
+1. By similarity alone, showing each question's similarity to the closest topic
+   and whether the fast path decides it (and agrees with the expected route)
+2. Through the whole graph with the fast path off and on. The fake router LLM
+   always answers correctly, so only its latency and call count differ
+
+Usage:
+    python -m benchmarks.bench_router
+    python -m benchmarks.bench_router --vectorstore 0.35 --websearch 0.1 --llm-latency 0.3
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List
+
+from langchain_core.messages import BaseMessage
+
+from benchmarks.fakes import install_fakes
+
+VECTORSTORE = "vectorstore"
+WEBSEARCH = "websearch"
+
+QUESTIONS = {
+    "How do agents use memory and planning?": VECTORSTORE,
+    "What is task decomposition for an LLM agent?": VECTORSTORE,
+    "What is chain of thought prompting?": VECTORSTORE,
+    "How does few-shot prompting work?": VECTORSTORE,
+    "Explain self-consistency in prompt engineering.": VECTORSTORE,
+    "What are jailbreak attacks on LLMs?": VECTORSTORE,
+    "How does prompt injection work?": VECTORSTORE,
+    "What is red teaming for language models?": VECTORSTORE,
+    "Who won the most recent football world cup?": WEBSEARCH,
+    "What is the weather in Paris tomorrow?": WEBSEARCH,
+    "What is the current price of bitcoin?": WEBSEARCH,
+    "When is the next solar eclipse?": WEBSEARCH,
+    "How do I bake sourdough bread?": WEBSEARCH,
+    "What are the latest Python release notes?": WEBSEARCH,
+}
+
+
+def judge_route(messages: List[BaseMessage]) -> Dict[str, str]:
+    """Scripted RouteQuery output: the expected route for the question asked."""
+    return {"datasource": QUESTIONS[str(messages[-1].content)]}
+
+
+def run_graph(app, fakes) -> Dict[str, Any]:
+    """Run every question through the graph; mean latency, LLM calls and router calls."""
+    from graph.budget import initial_state
+    from utils.telemetry import RunTelemetry
+
+    latency = llm_calls = router_calls = 0.0
+    for question in QUESTIONS:
+        fakes.llm.set_script({"RouteQuery": [judge_route]})
+        telemetry = RunTelemetry()
+        start = time.perf_counter()
+        app.invoke(initial_state(question), config={"callbacks": [telemetry]})
+        latency += time.perf_counter() - start
+        llm_calls += telemetry.summary()["llm_calls"]
+        router_calls += fakes.llm.calls().get("RouteQuery", 0)
+
+    n = len(QUESTIONS)
+    return {"latency_s": latency / n, "llm_calls": llm_calls / n, "router_calls": router_calls / n}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Embedding router fast path vs router LLM")
+    parser.add_argument(
+        "--vectorstore", type=float, default=0.3, help="Route to vectorstore at or above"
+    )
+    parser.add_argument("--websearch", type=float, default=0.15, help="Route to web at or below")
+    parser.add_argument("--llm-latency", type=float, default=0.1, help="Fake LLM latency (s)")
+    args = parser.parse_args()
+
+    fakes = install_fakes(llm_latency=args.llm_latency)
+    from graph import topic_router
+    from graph.graph import app
+
+    print(f"Fast path: vectorstore >= {args.vectorstore}, web search <= {args.websearch}\n")
+    print(f"{'similarity':>10}  {'expected':<11} {'fast path':<11} question")
+    decided = agreed = 0
+    for question, expected in QUESTIONS.items():
+        route = topic_router.route(question, args.vectorstore, args.websearch)
+        decided += route.datasource is not None
+        agreed += route.datasource == expected
+        mark = "" if route.datasource in (None, expected) else "  ✗"
+        print(
+            f"{route.similarity:>10.3f}  {expected:<11} {route.datasource or '(LLM)':<11} "
+            f"{question}{mark}"
+        )
+    print(
+        f"\nFast path decided {decided}/{len(QUESTIONS)} questions, "
+        f"{agreed}/{decided or 1} as expected\n"
+    )
+
+    modes = {"llm": (None, None), "fast": (args.vectorstore, args.websearch)}
+    results = {}
+    for mode, (vectorstore, websearch) in modes.items():
+        topic_router.ROUTER_VECTORSTORE_SIMILARITY = vectorstore
+        topic_router.ROUTER_WEBSEARCH_SIMILARITY = websearch
+        results[mode] = run_graph(app, fakes)
+
+    print(f"{'router':<6} {'mean (ms)':>10} {'LLM calls':>10} {'router calls':>13}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<6} {result['latency_s'] * 1000:>10.1f} {result['llm_calls']:>10.2f} "
+            f"{result['router_calls']:>13.2f}"
+        )
+    saved = results["llm"]["latency_s"] - results["fast"]["latency_s"]
+    print(f"\nFast path saves {saved * 1000:.0f} ms per question on average")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark CLI cold-start time.
+
+Each measurement runs in a fresh interpreter so import costs are included:
+- ``main.py --help``: argument parsing only, must not build the graph
+- ``import graph.graph``: compiling the workflow, must not touch the network
+- first retriever load: opening the local vectorstore on first use
+
+Usage:
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "main.py --help": [sys.executable, "main.py", "--help"],
+    "import graph.graph": [sys.executable, "-c", "import graph.graph"],
+    "first retriever load": [
+        sys.executable,
+        "-c",
+        "from ingestion import get_retriever; get_retriever()",
+    ],
+}
+
+
+def time_command(command: list[str], runs: int) -> list[float]:
+    # Dummy keys let the OpenAI/Tavily clients be constructed; no request is sent
+    env = {
+        "OPENAI_API_KEY": "sk-offline-benchmark",
+        "TAVILY_API_KEY": "tvly-offline-benchmark",
+        **os.environ,
+        "LANGSMITH_API_KEY": "",
+    }
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_ROOT, env=env, check=True, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per scenario")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<24} {'median (s)':>11} {'min (s)':>9} {'max (s)':>9}")
+    for name, command in SCENARIOS.items():
+        timings = time_command(command, args.runs)
+        print(
+            f"{name:<24} {statistics.median(timings):>11.3f} "
+            f"{min(timings):>9.3f} {max(timings):>9.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
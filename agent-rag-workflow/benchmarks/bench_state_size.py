@@ -0,0 +1,107 @@
+"""
+Benchmark checkpoint size with full documents vs compact doc refs in state.
+
+Runs each scenario of :mod:`benchmarks.bench_graph` against the offline fakes
+with a SQLite checkpointer, once with ``documents`` (full ``Document`` objects)
+and once with ``doc_refs`` (chunk IDs pointing into the chunk store, see
+:mod:`graph.doc_refs`). It reports the bytes the checkpointer wrote per run:
+the state snapshots plus the pending node writes.
+
+The synthetic chunks are padded to ``--chunk-chars`` (ingestion splits at 500)
+so the text carried in state is the size it would be in production.
+
+Usage:
+    python -m benchmarks.bench_state_size
+    python -m benchmarks.bench_state_size --chunk-chars 1000 --scenario websearch
+"""
+
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict
+
+from benchmarks.bench_graph import SCENARIOS
+from benchmarks.fakes import HashEmbeddings, install_fakes, synthetic_corpus
+
+MODES = {"documents": False, "doc_refs": True}
+
+
+def install_padded_retriever(chunk_chars: int) -> None:
+    """Replace the fake retriever with one over chunks padded to ``chunk_chars``."""
+    from langchain_core.documents import Document
+
+    import ingestion
+    from retrieval.index import FLAT, build_vectorstore
+
+    documents = []
+    for doc in synthetic_corpus():
+        repeats = max(1, chunk_chars // len(doc.page_content))
+        text = " ".join([doc.page_content] * repeats)[:chunk_chars]
+        documents.append(Document(page_content=text, metadata=doc.metadata))
+    ids = [f"chunk-{i}" for i in range(len(documents))]
+    vectorstore = build_vectorstore(documents, ids, HashEmbeddings(), FLAT)
+    retriever = vectorstore.as_retriever(
+        search_type="mmr", search_kwargs={"k": 4, "fetch_k": 20, "lambda_mult": 0.7}
+    )
+    ingestion.get_retriever = lambda *args, **kwargs: retriever
+
+
+def checkpoint_bytes(checkpointer, thread_id: str) -> Dict[str, int]:
+    """Bytes of state snapshots and node writes stored for a thread."""
+    snapshots, writes = (
+        checkpointer.conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(LENGTH({column})), 0) FROM {table} WHERE thread_id = ?",
+            (thread_id,),
+        ).fetchone()
+        for table, column in (("checkpoints", "checkpoint"), ("writes", "value"))
+    )
+    return {
+        "steps": snapshots[0],
+        "snapshot_bytes": snapshots[1],
+        "write_bytes": writes[1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Checkpoint size of doc refs vs documents")
+    parser.add_argument("--chunk-chars", type=int, default=500, help="Characters per chunk")
+    parser.add_argument(
+        "--scenario", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    args = parser.parse_args()
+
+    fakes = install_fakes()
+    install_padded_retriever(args.chunk_chars)
+    from graph import doc_refs
+    from graph.budget import initial_state
+    from graph.checkpoint import new_thread_id, open_checkpointer, thread_config
+    from graph.graph import build_app
+
+    print(f"Chunks padded to {args.chunk_chars} chars\n")
+    print(
+        f"{'scenario':<18} {'mode':<10} {'steps':>6} {'snapshots':>10} {'writes':>9} {'total':>9}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpointer = open_checkpointer(str(Path(tmp) / "checkpoints.sqlite"))
+        app = build_app(checkpointer)
+        for name in args.scenario:
+            scenario = SCENARIOS[name]
+            totals = {}
+            for mode, use_refs in MODES.items():
+                doc_refs.STATE_DOC_REFS = use_refs
+                fakes.llm.set_script(scenario["script"])
+                thread_id = new_thread_id()
+                app.invoke(initial_state(scenario["question"]), config=thread_config(thread_id))
+
+                size = checkpoint_bytes(checkpointer, thread_id)
+                totals[mode] = size["snapshot_bytes"] + size["write_bytes"]
+                print(
+                    f"{name:<18} {mode:<10} {size['steps']:>6} {size['snapshot_bytes']:>10,} "
+                    f"{size['write_bytes']:>9,} {totals[mode]:>9,}"
+                )
+            saved = 1 - totals["doc_refs"] / totals["documents"]
+            print(f"{'':<18} doc refs write {saved:.0%} fewer bytes\n")
+
+
+if __name__ == "__main__":
+    main()
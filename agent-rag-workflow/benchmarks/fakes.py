@@ -0,0 +1,327 @@
+"""
+Deterministic offline stand-ins for the chat model, embeddings, retriever and Tavily.
+
+:func:`install_fakes` swaps them into the application modules *before* the
+graph is imported, so the compiled graph, chains and nodes are the production
+code paths with only the external services replaced:
+
+- ``model.model.llm`` / ``uncached_llm`` -> :class:`FakeChatModel`, which answers
+  ``with_structured_output`` calls from a per-schema script and sleeps for a
+  configurable latency
+- ``ingestion.get_retriever`` -> FAISS MMR retriever over a synthetic corpus
+  embedded with :class:`HashEmbeddings`
+- ``ingestion.get_topic_centroids`` -> centroids of that corpus, computed the
+  way a vectorstore save does
+- ``graph.nodes.web_search.get_web_search_tool`` -> :class:`FakeSearchTool`
+
+Usage::
+
+    from benchmarks.fakes import install_fakes
+
+    fakes = install_fakes(llm_latency=0.05)
+    from graph.graph import app  # built against the fakes
+
+    fakes.llm.set_script({"RouteQuery": [{"datasource": "websearch"}]})
+"""
+
+import hashlib
+import importlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import PrivateAttr
+
+# Script key for plain-text generations (the RAG answer chain)
+TEXT = "text"
+
+# Used when a script has no entry for a schema: the "everything passes" path
+DEFAULT_SCRIPT: Dict[str, List[Any]] = {
+    "RouteQuery": [{"datasource": "vectorstore"}],
+    "GradeDocuments": [{"binary_score": "yes"}],
+    "GradeHallucinations": [{"binary_score": True}],
+    "GradeAnswer": [{"binary_score": True}],
+    TEXT: ["Agents combine planning, memory and tool use around an LLM core."],
+}
+
+TOPICS = {
+    "https://lilianweng.github.io/posts/2023-06-23-agent/": [
+        "agent", "planning", "memory", "tool use", "reflection", "task decomposition",
+    ],
+    "https://lilianweng.github.io/posts/2023-03-15-prompt-engineering/": [
+        "prompt engineering", "few-shot prompting", "chain of thought", "instruction prompting",
+        "self-consistency", "retrieval augmentation",
+    ],
+    "https://lilianweng.github.io/posts/2023-10-25-adv-attack-llm/": [
+        "adversarial attack", "jailbreak", "prompt injection", "token manipulation",
+        "red teaming", "gradient-based attack",
+    ],
+}
+
+TEMPLATES = [
+    "{topic} is a core idea in LLM systems; this section defines {topic} and its variants.",
+    "Researchers evaluate {topic} with benchmarks that measure accuracy and robustness.",
+    "A common failure mode of {topic} appears when the context window is exhausted.",
+    "Practical tips for {topic}: start simple, measure, and iterate on examples.",
+]
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Chat model that replays scripted outputs after a fixed latency.
+
+    The script maps a structured-output schema name (e.g. ``"GradeDocuments"``)
+    or :data:`TEXT` to a list of outputs returned in order; the last output
+    repeats once the list is used up. An exception instance in the list is
+    raised instead, to simulate an API failure; a callable is called with the
+    prompt messages and its return value used, to judge the actual input.
+    Structured outputs go through ``_generate`` as JSON, so callbacks and
+    telemetry see a real LLM call.
+    """
+
+    latency: float = 0.0
+    model_name: str = "fake-chat"
+
+    _script: Dict[str, List[Any]] = PrivateAttr(default_factory=dict)
+    _calls: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-scripted-chat"
+
+    def set_script(self, script: Dict[str, List[Any]]) -> None:
+        """Replace the script (missing schemas use :data:`DEFAULT_SCRIPT`) and reset counters."""
+        with self._lock:
+            self._script = {**DEFAULT_SCRIPT, **script}
+            self._calls = {}
+
+    def calls(self) -> Dict[str, int]:
+        """Calls per script key since the last :meth:`set_script`."""
+        with self._lock:
+            return dict(self._calls)
+
+    def _next_output(self, key: str) -> Any:
+        with self._lock:
+            outputs = self._script.get(key) or DEFAULT_SCRIPT[key]
+            n = self._calls.get(key, 0)
+            self._calls[key] = n + 1
+            return outputs[min(n, len(outputs) - 1)]
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        schema_name: str = TEXT,
+        **kwargs: Any,
+    ) -> ChatResult:
+        output = self._next_output(schema_name)
+        time.sleep(self.latency)
+        if isinstance(output, BaseException):
+            raise output
+        if callable(output):
+            output = output(messages)
+
+        content = output if schema_name == TEXT else json.dumps(output)
+        prompt_tokens = sum(len(str(m.content)) for m in messages) // 4
+        completion_tokens = max(1, len(content) // 4)
+        message = AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"model_name": self.model_name},
+        )
+
+    def with_structured_output(self, schema: Any, **kwargs: Any) -> Runnable:
+        def _parse(message: AIMessage) -> Any:
+            return schema.model_validate_json(message.content)
+
+        return self.bind(schema_name=schema.__name__) | RunnableLambda(_parse)
+
+
+class HashEmbeddings(Embeddings):
+    """
+    Deterministic bag-of-words embeddings using the hashing trick.
+
+    Each lowercase word (and word bigram) is hashed into one of ``size``
+    buckets with a hash-derived sign; vectors are L2-normalized. Texts that
+    share words get similar vectors, so retrieval behaves plausibly without a
+    model or network.
+    """
+
+    def __init__(self, size: int = 256):
+        self.size = size
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        words = re.findall(r"[a-z0-9]+", text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.size
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(text)
+
+
+class FakeSearchTool:
+    """Tavily stand-in returning canned results for any query after a fixed latency."""
+
+    def __init__(self, latency: float = 0.0, max_results: int = 3):
+        self.latency = latency
+        self.max_results = max_results
+        self.calls = 0
+
+    def invoke(self, input: Dict[str, Any], config: Optional[Dict[str, Any]] = None) -> Dict:
+        self.calls += 1
+        time.sleep(self.latency)
+        query = input["query"]
+        return {
+            "query": query,
+            "results": [
+                {
+                    "url": f"https://example.com/search/{i}",
+                    "title": f"Result {i} for {query}",
+                    "content": f"Web result {i}: background information about {query}.",
+                    "score": 1.0 - i / 10,
+                }
+                for i in range(self.max_results)
+            ],
+        }
+
+
+def synthetic_corpus() -> List[Document]:
+    """Small fixed corpus shaped like the three ingested blog posts."""
+    return [
+        Document(page_content=template.format(topic=topic), metadata={"source": url})
+        for url, topics in TOPICS.items()
+        for topic in topics
+        for template in TEMPLATES
+    ]
+
+
+def build_fake_retriever(
+    embeddings: Optional[Embeddings] = None, hybrid: bool = False, candidates: int = 10
+) -> BaseRetriever:
+    """
+    FAISS MMR retriever over :func:`synthetic_corpus`, configured like ingestion's.
+
+    Args:
+        embeddings: Embedding model (default :class:`HashEmbeddings`)
+        hybrid: Fuse with a BM25 index like ``RETRIEVAL_MODE=hybrid``
+        candidates: Results per retriever before fusion, with ``hybrid``
+
+    Returns:
+        Retriever returning 4 documents
+    """
+    from retrieval.index import FLAT, build_vectorstore
+
+    documents = synthetic_corpus()
+    ids = [f"chunk-{i}" for i in range(len(documents))]
+    vectorstore = build_vectorstore(documents, ids, embeddings or HashEmbeddings(), FLAT)
+    mmr_kwargs = {"k": 4, "fetch_k": 20, "lambda_mult": 0.7}
+    if not hybrid:
+        return vectorstore.as_retriever(search_type="mmr", search_kwargs=mmr_kwargs)
+
+    from retrieval.bm25 import BM25_FILENAME, BM25Index, write_bm25
+    from retrieval.hybrid import HybridRetriever
+
+    path = Path(tempfile.mkdtemp(prefix="fake-bm25-")) / BM25_FILENAME
+    write_bm25(path, zip(ids, (doc.page_content for doc in documents)))
+    dense = vectorstore.as_retriever(
+        search_type="mmr", search_kwargs={**mmr_kwargs, "k": candidates}
+    )
+    return HybridRetriever(
+        vectorstore=vectorstore, dense=dense, keyword=BM25Index(path), candidates=candidates
+    )
+
+
+def fake_topic_centroids(retriever: BaseRetriever):
+    """Topic centroids of a fake retriever's corpus, as saved with a real vectorstore."""
+    from retrieval.centroids import compute_centroids
+
+    vectorstore = retriever.vectorstore
+    index = vectorstore.index
+    sources = [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[position]).metadata["source"]
+        for position in range(index.ntotal)
+    ]
+    return compute_centroids(index.reconstruct_n(0, index.ntotal), sources)
+
+
+class Fakes(NamedTuple):
+    llm: FakeChatModel
+    search: FakeSearchTool
+    retriever: BaseRetriever
+
+
+def install_fakes(
+    llm_latency: float = 0.0, search_latency: float = 0.0, quiet: bool = True
+) -> Fakes:
+    """
+    Patch the application modules to use offline fakes.
+
+    Must run before ``graph.graph`` (or any chain module) is imported, since the
+    chains bind ``model.model.llm`` at import time.
+
+    Args:
+        llm_latency: Seconds each fake LLM call sleeps
+        search_latency: Seconds each fake web search sleeps
+        quiet: Drop workflow events instead of keeping whatever sink is configured
+
+    Returns:
+        The installed fakes
+    """
+    # Constructing the real clients needs keys; they are replaced before any request
+    os.environ.setdefault("OPENAI_API_KEY", "sk-offline-benchmark")
+    os.environ.setdefault("TAVILY_API_KEY", "tvly-offline-benchmark")
+
+    import ingestion
+    import model.model
+    from utils import events
+
+    llm = FakeChatModel(latency=llm_latency)
+    llm.set_script({})
+    model.model.llm = llm
+    model.model.uncached_llm = llm
+
+    retriever = build_fake_retriever()
+    ingestion.get_retriever = lambda *args, **kwargs: retriever
+    centroids = fake_topic_centroids(retriever)
+    ingestion.get_topic_centroids = lambda: centroids
+
+    # graph.nodes re-exports the node function under the module's name
+    web_search_module = importlib.import_module("graph.nodes.web_search")
+
+    search = FakeSearchTool(latency=search_latency)
+    web_search_module.get_web_search_tool = lambda: search
+
+    if quiet:
+        events.set_sink(events.NullSink())
+
+    return Fakes(llm=llm, search=search, retriever=retriever)
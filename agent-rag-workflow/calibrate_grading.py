@@ -0,0 +1,172 @@
+"""
+Calibrate the similarity gate thresholds from labelled examples.
+
+Reads a JSONL file of graded chunks, one per line::
+
+    {"question": "...", "document": "chunk text", "relevant": true}
+    {"similarity": 0.83, "relevant": false}
+
+Labels can be human judgements or grades the LLM grader already gave. Rows
+without a ``similarity`` are embedded with the configured embedding model
+(chunk embeddings come from the embedding cache when ingestion saw them).
+
+It picks the lowest accept threshold and the highest reject threshold at which
+the gate's decisions agree with the labels at least ``--target`` of the time,
+reports how many grader calls they would skip on this data, and prints the
+settings for .env (see graph.similarity_gate).
+
+Usage:
+    python calibrate_grading.py labelled.jsonl
+    python calibrate_grading.py labelled.jsonl --target 0.98 --min-support 20
+"""
+
+import argparse
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+
+class Calibration(NamedTuple):
+    accept: Optional[float]
+    reject: Optional[float]
+    accepted: int
+    rejected: int
+    accept_errors: int
+    reject_errors: int
+    total: int
+
+    @property
+    def skip_rate(self) -> float:
+        return (self.accepted + self.rejected) / self.total if self.total else 0.0
+
+
+def load_examples(path: Path) -> List[Tuple[float, bool]]:
+    """
+    Read labelled examples, embedding those without a similarity.
+
+    Args:
+        path: Labelled JSONL file
+
+    Returns:
+        ``(similarity, relevant)`` pairs
+    """
+    lines = path.read_text(encoding="utf-8").splitlines()
+    rows = [json.loads(line) for line in lines if line.strip()]
+    unscored = [row for row in rows if row.get("similarity") is None]
+    if unscored:
+        from model.embeddings import get_embeddings
+
+        embeddings = get_embeddings()
+        questions = {row["question"]: None for row in unscored}
+        query_vectors = {question: embeddings.embed_query(question) for question in questions}
+        document_vectors = embeddings.embed_documents([row["document"] for row in unscored])
+        for row, vector in zip(unscored, document_vectors):
+            row["similarity"] = _cosine(query_vectors[row["question"]], vector)
+    return [(float(row["similarity"]), bool(row["relevant"])) for row in rows]
+
+
+def calibrate(
+    examples: List[Tuple[float, bool]], target: float = 0.95, min_support: int = 10
+) -> Calibration:
+    """
+    Choose gate thresholds that keep gate decisions at ``target`` agreement.
+
+    The accept threshold is the lowest similarity ``t`` such that at least
+    ``target`` of the examples with similarity >= ``t`` are relevant; the
+    reject threshold is the highest ``t`` below it such that at least
+    ``target`` of the examples with similarity <= ``t`` are not. A side that
+    would decide fewer than ``min_support`` examples is left unset.
+
+    Args:
+        examples: ``(similarity, relevant)`` pairs
+        target: Required agreement with the labels on each side
+        min_support: Fewest examples a threshold must decide
+
+    Returns:
+        Thresholds and how they perform on ``examples``
+    """
+    accept, accepted, accept_errors = _best_threshold(
+        sorted(examples, key=lambda e: e[0], reverse=True), True, target, min_support
+    )
+    below = [e for e in examples if accept is None or e[0] < accept]
+    reject, rejected, reject_errors = _best_threshold(
+        sorted(below, key=lambda e: e[0]), False, target, min_support
+    )
+    return Calibration(
+        accept, reject, accepted, rejected, accept_errors, reject_errors, len(examples)
+    )
+
+
+def _best_threshold(
+    ordered: List[Tuple[float, bool]], label: bool, target: float, min_support: int
+) -> Tuple[Optional[float], int, int]:
+    """Walk examples from most to least confident; keep the widest cut that meets ``target``."""
+    best: Tuple[Optional[float], int, int] = (None, 0, 0)
+    agree = 0
+    for i, (similarity, relevant) in enumerate(ordered):
+        agree += relevant == label
+        decided = i + 1
+        # Only cut between distinct similarities; ties are decided together
+        if decided < len(ordered) and ordered[decided][0] == similarity:
+            continue
+        if decided >= min_support and agree / decided >= target:
+            best = (similarity, decided, decided - agree)
+    return best
+
+
+def _cosine(a: List[float], b: List[float]) -> float:
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(x * x for x in b))
+    return sum(x * y for x, y in zip(a, b)) / norm if norm else 0.0
+
+
+def _env_lines(calibration: Calibration) -> Dict[str, str]:
+    # Full precision: a rounded accept threshold could admit examples it was not fitted on
+    def _format(threshold: Optional[float]) -> str:
+        return "" if threshold is None else str(threshold)
+
+    return {
+        "GRADE_ACCEPT_SIMILARITY": _format(calibration.accept),
+        "GRADE_REJECT_SIMILARITY": _format(calibration.reject),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Calibrate the similarity gate thresholds")
+    parser.add_argument("input", type=Path, help="Labelled JSONL file")
+    parser.add_argument(
+        "--target", type=float, default=0.95, help="Required agreement with labels per side"
+    )
+    parser.add_argument(
+        "--min-support", type=int, default=10, help="Fewest examples a threshold must decide"
+    )
+    args = parser.parse_args()
+
+    examples = load_examples(args.input)
+    relevant = sum(label for _, label in examples)
+    print(f"{len(examples)} examples, {relevant} relevant, {len(examples) - relevant} not\n")
+
+    calibration = calibrate(examples, args.target, args.min_support)
+    if calibration.accept is None:
+        print("Accept: no threshold reaches the target; every chunk goes to the grader")
+    else:
+        print(
+            f"Accept >= {calibration.accept:.4f}: {calibration.accepted} chunks, "
+            f"{calibration.accept_errors} actually not relevant"
+        )
+    if calibration.reject is None:
+        print("Reject: no threshold reaches the target; no chunk is rejected without the grader")
+    else:
+        print(
+            f"Reject <= {calibration.reject:.4f}: {calibration.rejected} chunks, "
+            f"{calibration.reject_errors} actually relevant"
+        )
+    print(f"Grader calls skipped on this data: {calibration.skip_rate:.0%}\n")
+
+    print("Add to .env:")
+    for name, value in _env_lines(calibration).items():
+        print(f"{name}={value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Shared pytest setup.
+
+The chains bind ``model.model.llm`` when they are imported, so the offline
+fakes (see :mod:`benchmarks.fakes`) are installed here, before any test
+module imports the graph.
+"""
+
+import pytest
+
+from benchmarks.fakes import Fakes, install_fakes
+
+FAKES = install_fakes()
+
+
+@pytest.fixture
+def fakes() -> Fakes:
+    """The installed fakes, with the LLM script and call counters reset."""
+    FAKES.llm.set_script({})
+    FAKES.search.calls = 0
+    return FAKES
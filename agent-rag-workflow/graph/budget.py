@@ -0,0 +1,120 @@
+"""
+Per-request budget for the graph's retry loops.
+
+The GENERATE -> "not supported" -> GENERATE and GENERATE -> "not useful" ->
+WEBSEARCH -> GENERATE cycles are bounded by a maximum number of regenerations,
+a maximum number of web searches, an estimated token budget and a wall-clock
+deadline. Limits live in the graph state (see :func:`initial_state`); any that
+are missing fall back to the environment defaults below.
+"""
+
+import os
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from graph.state import GraphState
+
+MAX_REGENERATIONS = int(os.getenv("RAG_MAX_REGENERATIONS", "3"))
+MAX_WEB_SEARCHES = int(os.getenv("RAG_MAX_WEB_SEARCHES", "2"))
+TOKEN_BUDGET = int(os.getenv("RAG_TOKEN_BUDGET", "0"))  # 0 = unlimited
+DEADLINE_SECONDS = float(os.getenv("RAG_DEADLINE_SECONDS", "0"))  # 0 = no deadline
+
+
+def initial_state(
+    question: str,
+    max_regenerations: int = MAX_REGENERATIONS,
+    max_web_searches: int = MAX_WEB_SEARCHES,
+    token_budget: int = TOKEN_BUDGET,
+    deadline_seconds: float = DEADLINE_SECONDS,
+) -> Dict[str, Any]:
+    """
+    Build the input state for one request with its budget.
+
+    Args:
+        question: The user question
+        max_regenerations: Regenerations allowed after an ungrounded answer
+        max_web_searches: Web searches allowed (including the first)
+        token_budget: Estimated prompt + completion tokens allowed (0 = unlimited)
+        deadline_seconds: Wall-clock time allowed from now (0 = no deadline)
+
+    Returns:
+        Graph input dictionary
+    """
+    return {
+        "question": question,
+        "max_regenerations": max_regenerations,
+        "max_web_searches": max_web_searches,
+        "token_budget": token_budget,
+        "deadline": new_deadline(deadline_seconds),
+        "best_generation": "",
+        "regenerations": 0,
+        "web_searches": 0,
+        "tokens_used": 0,
+    }
+
+
+def new_deadline(deadline_seconds: float = DEADLINE_SECONDS) -> Optional[float]:
+    """Epoch seconds ``deadline_seconds`` from now, or None for no deadline."""
+    return time.time() + deadline_seconds if deadline_seconds else None
+
+
+def exhausted_reason(state: GraphState) -> Optional[str]:
+    """
+    Check the token budget and deadline.
+
+    Args:
+        state: Current graph state
+
+    Returns:
+        Why the budget is exhausted, or None if there is budget left
+    """
+    token_budget = state.get("token_budget", TOKEN_BUDGET)
+    if token_budget and state.get("tokens_used", 0) >= token_budget:
+        return f"token budget of {token_budget} exhausted"
+
+    deadline = state.get("deadline")
+    if deadline and time.time() >= deadline:
+        return "deadline reached"
+
+    return None
+
+
+def can_regenerate(state: GraphState) -> bool:
+    """Whether another regeneration is allowed after an ungrounded answer."""
+    return state.get("regenerations", 0) < state.get("max_regenerations", MAX_REGENERATIONS)
+
+
+def can_web_search(state: GraphState) -> bool:
+    """Whether another web search is allowed after an answer that missed the question."""
+    return state.get("web_searches", 0) < state.get("max_web_searches", MAX_WEB_SEARCHES)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: Any) -> int:
+    """Estimate tokens with tiktoken (about 4 characters per token if unavailable)."""
+    text = text if isinstance(text, str) else str(text)
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most ``max_tokens`` tokens, counted like :func:`count_tokens`."""
+    encoding = _encoding()
+    if encoding is None:
+        return text[: max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
@@ -1,5 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from model.model import llm
@@ -23,4 +23,6 @@ answer_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-answer_grader: RunnableSequence = answer_prompt | structure_llm_grader
+answer_grader: Runnable = (answer_prompt | structure_llm_grader).with_config(
+    run_name="answer_grader", tags=["nostream"]
+)
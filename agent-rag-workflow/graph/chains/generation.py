@@ -1,12 +1,63 @@
 import os
+from functools import lru_cache
+from pathlib import Path
 
+from langchain_core.load import dumps, loads
 from langchain_core.output_parsers import StrOutputParser
-from langsmith import Client
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 
-from model.model import llm
+from model.model import llm, uncached_llm
 
-client = Client(api_key=os.getenv("LANGSMITH_API_KEY"))
+# "local" uses the vendored copy below; "hub" pulls rlm/rag-prompt once and caches it on disk
+RAG_PROMPT_SOURCE = os.getenv("RAG_PROMPT_SOURCE", "local")
+PROMPT_CACHE_PATH = Path(os.getenv("PROMPT_CACHE_DIR", ".cache/prompts")) / "rlm_rag-prompt.json"
 
-prompt = client.pull_prompt("rlm/rag-prompt", include_model=True)
+# Vendored copy of the LangSmith hub prompt "rlm/rag-prompt"
+rag_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "human",
+            "You are an assistant for question-answering tasks. Use the following pieces of "
+            "retrieved context to answer the question. If you don't know the answer, just say "
+            "that you don't know. Use three sentences maximum and keep the answer concise.\n"
+            "Question: {question} \nContext: {context} \nAnswer:",
+        ),
+    ]
+)
 
-generation_chain = prompt | llm | StrOutputParser()
+
+@lru_cache(maxsize=1)
+def get_prompt() -> Runnable:
+    """
+    Get the RAG prompt without touching the network unless asked to.
+
+    Returns:
+        The vendored prompt, or the hub prompt (served from the local cache
+        after the first pull) when RAG_PROMPT_SOURCE=hub
+    """
+    if RAG_PROMPT_SOURCE != "hub":
+        return rag_prompt
+
+    if PROMPT_CACHE_PATH.exists():
+        return loads(PROMPT_CACHE_PATH.read_text(encoding="utf-8"))
+
+    from langsmith import Client
+
+    client = Client(api_key=os.getenv("LANGSMITH_API_KEY"))
+    prompt = client.pull_prompt("rlm/rag-prompt", include_model=True)
+    PROMPT_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    PROMPT_CACHE_PATH.write_text(dumps(prompt), encoding="utf-8")
+    return prompt
+
+
+@lru_cache(maxsize=1)
+def get_generation_chain() -> Runnable:
+    return (get_prompt() | llm | StrOutputParser()).with_config(run_name="generation")
+
+
+@lru_cache(maxsize=1)
+def get_regeneration_chain() -> Runnable:
+    """Used when regenerating, so a cached answer that failed grading is not replayed."""
+    chain = get_prompt() | uncached_llm | StrOutputParser()
+    return chain.with_config(run_name="regeneration")
@@ -1,5 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from model.model import llm
@@ -24,4 +24,6 @@ hallucination_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-hallucination_grader: RunnableSequence = hallucination_prompt | structured_llm_grader
+hallucination_grader: Runnable = (hallucination_prompt | structured_llm_grader).with_config(
+    run_name="hallucination_grader", tags=["nostream"]
+)
@@ -1,8 +1,16 @@
+import os
+from typing import List
+
+from langchain_core.documents import Document
 from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from model.model import llm
 
+# Maximum number of grader calls in flight at once (1 = grade sequentially)
+GRADE_MAX_CONCURRENCY = int(os.getenv("GRADE_MAX_CONCURRENCY", "4"))
+
 
 class GradeDocuments(BaseModel):
     """Binary score for relevance check on retrieved documents"""
@@ -25,4 +33,34 @@ grade_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-retrieval_grader = grade_prompt | structured_llm_grader
+retrieval_grader = (grade_prompt | structured_llm_grader).with_config(
+    run_name="retrieval_grader", tags=["nostream"]
+)
+
+
+def grade_documents_batch(
+    grader: Runnable,
+    question: str,
+    documents: List[Document],
+    max_concurrency: int = GRADE_MAX_CONCURRENCY,
+) -> List[GradeDocuments]:
+    """
+    Grade several documents against one question concurrently.
+
+    Uses the runnable's batch execution so at most ``max_concurrency`` grader
+    calls are in flight. Scores are returned in the same order as ``documents``.
+
+    Args:
+        grader: Runnable taking ``{"question", "document"}`` and returning a grade
+        question: The user question
+        documents: Documents to grade
+        max_concurrency: Cap on concurrent grader calls (1 = sequential)
+
+    Returns:
+        One grade per document, in input order
+    """
+    if not documents:
+        return []
+
+    inputs = [{"question": question, "document": doc.page_content} for doc in documents]
+    return grader.batch(inputs, config={"max_concurrency": max(1, max_concurrency)})
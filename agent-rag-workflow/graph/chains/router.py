@@ -27,4 +27,6 @@ route_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
-question_router = route_prompt | structured_llm_router
+question_router = (route_prompt | structured_llm_router).with_config(
+    run_name="question_router", tags=["nostream"]
+)
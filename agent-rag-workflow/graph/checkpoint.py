@@ -0,0 +1,45 @@
+"""
+Local SQLite checkpointing so failed or interrupted runs can resume.
+
+With a checkpointer, LangGraph saves the state after every completed node
+under a thread ID. Resuming that thread (``app.invoke(None, thread_config(id))``)
+continues from the last saved step, so the router, retrieval, document grading
+and generation calls that already succeeded are not paid for again.
+
+A failing routing function counts against the node it follows: an error in
+the router LLM re-runs the whole graph on resume, while a failed hallucination
+or answer grade re-runs only ``grade_generation``.
+"""
+
+import sqlite3
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+
+def open_checkpointer(path: str) -> SqliteSaver:
+    """
+    Open (creating if needed) a SQLite checkpoint database in WAL mode.
+
+    Args:
+        path: Database file
+
+    Returns:
+        Checkpointer usable from the graph's worker threads
+    """
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return SqliteSaver(conn)
+
+
+def new_thread_id() -> str:
+    """A fresh thread ID for one run."""
+    return uuid.uuid4().hex[:12]
+
+
+def thread_config(thread_id: str) -> Dict[str, Any]:
+    """Runnable config selecting a checkpoint thread."""
+    return {"configurable": {"thread_id": thread_id}}
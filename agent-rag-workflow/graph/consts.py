@@ -3,4 +3,6 @@
 RETRIEVE = "retrieve"
 GRADE_DOCUMENTS = "grade_documents"
 GENERATE = "generate"
+GRADE_GENERATION = "grade_generation"
 WEBSEARCH = "websearch"
+FINALIZE = "finalize"
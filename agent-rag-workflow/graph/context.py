@@ -0,0 +1,152 @@
+"""
+Token-budgeted context packing for generation and grading.
+
+Turns the documents in graph state into the single context string sent to the
+generator and the hallucination grader:
+
+1. Drop chunks contained in another chunk and trim the text a chunk shares
+   with its neighbour (the splitter's ``chunk_overlap`` repeats ~50 tokens
+   between consecutive chunks of a source)
+2. Keep only page content; metadata never reaches the prompt
+3. Order chunks by relevance to the question, most relevant first; retriever
+   scores are rescaled to the 0-1 range of the term-overlap score given to
+   unscored chunks (web results) so the two can be compared
+4. Stop at ``CONTEXT_TOKEN_BUDGET`` tokens, truncating the last chunk that fits
+"""
+
+import os
+import re
+from typing import List, NamedTuple, Optional
+
+from langchain_core.documents import Document
+
+from graph.budget import count_tokens, truncate_tokens
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "3000"))
+
+# Overlaps shorter than this are coincidence, not splitter overlap
+MIN_OVERLAP_CHARS = 32
+# Splitter overlap is 50 tokens; leave generous room for long tokens and separators
+MAX_OVERLAP_CHARS = 2000
+# A truncated chunk shorter than this is noise rather than context
+MIN_TRUNCATED_TOKENS = 32
+
+SEPARATOR = "\n\n"
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from how in is it of on or the to was what when "
+    "where which who why with".split()
+)
+
+
+class PackedContext(NamedTuple):
+    text: str
+    chunks: int
+    tokens: int
+    input_tokens: int
+
+
+def pack_context(
+    documents: List[Document],
+    question: str,
+    token_budget: int = CONTEXT_TOKEN_BUDGET,
+) -> PackedContext:
+    """
+    Pack documents into a deduplicated, relevance-ordered, token-bounded context.
+
+    Args:
+        documents: Documents from retrieval and/or web search
+        question: The user question, used to rank chunks
+        token_budget: Maximum context tokens (0 = unlimited)
+
+    Returns:
+        Packed context text with the chunk count, its token count and the
+        token count of the unpacked chunks
+    """
+    contents = _deduplicate(documents)
+    input_tokens = sum(count_tokens(doc.page_content) for doc in documents)
+
+    # Stable sort: ties keep retrieval order
+    relevance = _relevance(documents, contents, question)
+    ranked = sorted(range(len(contents)), key=lambda i: -relevance[i])
+
+    packed: List[str] = []
+    used = 0
+    for i in ranked:
+        text = contents[i]
+        if not text:
+            continue
+        tokens = count_tokens(text) + (count_tokens(SEPARATOR) if packed else 0)
+        if token_budget and used + tokens > token_budget:
+            remaining = token_budget - used
+            if remaining >= MIN_TRUNCATED_TOKENS:
+                packed.append(truncate_tokens(text, remaining))
+                used += count_tokens(packed[-1])
+            break
+        packed.append(text)
+        used += tokens
+
+    return PackedContext(SEPARATOR.join(packed), len(packed), used, input_tokens)
+
+
+def _deduplicate(documents: List[Document]) -> List[str]:
+    # Returns one (possibly trimmed or emptied) content string per document
+    contents = [doc.page_content.strip() for doc in documents]
+    for i, text in enumerate(contents):
+        for j in range(i):
+            earlier = contents[j]
+            if not text or not earlier:
+                continue
+            if text in earlier:
+                text = ""
+            elif earlier in text:
+                contents[j] = ""
+            elif _same_source(documents[i], documents[j]):
+                # Consecutive chunks may arrive in either order
+                overlap = _overlap(earlier, text)
+                if overlap:
+                    text = text[overlap:].lstrip()
+                elif overlap := _overlap(text, earlier):
+                    text = text[: len(text) - overlap].rstrip()
+        contents[i] = text
+    return contents
+
+
+def _same_source(a: Document, b: Document) -> bool:
+    source = a.metadata.get("source")
+    return source is not None and source == b.metadata.get("source")
+
+
+def _overlap(first: str, second: str) -> int:
+    """Length of the longest suffix of ``first`` that is a prefix of ``second``."""
+    if len(second) < MIN_OVERLAP_CHARS:
+        return 0
+    head = second[:MIN_OVERLAP_CHARS]
+    tail_start = max(0, len(first) - MAX_OVERLAP_CHARS)
+    position = first.find(head, tail_start)
+    while position != -1:
+        suffix = first[position:]
+        if second.startswith(suffix):
+            return len(suffix)
+        position = first.find(head, position + 1)
+    return 0
+
+
+def _relevance(documents: List[Document], contents: List[str], question: str) -> List[float]:
+    # Retriever scores are on their own scale (RRF scores top out near 0.03), so they
+    # are divided by the best one: the top retrieved chunk ranks like a web result
+    # holding every question term. Unscored chunks get the share of question terms.
+    scores: List[Optional[float]] = [doc.metadata.get("score") for doc in documents]
+    best = max((float(score) for score in scores if score is not None), default=0.0)
+    terms = set(_WORD.findall(question.lower())) - _STOPWORDS
+
+    relevance: List[float] = []
+    for score, text in zip(scores, contents):
+        if score is not None:
+            relevance.append(float(score) / best if best > 0 else 0.0)
+        elif terms:
+            relevance.append(len(terms & set(_WORD.findall(text.lower()))) / len(terms))
+        else:
+            relevance.append(0.0)
+    return relevance
@@ -0,0 +1,149 @@
+"""
+Compact document references for graph state.
+
+By default ``GraphState.documents`` holds full ``Document`` objects, so every
+checkpoint and every hop between processes serializes all chunk text again.
+With ``STATE_DOC_REFS`` enabled, nodes store ``doc_refs`` instead: a chunk ID
+and its retrieval scores per document, pointing into the vectorstore's
+read-only chunk store.
+Text is materialized only when a node needs it (grading, packing the prompt).
+
+Web search results have no chunk ID, so their refs carry the text inline.
+
+Nodes read documents with :func:`load_documents` and write them with
+:func:`store_documents` / :func:`add_documents`, which work in either mode.
+"""
+
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, TypedDict
+
+from langchain_community.docstore.base import Docstore
+from langchain_core.documents import Document
+
+STATE_DOC_REFS = os.getenv("STATE_DOC_REFS", "").lower() in {"1", "true", "yes"}
+
+# Per-query metadata set by the retrievers; not in the chunk store, so refs carry it
+REF_SCORES = ("score", "similarity")
+
+
+class DocRef(TypedDict, total=False):
+    """
+    A document in graph state.
+
+    Attributes:
+    id: Chunk ID in the chunk store
+    score: Retrieval score, if the retriever set one
+    similarity: Cosine similarity to the question, if the retriever set one
+    text: Inline page content, for documents that are not in the chunk store
+    metadata: Inline metadata, with ``text`` only
+    """
+
+    id: str
+    score: float
+    similarity: float
+    text: str
+    metadata: Dict[str, Any]
+
+
+@lru_cache(maxsize=1)
+def get_docstore() -> Docstore:
+    """Chunk store the refs point into (loaded with the retriever on first use)."""
+    from ingestion import get_docstore as load_docstore
+
+    return load_docstore()
+
+
+def to_refs(documents: List[Document]) -> List[DocRef]:
+    """
+    Reduce documents to refs.
+
+    Args:
+        documents: Documents from the retriever or web search
+
+    Returns:
+        One ref per document, in order
+    """
+    refs: List[DocRef] = []
+    for doc in documents:
+        if doc.id:
+            ref: DocRef = {"id": doc.id}
+            for key in REF_SCORES:
+                value = doc.metadata.get(key)
+                if value is not None:
+                    ref[key] = float(value)
+        else:
+            ref = {"text": doc.page_content, "metadata": dict(doc.metadata)}
+        refs.append(ref)
+    return refs
+
+
+def materialize(refs: List[DocRef]) -> List[Document]:
+    """
+    Fetch the documents refs point to.
+
+    Args:
+        refs: Refs from graph state
+
+    Returns:
+        Documents in ref order
+
+    Raises:
+        KeyError: If a chunk ID is not in the chunk store
+    """
+    documents: List[Document] = []
+    for ref in refs:
+        if "id" not in ref:
+            documents.append(Document(page_content=ref["text"], metadata=ref.get("metadata", {})))
+            continue
+        found = get_docstore().search(ref["id"])
+        if not isinstance(found, Document):
+            raise KeyError(f"Chunk {ref['id']} not found in the chunk store")
+        metadata = dict(found.metadata)
+        metadata.update((key, ref[key]) for key in REF_SCORES if key in ref)
+        # Copy: the in-memory docstore hands out its own objects
+        # The ID is the key looked up; the stored object may not carry one
+        documents.append(Document(id=ref["id"], page_content=found.page_content, metadata=metadata))
+    return documents
+
+
+def load_documents(state: Mapping[str, Any]) -> List[Document]:
+    """Documents in ``state``, materialized from refs if it holds refs."""
+    refs: Optional[List[DocRef]] = state.get("doc_refs")
+    if refs is not None:
+        return materialize(refs)
+    return list(state.get("documents") or [])
+
+
+def store_documents(documents: List[Document]) -> Dict[str, Any]:
+    """State update holding ``documents``, as refs when ``STATE_DOC_REFS`` is on."""
+    if STATE_DOC_REFS:
+        return {"doc_refs": to_refs(documents)}
+    return {"documents": documents}
+
+
+def add_documents(state: Mapping[str, Any], documents: List[Document]) -> Dict[str, Any]:
+    """
+    State update appending ``documents`` to those already in ``state``.
+
+    Builds a new list rather than mutating the state's, and appends refs
+    without materializing the existing ones.
+
+    Args:
+        state: Current graph state
+        documents: Documents to add
+
+    Returns:
+        State update holding the combined documents or refs
+    """
+    refs: Optional[List[DocRef]] = state.get("doc_refs")
+    if refs is not None:
+        return {"doc_refs": [*refs, *to_refs(documents)]}
+    return store_documents([*(state.get("documents") or []), *documents])
+
+
+def with_documents(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Final graph state with ``documents`` materialized, for display and output."""
+    if result.get("doc_refs") is None:
+        return result
+    return {**result, "documents": load_documents(result)}
@@ -1,17 +1,30 @@
 """Graph workflow definition."""
 
 import os
+from typing import Any, Dict, Optional, Tuple
 
 from dotenv import load_dotenv
+from langchain_core.runnables import RunnableParallel
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, StateGraph
 
+from graph import budget, speculation, topic_router
 from graph.chains.answer_grader import answer_grader
 from graph.chains.hallucination_grader import hallucination_grader
 from graph.chains.router import RouteQuery, question_router
-from graph.consts import GENERATE, GRADE_DOCUMENTS, RETRIEVE, WEBSEARCH
-from graph.nodes import generate, grade_documents, retrieve, web_search
+from graph.consts import (
+    FINALIZE,
+    GENERATE,
+    GRADE_DOCUMENTS,
+    GRADE_GENERATION,
+    RETRIEVE,
+    WEBSEARCH,
+)
+from graph.context import pack_context
+from graph.doc_refs import load_documents
+from graph.nodes import finalize, generate, grade_documents, retrieve, web_search
 from graph.state import GraphState
-from utils import print_step
+from utils.events import CHECK, FAIL, INFO, NOTICE, OK, Decision, Event, Grade, NodeStart, emit
 
 load_dotenv()
 
@@ -21,71 +34,207 @@ if os.getenv("LANGSMITH_API_KEY"):
     os.environ["LANGCHAIN_PROJECT"] = os.getenv("LANGSMITH_PROJECT", "adaptive-rag-workflow")
     os.environ["LANGCHAIN_ENDPOINT"] = "https://api.smith.langchain.com"
 
+# Issue the hallucination and answer graders concurrently instead of back to back
+SPECULATIVE_GRADING = os.getenv("SPECULATIVE_GRADING", "").lower() in {"1", "true", "yes"}
+
+speculative_graders = RunnableParallel(hallucination=hallucination_grader, answer=answer_grader)
+
 
 def decide_to_generate(state: GraphState) -> str:  # Added return type hint
-    # print(f"{'=' * 7} ASSESS GRADED DOCUMENTS {'=' * 7}")  # Replaced with print_step
-    print_step("ASSESS GRADED DOCUMENTS", "Evaluating document relevance", "yellow")
+    emit(
+        NodeStart(
+            "ASSESS GRADED DOCUMENTS",
+            "Evaluating document relevance",
+            node="decide_to_generate",
+            level=CHECK,
+        )
+    )
 
     if state["web_search"]:
-        # print(f"{'-' * 7} DECISION: NOT ALL DOCUMENTS ARE NOT RELEVANT TO QUESTION, INCLUDE WEB SEARCH. {'-' * 7}")
-        print_step("DECISION", "Some documents not relevant → Including web search", "magenta")
+        emit(
+            Decision(
+                "DECISION",
+                "Some documents not relevant → Including web search",
+                outcome=WEBSEARCH,
+                level=NOTICE,
+            )
+        )
         return WEBSEARCH
     else:
-        # print(f"{'-' * 7} DECISION: GENERATE {'-' * 7}")
-        print_step("DECISION", "All documents relevant → Generating answer", "green")
+        emit(
+            Decision(
+                "DECISION",
+                "All documents relevant → Generating answer",
+                outcome=GENERATE,
+                level=OK,
+            )
+        )
         return GENERATE
 
 
 def route_question(state: GraphState) -> str:
-    # print(f"{'=' * 7} ROUTE QUESTION {'=' * 7}")  # Replaced with print_step
-    print_step("ROUTE QUESTION", "Analyzing query topic", "cyan")
+    emit(NodeStart("ROUTE QUESTION", "Analyzing query topic", node="route_question"))
     question = state["question"]
 
-    source: RouteQuery = question_router.invoke({"question": question})
+    # Clear-cut questions are routed by similarity to the corpus topics, without the LLM
+    fast = topic_router.route(question) if topic_router.enabled() else None
+    if fast is not None and fast.datasource is not None:
+        datasource = fast.datasource
+        emit(
+            Event(
+                "ROUTE QUESTION",
+                f"Similarity {fast.similarity:.2f} to {fast.topic} → skipped router LLM",
+                level=INFO,
+            )
+        )
+    else:
+        # Start local retrieval now; it is only kept if the router picks the vectorstore
+        if speculation.enabled():
+            speculation.start(question)
+
+        datasource = None
+        try:
+            source: RouteQuery = question_router.invoke({"question": question})
+            datasource = source.datasource
+        finally:
+            # Only the vectorstore route claims the speculation; every other exit drops it
+            if datasource != "vectorstore":
+                speculation.discard(question)
 
-    if source.datasource == WEBSEARCH:
-        # print(f"{'-' * 7} DECISION: ROUTE QUESTION TO WEB SEARCH {'-' * 7}")
-        print_step("DECISION", "Routing to WEB SEARCH", "magenta")
+    if datasource == WEBSEARCH:
+        emit(Decision("DECISION", "Routing to WEB SEARCH", outcome=WEBSEARCH, level=NOTICE))
         return WEBSEARCH
-    elif source.datasource == "vectorstore":
-        # print(f"{'-' * 7} DECISION: ROUTE QUESTION TO RAG {'-' * 7}")
-        print_step("DECISION", "Routing to VECTOR STORE (RAG)", "green")
+    elif datasource == "vectorstore":
+        emit(Decision("DECISION", "Routing to VECTOR STORE (RAG)", outcome=RETRIEVE, level=OK))
         return RETRIEVE
 
 
-def grade_generation_grounded_in_documents_and_question(state: GraphState) -> str:
-    # print(f"{'=' * 7} CHECK HALLUCINATION {'=' * 7}")  # Replaced with print_step
-    print_step("CHECK HALLUCINATION", "Validating answer is grounded in facts", "yellow")
+def grade_generation_grounded_in_documents_and_question(state: GraphState) -> Tuple[str, bool]:
+    """Grade the latest generation; returns the outcome and whether it was grounded."""
+    emit(
+        NodeStart(
+            "CHECK HALLUCINATION",
+            "Validating answer is grounded in facts",
+            node="grade_generation",
+            level=CHECK,
+        )
+    )
 
     question = state["question"]
-    documents = state["documents"]
+    # Grade against the same packed context the generator saw (re-packed from doc refs)
+    context = state.get("context") or pack_context(load_documents(state), question).text
     generation = state["generation"]
 
-    # score = hallucination_grader.invoke({"documents": documents, "question": question})  # Incorrect: expects 'generation', not 'question'
-    score = hallucination_grader.invoke(
-        {"documents": documents, "generation": generation}
-    )
+    # Out of tokens or time: stop before paying for the graders
+    if reason := budget.exhausted_reason(state):
+        emit(
+            Decision(
+                "DECISION",
+                f"✗ {reason.capitalize()} → Stopping",
+                outcome="budget exhausted",
+                level=FAIL,
+            )
+        )
+        return "budget exhausted", False
+
+    answer_score = None
+    if SPECULATIVE_GRADING:
+        # Both graders run at once; the answer grade is discarded if not grounded
+        scores = speculative_graders.invoke(
+            {"documents": context, "question": question, "generation": generation}
+        )
+        score, answer_score = scores["hallucination"], scores["answer"]
+    else:
+        # score = hallucination_grader.invoke({"documents": documents, "question": question})  # Incorrect: expects 'generation', not 'question'
+        score = hallucination_grader.invoke(
+            {"documents": context, "generation": generation}
+        )
 
     if hallucination_grade := score.binary_score:
-        # print(f"{'-' * 7} DECISION: GENERATION IS GROUNDED IN DOCUMENTS {'-' * 7}")
-        print_step("DECISION", "✓ Generation is grounded in documents", "green")
-        # print(f"{'-' * 7} GRADE GENERATION vs QUESION {'-' * 7}")
-        print_step("GRADE ANSWER", "Checking if answer addresses question", "yellow")
-        score = answer_grader.invoke({"question": question, "generation": generation})
+        emit(
+            Grade(
+                "DECISION",
+                "✓ Generation is grounded in documents",
+                subject="hallucination",
+                passed=True,
+            )
+        )
+        emit(
+            NodeStart(
+                "GRADE ANSWER",
+                "Checking if answer addresses question",
+                node="grade_generation",
+                level=CHECK,
+            )
+        )
+        score = answer_score or answer_grader.invoke(
+            {"question": question, "generation": generation}
+        )
 
         if answer_grade := score.binary_score:
-            # print(f"{'-' * 7} DECISION: GENERATION ADDRESSES QUESTION {'-' * 7}")
-            print_step("DECISION", "✓ Answer addresses question → Complete", "green")
-            return "useful"
+            emit(
+                Grade(
+                    "DECISION",
+                    "✓ Answer addresses question → Complete",
+                    subject="answer",
+                    passed=True,
+                )
+            )
+            return "useful", True
+        elif not budget.can_web_search(state):
+            emit(
+                Decision(
+                    "DECISION",
+                    "✗ Answer doesn't address question, no searches left",
+                    outcome="budget exhausted",
+                    level=FAIL,
+                )
+            )
+            return "budget exhausted", True
         else:
-            # print(f"{'-' * 7} DECISION: GENERATION DOES NOT ADDRESSES QUESTION {'-' * 7}")
-            print_step("DECISION", "✗ Answer doesn't address question → Web search", "red")
-            return "not useful"
+            emit(
+                Decision(
+                    "DECISION",
+                    "✗ Answer doesn't address question → Web search",
+                    outcome="not useful",
+                    level=FAIL,
+                )
+            )
+            return "not useful", True
 
+    elif not budget.can_regenerate(state):
+        emit(
+            Decision(
+                "DECISION",
+                "✗ Not grounded in documents, no regenerations left",
+                outcome="budget exhausted",
+                level=FAIL,
+            )
+        )
+        return "budget exhausted", False
     else:
-        # print(f"{'-' * 7} DECISION: GENERATION IS NOT GROUNDED IN DOCUMENTS. RETRY. {'-' * 7}")
-        print_step("DECISION", "✗ Not grounded in documents → Regenerating", "red")
-        return "not supported"
+        emit(
+            Decision(
+                "DECISION",
+                "✗ Not grounded in documents → Regenerating",
+                outcome="not supported",
+                level=FAIL,
+            )
+        )
+        return "not supported", False
+
+
+def grade_generation(state: GraphState) -> Dict[str, Any]:
+    """Grades the latest generation; a grounded one is kept as the best answer so far."""
+    outcome, grounded = grade_generation_grounded_in_documents_and_question(state)
+    update: Dict[str, Any] = {"generation_grade": outcome}
+    if grounded:
+        update["best_generation"] = state["generation"]
+    return update
+
+
+def decide_after_grading(state: GraphState) -> str:
+    return state["generation_grade"]
 
 
 workflow = StateGraph(GraphState)
@@ -93,7 +242,9 @@ workflow = StateGraph(GraphState)
 workflow.add_node(RETRIEVE, retrieve)
 workflow.add_node(GRADE_DOCUMENTS, grade_documents)
 workflow.add_node(GENERATE, generate)
+workflow.add_node(GRADE_GENERATION, grade_generation)
 workflow.add_node(WEBSEARCH, web_search)
+workflow.add_node(FINALIZE, finalize)
 
 workflow.set_conditional_entry_point(
     route_question, {WEBSEARCH: WEBSEARCH, RETRIEVE: RETRIEVE}
@@ -104,15 +255,44 @@ workflow.add_conditional_edges(
     GRADE_DOCUMENTS, decide_to_generate, {WEBSEARCH: WEBSEARCH, GENERATE: GENERATE}
 )
 
+workflow.add_edge(GENERATE, GRADE_GENERATION)
 workflow.add_conditional_edges(
-    GENERATE,
-    grade_generation_grounded_in_documents_and_question,
-    {"not supported": GENERATE, "useful": END, "not useful": WEBSEARCH},
+    GRADE_GENERATION,
+    decide_after_grading,
+    {
+        "not supported": GENERATE,
+        "useful": END,
+        "not useful": WEBSEARCH,
+        "budget exhausted": FINALIZE,
+    },
 )
 
 workflow.add_edge(WEBSEARCH, GENERATE)
+workflow.add_edge(FINALIZE, END)
 # workflow.add_edge(GENERATE, END)  # Commented: This creates a duplicate edge - conditional edges above already handle GENERATE -> END
 
-app = workflow.compile()
 
-app.get_graph().draw_mermaid_png(output_file_path="graph.png")
+def build_app(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """
+    Compile the workflow.
+
+    Args:
+        checkpointer: Saves state after every node so runs can resume (see graph.checkpoint)
+
+    Returns:
+        Compiled LangGraph application
+    """
+    return workflow.compile(checkpointer=checkpointer)
+
+
+app = build_app()
+
+
+def draw_graph(output_file_path: str = "graph.png") -> None:
+    """
+    Render the workflow diagram (uses the remote Mermaid renderer).
+
+    Args:
+        output_file_path: Where to write the PNG
+    """
+    app.get_graph().draw_mermaid_png(output_file_path=output_file_path)
@@ -1,6 +1,7 @@
+from graph.nodes.finalize import finalize
 from graph.nodes.generate import generate
 from graph.nodes.grade_documents import grade_documents
 from graph.nodes.retrieve import retrieve
 from graph.nodes.web_search import web_search
 
-__all__ = ["generate", "grade_documents", "retrieve", "web_search"]
+__all__ = ["finalize", "generate", "grade_documents", "retrieve", "web_search"]
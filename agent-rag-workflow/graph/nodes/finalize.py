@@ -0,0 +1,26 @@
+from typing import Any, Dict
+
+from graph.budget import exhausted_reason
+from graph.state import GraphState
+from utils.events import FAIL, NodeEnd, emit
+
+
+def finalize(state: GraphState) -> Dict[str, Any]:
+    """
+    Ends a run whose budget ran out with the best answer so far, flagged unverified.
+
+    That is the latest generation found grounded in the documents, or the latest
+    generation if none was.
+    """
+    reason = exhausted_reason(state) or "retry limit reached"
+    best = state.get("best_generation")
+    if best:
+        message = f"⚠ {reason} → Returning the last grounded answer, unverified"
+    else:
+        message = f"⚠ {reason} → Returning unverified answer"
+    emit(NodeEnd("BUDGET", message, node="finalize", level=FAIL))
+    return {
+        "generation": best or state.get("generation", ""),
+        "verified": False,
+        "budget_exhausted": reason,
+    }
@@ -1,17 +1,45 @@
 from typing import Any, Dict
 
-from graph.chains.generation import generation_chain
+from graph.budget import count_tokens
+from graph.chains.generation import get_generation_chain, get_regeneration_chain
+from graph.context import pack_context
+from graph.doc_refs import load_documents
 from graph.state import GraphState
-from utils import print_step
+from utils.events import INFO, Event, NodeEnd, NodeStart, emit
 
 
 def generate(state: GraphState) -> Dict[str, Any]:
-    # print(f"{'-' * 7} Generate {'-' * 7}")  # Replaced with print_step
-    print_step("GENERATE", "Creating answer from documents", "cyan")
+    emit(NodeStart("GENERATE", "Creating answer from documents", node="generate"))
     question = state["question"]
-    documents = state["documents"]
+    documents = load_documents(state)
 
-    generation = generation_chain.invoke({"context": documents, "question": question})
+    packed = pack_context(documents, question)
+    emit(
+        Event(
+            "GENERATE",
+            f"Packed {packed.chunks}/{len(documents)} chunks, "
+            f"{packed.tokens} tokens (from {packed.input_tokens})",
+            level=INFO,
+        )
+    )
 
-    print_step("GENERATE", "✓ Answer generated", "green")
-    return {"documents": documents, "question": question, "generation": generation}
+    # A previous generation in state means grading rejected it; bypass the response cache
+    regenerating = bool(state.get("generation"))
+    chain = get_regeneration_chain() if regenerating else get_generation_chain()
+    generation = chain.invoke({"context": packed.text, "question": question})
+
+    # Estimate this generation plus the two grader calls that follow it
+    context_tokens = packed.tokens
+    question_tokens = count_tokens(question)
+    generation_tokens = count_tokens(generation)
+    tokens = context_tokens + 2 * question_tokens + 3 * generation_tokens + context_tokens
+
+    emit(NodeEnd("GENERATE", "✓ Answer generated", node="generate"))
+    return {
+        "question": question,
+        # With doc refs the graders re-pack the context rather than carry its text
+        "context": "" if state.get("doc_refs") is not None else packed.text,
+        "generation": generation,
+        "regenerations": state.get("regenerations", 0) + regenerating,
+        "tokens_used": state.get("tokens_used", 0) + tokens,
+    }
@@ -1,37 +1,56 @@
 from typing import Any, Dict
 
-from graph.chains.retrieval_grader import retrieval_grader
+from graph import similarity_gate, speculation
+from graph.chains.retrieval_grader import grade_documents_batch, retrieval_grader
+from graph.doc_refs import load_documents, store_documents
 from graph.state import GraphState
-from utils import print_step
+from utils.events import CHECK, INFO, Event, Grade, NodeStart, emit
 
 
 def grade_documents(state: GraphState) -> Dict[str, Any]:
     """Determines whether the retrieved documents are relevant to the question
     If any document is not relevant, we will set a flag to run a web search."""
 
-    # print(f"{'-' * 7} CHECK DOCUMENT RELEVANCE TO QUESTION {'-' * 7}")  # Replaced with print_step
-    print_step("GRADE DOCUMENTS", "Checking document relevance to question", "yellow")
+    emit(
+        NodeStart(
+            "GRADE DOCUMENTS",
+            "Checking document relevance to question",
+            node="grade_documents",
+            level=CHECK,
+        )
+    )
     question = state["question"]
-    documents = state["documents"]
+    documents = load_documents(state)
 
     filtered_docs = []
     web_search = False
 
-    for doc in documents:
-        score = retrieval_grader.invoke(
-            {"question": question, "document": doc.page_content}
+    # Grade all documents concurrently; scores come back in document order
+    scores = speculation.take_grades(question, documents)
+    if scores is None and similarity_gate.enabled():
+        # Confident similarity scores decide without a grader call
+        gate = similarity_gate.grade(question, documents)
+        scores = gate.grades
+        emit(
+            Event(
+                "GRADE DOCUMENTS",
+                f"Similarity gate skipped {gate.skipped}/{len(documents)} grader calls "
+                f"({gate.accepted} accepted, {gate.rejected} rejected)",
+                level=INFO,
+            )
         )
+    elif scores is None:
+        scores = grade_documents_batch(retrieval_grader, question, documents)
 
+    for doc, score in zip(documents, scores):
         grade = score.binary_score
 
         if grade.lower() == "yes":
-            # print(f"{'-' * 3} GRADE: DOCUMENT RELEVANT {'-' * 3}")
-            print_step("GRADE", "✓ Document relevant", "green")
+            emit(Grade("GRADE", "✓ Document relevant", subject="document", passed=True))
             filtered_docs.append(doc)
         else:
-            # print(f"{'-' * 3} GRADE: DOCUMENT NOT RELEVANT {'-' * 3}")
-            print_step("GRADE", "✗ Document not relevant", "red")
+            emit(Grade("GRADE", "✗ Document not relevant", subject="document", passed=False))
             web_search = True
             continue
 
-    return {"documents": filtered_docs, "question": question, "web_search": web_search}
+    return {**store_documents(filtered_docs), "question": question, "web_search": web_search}
@@ -1,15 +1,20 @@
 from typing import Any, Dict
 
+from graph import speculation
+from graph.doc_refs import store_documents
 from graph.state import GraphState
-from ingestion import retriever
-from utils import print_step
+from ingestion import get_retriever
+from utils.events import NodeEnd, NodeStart, emit
 
 
 def retrieve(state: GraphState) -> Dict[str, Any]:
-    # print(f"{'-' * 7} RETRIEVE {'-' * 7}")  # Replaced with print_step
-    print_step("RETRIEVE", "Fetching documents from vector store", "cyan")
+    emit(NodeStart("RETRIEVE", "Fetching documents from vector store", node="retrieve"))
     question = state["question"]
-    documents = retriever.invoke(question)
+    # Use documents retrieved speculatively while the router was deciding, if any
+    documents = speculation.take_documents(question)
+    if documents is None:
+        # The vectorstore is loaded on first use, not at import time
+        documents = get_retriever().invoke(question)
 
-    print_step("RETRIEVE", f"✓ Retrieved {len(documents)} documents", "green")
-    return {"documents": documents, "question": question}
+    emit(NodeEnd("RETRIEVE", f"✓ Retrieved {len(documents)} documents", node="retrieve"))
+    return {**store_documents(documents), "question": question}
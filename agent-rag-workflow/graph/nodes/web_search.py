@@ -1,27 +1,35 @@
+from functools import lru_cache
 from typing import Any, Dict
 
 from dotenv import load_dotenv
 from langchain_core.documents import Document
 from langchain_tavily import TavilySearch
 
+from graph.doc_refs import add_documents
+from graph.search_cache import CachedSearchTool, get_search_cache
 from graph.state import GraphState
-from utils import print_step
+from utils.events import NodeEnd, NodeStart, emit
 
 load_dotenv()
-web_search_tool = TavilySearch(max_results=3)
+
+SEARCH_PARAMS = {"max_results": 3}
+
+
+@lru_cache(maxsize=1)
+def get_web_search_tool() -> CachedSearchTool | TavilySearch:
+    """Create the Tavily search tool on first use, behind the search cache if enabled."""
+    tool = TavilySearch(**SEARCH_PARAMS)
+    cache = get_search_cache()
+    if cache is None:
+        return tool
+    return CachedSearchTool(tool, cache, params={"tool": "tavily", **SEARCH_PARAMS})
 
 
 def web_search(state: GraphState) -> Dict[str, Any]:
-    # print(f"{'-' * 7} WEB SEARCH {'-' * 7}")  # Replaced with print_step
-    print_step("WEB SEARCH", "Searching the web for additional information", "cyan")
+    emit(NodeStart("WEB SEARCH", "Searching the web for additional information", node="websearch"))
     question = state["question"]
 
-    if "documents" in state:
-        documents = state["documents"]
-    else:
-        documents = None
-
-    tavily_search_results = web_search_tool.invoke({"query": question})["results"]
+    tavily_search_results = get_web_search_tool().invoke({"query": question})["results"]
 
     joined_search_result = "\n\n".join(
         [search_result["content"] for search_result in tavily_search_results]
@@ -29,13 +37,15 @@ def web_search(state: GraphState) -> Dict[str, Any]:
 
     web_results = Document(page_content=joined_search_result)
 
-    if documents is not None:
-        documents.append(web_results)
-    else:
-        documents = [web_results]
-
-    print_step("WEB SEARCH", f"✓ Found {len(tavily_search_results)} web results", "green")
-    return {"documents": documents, "question": question}
+    message = f"✓ Found {len(tavily_search_results)} web results"
+    emit(NodeEnd("WEB SEARCH", message, node="websearch"))
+    return {
+        **add_documents(state, [web_results]),
+        "question": question,
+        # New context: the next generation is a fresh answer, not a regeneration
+        "generation": "",
+        "web_searches": state.get("web_searches", 0) + 1,
+    }
 
 
 if __name__ == "__main__":
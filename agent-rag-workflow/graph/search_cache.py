@@ -0,0 +1,157 @@
+"""Pluggable TTL cache for web search results."""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Protocol, Union
+
+from dotenv import load_dotenv
+
+from utils.disk_cache import DiskCache
+
+load_dotenv()
+
+# "disk" (shared across runs), "memory" (this process only) or "off"
+SEARCH_CACHE = os.getenv("SEARCH_CACHE", "disk").lower()
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", ".cache/search_cache.sqlite")
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1000"))
+
+
+class SearchCache(Protocol):
+    """Storage backend for :class:`CachedSearchTool`."""
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]: ...
+
+    def set(self, key: str, value: Dict[str, Any]) -> None: ...
+
+    def stats(self) -> Dict[str, Union[int, float]]: ...
+
+
+class MemorySearchCache:
+    """In-process LRU cache with a TTL."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+        }
+
+
+class DiskSearchCache:
+    """Search cache persisted in a :class:`utils.disk_cache.DiskCache`."""
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_entries: int = 1000):
+        self.store = DiskCache(
+            path, namespace="search", ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.store.get(key)
+        return json.loads(value) if value is not None else None
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self.store.set(key, json.dumps(value).encode("utf-8"))
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        return self.store.stats()
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query."""
+    return " ".join(query.lower().split())
+
+
+def search_cache_key(query: str, params: Dict[str, Any]) -> str:
+    """Key on the normalized query plus every parameter that changes the results."""
+    payload = json.dumps({"query": normalize_query(query), "params": params}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedSearchTool:
+    """
+    Wraps a search tool (anything with ``invoke``) with a result cache.
+
+    Args:
+        tool: Underlying search tool, e.g. TavilySearch or a local fake
+        cache: Cache backend
+        params: Tool configuration that affects results (e.g. max_results)
+    """
+
+    def __init__(self, tool, cache: SearchCache, params: Optional[Dict[str, Any]] = None):
+        self.tool = tool
+        self.cache = cache
+        self.params = params or {}
+
+    def invoke(self, tool_input: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        if isinstance(tool_input, str):
+            tool_input = {"query": tool_input}
+        query = tool_input["query"]
+        extra = {name: value for name, value in tool_input.items() if name != "query"}
+        key = search_cache_key(query, {**self.params, **extra})
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self.tool.invoke(tool_input)
+        # Tavily reports failures as {"error": exception}; only cache real results
+        if "results" in result:
+            self.cache.set(key, result)
+        return result
+
+
+@lru_cache(maxsize=1)
+def get_search_cache() -> Optional[SearchCache]:
+    """
+    Get the configured search cache backend.
+
+    Returns:
+        Cache instance, or None when SEARCH_CACHE=off
+    """
+    if SEARCH_CACHE == "memory":
+        return MemorySearchCache(SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_ENTRIES)
+    if SEARCH_CACHE == "disk":
+        return DiskSearchCache(
+            SEARCH_CACHE_PATH, SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_ENTRIES
+        )
+    return None
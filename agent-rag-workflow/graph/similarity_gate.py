@@ -0,0 +1,154 @@
+"""
+Similarity gate in front of the LLM relevance grader.
+
+Each retrieved chunk normally costs one ``retrieval_grader`` call. With the
+gate enabled, chunks are first triaged by their cosine similarity to the
+question (``metadata["similarity"]``, set by the native MMR retriever and kept
+for dense hits by the hybrid retriever, so the gate needs ``MMR_IMPL=native``;
+``ingestion.get_retriever`` warns if it is configured without it):
+
+- similarity >= ``GRADE_ACCEPT_SIMILARITY``: relevant, no LLM call
+- similarity <= ``GRADE_REJECT_SIMILARITY``: not relevant, no LLM call
+- anything in between, or unscored: graded by the LLM as before
+
+Either threshold can be left unset to gate only one side. Calibrate both from
+labelled examples with ``python calibrate_grading.py``.
+"""
+
+import os
+import threading
+from typing import Dict, List, NamedTuple, Optional
+
+from langchain_core.documents import Document
+
+from graph.chains.retrieval_grader import (
+    GradeDocuments,
+    grade_documents_batch,
+    retrieval_grader,
+)
+
+
+def _threshold(name: str) -> Optional[float]:
+    value = os.getenv(name, "")
+    return float(value) if value else None
+
+
+# Unset = that side of the gate is off
+GRADE_ACCEPT_SIMILARITY = _threshold("GRADE_ACCEPT_SIMILARITY")
+GRADE_REJECT_SIMILARITY = _threshold("GRADE_REJECT_SIMILARITY")
+
+
+class GateResult(NamedTuple):
+    grades: List[GradeDocuments]
+    accepted: int
+    rejected: int
+    graded: int
+    unscored: int
+
+    @property
+    def skipped(self) -> int:
+        """Grader calls the gate saved."""
+        return self.accepted + self.rejected
+
+
+class GateStats:
+    """Process-wide counters for how many grader calls the gate skipped."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.accepted = 0
+        self.rejected = 0
+        self.graded = 0
+        self.unscored = 0
+
+    def record(self, result: GateResult) -> None:
+        with self._lock:
+            self.accepted += result.accepted
+            self.rejected += result.rejected
+            self.graded += result.graded
+            self.unscored += result.unscored
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            skipped = self.accepted + self.rejected
+            total = skipped + self.graded
+            return {
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "graded": self.graded,
+                "unscored": self.unscored,
+                "skipped": skipped,
+                "skip_rate": skipped / total if total else 0.0,
+            }
+
+
+stats = GateStats()
+
+
+def enabled() -> bool:
+    return GRADE_ACCEPT_SIMILARITY is not None or GRADE_REJECT_SIMILARITY is not None
+
+
+def triage(
+    documents: List[Document],
+    accept: Optional[float] = None,
+    reject: Optional[float] = None,
+) -> List[Optional[bool]]:
+    """
+    Decide what the similarity scores alone can.
+
+    Args:
+        documents: Retrieved chunks
+        accept: Accept at or above this similarity (default GRADE_ACCEPT_SIMILARITY)
+        reject: Reject at or below this similarity (default GRADE_REJECT_SIMILARITY)
+
+    Returns:
+        Per document: True (relevant), False (not relevant) or None (ask the LLM)
+    """
+    accept = GRADE_ACCEPT_SIMILARITY if accept is None else accept
+    reject = GRADE_REJECT_SIMILARITY if reject is None else reject
+
+    verdicts: List[Optional[bool]] = []
+    for doc in documents:
+        similarity = doc.metadata.get("similarity")
+        if similarity is None:
+            verdicts.append(None)
+        elif accept is not None and similarity >= accept:
+            verdicts.append(True)
+        elif reject is not None and similarity <= reject:
+            verdicts.append(False)
+        else:
+            verdicts.append(None)
+    return verdicts
+
+
+def grade(question: str, documents: List[Document]) -> GateResult:
+    """
+    Grade documents, calling the LLM grader only for those the gate cannot decide.
+
+    Args:
+        question: The user question
+        documents: Retrieved chunks
+
+    Returns:
+        One grade per document in order, plus how each was decided
+    """
+    verdicts = triage(documents)
+    uncertain = [doc for doc, verdict in zip(documents, verdicts) if verdict is None]
+    llm_grades = iter(grade_documents_batch(retrieval_grader, question, uncertain))
+
+    grades = [
+        next(llm_grades)
+        if verdict is None
+        else GradeDocuments(binary_score="yes" if verdict else "no")
+        for verdict in verdicts
+    ]
+    result = GateResult(
+        grades=grades,
+        accepted=verdicts.count(True),
+        rejected=verdicts.count(False),
+        graded=len(uncertain),
+        unscored=sum(doc.metadata.get("similarity") is None for doc in documents),
+    )
+    stats.record(result)
+    return result
@@ -0,0 +1,192 @@
+"""
+Speculative vector retrieval while the question router decides.
+
+When enabled, ``route_question`` calls :func:`start` before invoking the router
+LLM. Retrieval (and, in "grade" mode, document grading) runs on a background
+thread. If the router picks the vectorstore, the retrieve and grade_documents
+nodes take the speculative results instead of recomputing them; if it picks
+web search the speculation is discarded. Pending work is keyed by the run
+bound with :func:`utils.events.bind_run` plus the question, so concurrent runs
+of the same question in batch or server mode each keep their own.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from graph import similarity_gate
+from graph.chains.retrieval_grader import (
+    GradeDocuments,
+    grade_documents_batch,
+    retrieval_grader,
+)
+from ingestion import get_retriever
+from utils.events import current_run
+
+# "" = off, "retrieve" = speculative retrieval, "grade" = retrieval plus document grading
+SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "").lower()
+
+_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="speculative-retrieval")
+
+
+class Speculation:
+    """Background retrieval (and grading) for one question."""
+
+    def __init__(self, question: str, grade: bool):
+        self.question = question
+        self.grade = grade
+        self.documents: Future = Future()
+        self.grades: Future = Future()
+        self.retrieve_seconds = 0.0
+        self.grade_seconds = 0.0
+
+    def run(self) -> None:
+        try:
+            start = time.perf_counter()
+            documents = get_retriever().invoke(self.question)
+            self.retrieve_seconds = time.perf_counter() - start
+            self.documents.set_result(documents)
+        except Exception as e:
+            self.documents.set_exception(e)
+            self.grades.set_exception(e)
+            return
+
+        if not self.grade:
+            self.grades.set_result(None)
+            return
+        try:
+            start = time.perf_counter()
+            if similarity_gate.enabled():
+                grades = similarity_gate.grade(self.question, documents).grades
+            else:
+                grades = grade_documents_batch(retrieval_grader, self.question, documents)
+            self.grade_seconds = time.perf_counter() - start
+            self.grades.set_result(grades)
+        except Exception as e:
+            self.grades.set_exception(e)
+
+
+class SpeculationStats:
+    """Process-wide counters for how often speculation paid off."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = 0
+        self.used = 0
+        self.discarded = 0
+        self.saved_seconds = 0.0
+
+    def record(self, **increments) -> None:
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "started": self.started,
+                "used": self.used,
+                "discarded": self.discarded,
+                "use_rate": self.used / self.started if self.started else 0.0,
+                "saved_seconds": self.saved_seconds,
+            }
+
+
+stats = SpeculationStats()
+_lock = threading.Lock()
+_pending: Dict[Tuple[Optional[str], str], Speculation] = {}
+_graded: Dict[Tuple[Optional[str], str], Speculation] = {}
+
+
+def enabled() -> bool:
+    return SPECULATIVE_RETRIEVAL in {"retrieve", "grade"}
+
+
+def _key(question: str) -> Tuple[Optional[str], str]:
+    return current_run.get(), question
+
+
+def start(question: str) -> None:
+    """Begin speculative retrieval for ``question`` (no-op if already running)."""
+    key = _key(question)
+    with _lock:
+        if key in _pending:
+            return
+        speculation = Speculation(question, grade=SPECULATIVE_RETRIEVAL == "grade")
+        _pending[key] = speculation
+    stats.record(started=1)
+    _executor.submit(speculation.run)
+
+
+def discard(question: str) -> None:
+    """Drop the speculation for ``question`` (router did not choose the vectorstore)."""
+    with _lock:
+        speculation = _pending.pop(_key(question), None)
+    if speculation is not None:
+        stats.record(discarded=1)
+
+
+def take_documents(question: str) -> Optional[List[Document]]:
+    """
+    Claim speculatively retrieved documents, waiting if still in flight.
+
+    Args:
+        question: The routed question
+
+    Returns:
+        Retrieved documents, or None if there is no usable speculation
+    """
+    key = _key(question)
+    with _lock:
+        speculation = _pending.pop(key, None)
+    if speculation is None:
+        return None
+
+    waited = time.perf_counter()
+    try:
+        documents = speculation.documents.result()
+    except Exception:
+        stats.record(discarded=1)
+        return None
+    waited = time.perf_counter() - waited
+
+    stats.record(used=1, saved_seconds=max(0.0, speculation.retrieve_seconds - waited))
+    if speculation.grade:
+        with _lock:
+            _graded[key] = speculation
+    return documents
+
+
+def take_grades(question: str, documents: List[Document]) -> Optional[List[GradeDocuments]]:
+    """
+    Claim speculative grades for exactly these documents, waiting if still in flight.
+
+    Args:
+        question: The routed question
+        documents: Documents the grade_documents node is about to grade
+
+    Returns:
+        One grade per document in order, or None if not speculated
+    """
+    with _lock:
+        speculation = _graded.pop(_key(question), None)
+    if speculation is None or _contents(speculation.documents.result()) != _contents(documents):
+        return None
+
+    waited = time.perf_counter()
+    try:
+        grades = speculation.grades.result()
+    except Exception:
+        return None
+    waited = time.perf_counter() - waited
+
+    stats.record(saved_seconds=max(0.0, speculation.grade_seconds - waited))
+    return grades
+
+
+def _contents(documents: List[Document]) -> List[str]:
+    return [doc.page_content for doc in documents]
@@ -1,9 +1,11 @@
 """State definitions for the graph workflow."""
 
-from typing import List, TypedDict
+from typing import List, Optional, TypedDict
 
 from langchain_core.documents import Document
 
+from graph.doc_refs import DocRef
+
 
 class GraphState(TypedDict):
     """
@@ -12,11 +14,37 @@ class GraphState(TypedDict):
     Attributes:
     question: question to ask
     generation: LLM generation
+    best_generation: Latest generation the hallucination grader found grounded
+    generation_grade: Outcome of grading the latest generation
     web_search: Whether to add search
     documents: List of documents
+    doc_refs: Chunk IDs and scores standing in for documents (STATE_DOC_REFS mode)
+    context: Packed context built from documents, shared by generator and graders
+    regenerations: Regenerations so far after ungrounded answers
+    web_searches: Web searches so far
+    tokens_used: Estimated prompt + completion tokens spent so far
+    max_regenerations: Budget: regenerations allowed
+    max_web_searches: Budget: web searches allowed
+    token_budget: Budget: estimated tokens allowed (0 = unlimited)
+    deadline: Budget: epoch seconds after which the run stops retrying
+    verified: False when the run ended on budget exhaustion without a passing grade
+    budget_exhausted: Why the budget ran out, if it did
     """
 
     question: str
     generation: str
+    best_generation: str
+    generation_grade: str
     web_search: bool
     documents: List[Document]  # Fixed: was list[str], should be List[Document]
+    doc_refs: List[DocRef]
+    context: str
+    regenerations: int
+    web_searches: int
+    tokens_used: int
+    max_regenerations: int
+    max_web_searches: int
+    token_budget: int
+    deadline: Optional[float]
+    verified: bool
+    budget_exhausted: str
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+
+from benchmarks.fakes import TEXT
+from graph import budget
+from graph.budget import can_regenerate, can_web_search, exhausted_reason, initial_state
+from graph.consts import FINALIZE, GENERATE, WEBSEARCH
+from graph.graph import app
+
+QUESTION = "How do agents use memory?"
+
+
+def _grades(*values):
+    return [{"binary_score": value} for value in values]
+
+
+def _run(state):
+    """Run the graph; returns the nodes in the order they ran and the final state."""
+    nodes, result = [], None
+    for mode, chunk in app.stream(state, stream_mode=["updates", "values"]):
+        if mode == "updates":
+            nodes.extend(chunk)
+        else:
+            result = chunk
+    return nodes, result
+
+
+def test_token_budget_is_checked_against_tokens_used():
+    assert exhausted_reason({"token_budget": 100, "tokens_used": 99}) is None
+    assert exhausted_reason({"token_budget": 100, "tokens_used": 100}) == (
+        "token budget of 100 exhausted"
+    )
+    # 0 = unlimited
+    assert exhausted_reason({"token_budget": 0, "tokens_used": 10**9}) is None
+
+
+def test_deadline_is_checked_against_the_clock():
+    assert exhausted_reason({"deadline": time.time() + 60}) is None
+    assert exhausted_reason({"deadline": time.time() - 1}) == "deadline reached"
+    assert exhausted_reason({"deadline": None}) is None
+
+
+def test_retry_limits():
+    assert can_regenerate({"regenerations": 1, "max_regenerations": 2})
+    assert not can_regenerate({"regenerations": 2, "max_regenerations": 2})
+    assert can_web_search({"web_searches": 0, "max_web_searches": 1})
+    assert not can_web_search({"web_searches": 1, "max_web_searches": 1})
+
+
+def test_missing_limits_use_the_defaults(monkeypatch):
+    monkeypatch.setattr(budget, "TOKEN_BUDGET", 10)
+
+    assert exhausted_reason({"tokens_used": 10}) == "token budget of 10 exhausted"
+    assert can_regenerate({"regenerations": budget.MAX_REGENERATIONS - 1})
+    assert not can_regenerate({"regenerations": budget.MAX_REGENERATIONS})
+    assert not can_web_search({"web_searches": budget.MAX_WEB_SEARCHES})
+
+
+def test_token_budget_stops_before_grading(fakes):
+    nodes, result = _run(initial_state(QUESTION, token_budget=1))
+
+    assert nodes[-2:] == ["grade_generation", FINALIZE]
+    assert result["budget_exhausted"] == "token budget of 1 exhausted"
+    assert result["verified"] is False
+    assert "GradeHallucinations" not in fakes.llm.calls()
+
+
+def test_deadline_stops_before_grading(fakes):
+    state = {**initial_state(QUESTION), "deadline": time.time() - 1}
+
+    nodes, result = _run(state)
+
+    assert nodes.count(GENERATE) == 1
+    assert nodes[-1] == FINALIZE
+    assert result["budget_exhausted"] == "deadline reached"
+    assert "GradeHallucinations" not in fakes.llm.calls()
+
+
+@pytest.mark.parametrize("max_regenerations", [0, 2])
+def test_regeneration_limit_routes_to_finalize(fakes, max_regenerations):
+    fakes.llm.set_script({"GradeHallucinations": _grades(False)})
+
+    nodes, result = _run(initial_state(QUESTION, max_regenerations=max_regenerations))
+
+    assert nodes.count(GENERATE) == max_regenerations + 1
+    assert nodes[-1] == FINALIZE
+    assert result["regenerations"] == max_regenerations
+    assert result["budget_exhausted"] == "retry limit reached"
+
+
+@pytest.mark.parametrize("max_web_searches", [0, 2])
+def test_web_search_limit_routes_to_finalize(fakes, max_web_searches):
+    fakes.llm.set_script({"GradeAnswer": _grades(False)})
+
+    nodes, result = _run(initial_state(QUESTION, max_web_searches=max_web_searches))
+
+    assert nodes.count(WEBSEARCH) == max_web_searches
+    assert nodes.count(GENERATE) == max_web_searches + 1
+    assert nodes[-1] == FINALIZE
+    assert result["web_searches"] == max_web_searches
+    assert fakes.search.calls == max_web_searches
+    # Every draft was grounded, so the last one is returned
+    assert result["generation"] == result["best_generation"]
+    assert result["verified"] is False
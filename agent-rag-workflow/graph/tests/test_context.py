@@ -0,0 +1,120 @@
+from langchain_core.documents import Document
+
+from graph.budget import count_tokens
+from graph.context import (
+    MIN_OVERLAP_CHARS,
+    MIN_TRUNCATED_TOKENS,
+    SEPARATOR,
+    _deduplicate,
+    _overlap,
+    pack_context,
+)
+
+QUESTION = "How do agents use memory?"
+SHARED = "the splitter repeats this sentence between neighbouring chunks. "
+FIRST = "Agents plan tasks before acting, and " + SHARED
+SECOND = SHARED + "Memory keeps what earlier steps learned."
+
+
+def _doc(text, source="post", **metadata):
+    return Document(page_content=text, metadata={"source": source, **metadata})
+
+
+def _words(count, word="agent"):
+    return " ".join(f"{word}{i}" for i in range(count))
+
+
+def test_overlap_is_the_longest_suffix_prefix():
+    assert _overlap(FIRST, SECOND) == len(SHARED)
+    assert _overlap(SECOND, FIRST) == 0
+    assert _overlap("no shared text at all here, none", SECOND) == 0
+
+
+def test_short_overlaps_are_coincidence():
+    tail = SHARED[: MIN_OVERLAP_CHARS - 1]
+
+    assert _overlap("prefix " + tail, tail) == 0
+
+
+def test_neighbouring_chunks_are_trimmed_in_either_order():
+    in_order = _deduplicate([_doc(FIRST), _doc(SECOND)])
+    reversed_order = _deduplicate([_doc(SECOND), _doc(FIRST)])
+
+    assert in_order == [FIRST.strip(), "Memory keeps what earlier steps learned."]
+    assert reversed_order == [SECOND, "Agents plan tasks before acting, and"]
+
+
+def test_chunks_from_other_sources_are_not_trimmed():
+    assert _deduplicate([_doc(FIRST, "a"), _doc(SECOND, "b")]) == [FIRST.strip(), SECOND]
+
+
+def test_contained_chunks_are_dropped():
+    whole = FIRST + SECOND
+    later = _deduplicate([_doc(whole, "a"), _doc(SECOND, "b")])
+    earlier = _deduplicate([_doc(SECOND, "b"), _doc(whole, "a")])
+
+    assert later == [whole.strip(), ""]
+    assert earlier == ["", whole.strip()]
+
+
+def test_pack_skips_duplicates_and_counts_chunks():
+    packed = pack_context([_doc(FIRST), _doc(FIRST), _doc(SECOND)], QUESTION, token_budget=0)
+
+    assert packed.chunks == 2
+    assert packed.text.count(SHARED.strip()) == 1
+    assert packed.input_tokens == count_tokens(FIRST) * 2 + count_tokens(SECOND)
+
+
+def test_last_chunk_is_truncated_to_the_budget():
+    first, second = _words(100, "alpha"), _words(400, "beta")
+    budget = count_tokens(first) + count_tokens(SEPARATOR) + MIN_TRUNCATED_TOKENS + 10
+
+    packed = pack_context([_doc(first, "a"), _doc(second, "b")], QUESTION, token_budget=budget)
+
+    assert packed.chunks == 2
+    assert packed.tokens <= budget
+    assert packed.text.startswith(first + SEPARATOR + "beta0")
+    assert len(packed.text) < len(first + SEPARATOR + second)
+
+
+def test_short_remainders_are_dropped():
+    first, second = _words(100, "alpha"), _words(400, "beta")
+    budget = count_tokens(first) + count_tokens(SEPARATOR) + MIN_TRUNCATED_TOKENS - 1
+
+    packed = pack_context([_doc(first, "a"), _doc(second, "b")], QUESTION, token_budget=budget)
+
+    assert packed.text == first
+    assert packed.chunks == 1
+
+
+def test_web_results_are_ranked_against_normalized_retriever_scores():
+    # Hybrid mode: fused RRF scores, far below the 0-1 term overlap of web results
+    retrieved = [
+        _doc("top retrieved chunk", "a", score=0.032),
+        _doc("second retrieved chunk", "b", score=0.016),
+    ]
+    web = [
+        Document(page_content="agents store facts in memory"),  # 2 of 3 question terms
+        Document(page_content="nothing relevant"),
+    ]
+
+    packed = pack_context(retrieved + web, QUESTION, token_budget=0)
+
+    assert packed.text.split(SEPARATOR) == [
+        "top retrieved chunk",  # 1.0
+        "agents store facts in memory",
+        "second retrieved chunk",  # 0.016 / 0.032
+        "nothing relevant",
+    ]
+
+
+def test_unscored_chunks_rank_by_question_terms():
+    documents = [
+        Document(page_content="unrelated text"),
+        Document(page_content="memory only"),
+        Document(page_content="agents with memory"),
+    ]
+
+    packed = pack_context(documents, QUESTION, token_budget=0)
+
+    assert packed.text.split(SEPARATOR) == ["agents with memory", "memory only", "unrelated text"]
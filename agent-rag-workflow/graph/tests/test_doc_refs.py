@@ -0,0 +1,61 @@
+import pytest
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_core.documents import Document
+
+from graph import doc_refs
+
+
+@pytest.fixture
+def docstore(monkeypatch):
+    # Stored without IDs, as older stores and plain InMemoryDocstore entries are
+    store = InMemoryDocstore(
+        {
+            "chunk-a": Document(page_content="alpha", metadata={"source": "a"}),
+            "chunk-b": Document(page_content="beta", metadata={"source": "b"}),
+        }
+    )
+    monkeypatch.setattr(doc_refs, "get_docstore", lambda: store)
+    return store
+
+
+def test_round_trip_keeps_ids_scores_and_inline_documents(docstore):
+    documents = [
+        Document(
+            id="chunk-b",
+            page_content="beta",
+            metadata={"source": "b", "score": 0.5, "similarity": 0.75},
+        ),
+        Document(page_content="web result", metadata={"url": "https://example.com"}),
+        Document(id="chunk-a", page_content="alpha", metadata={"source": "a"}),
+    ]
+
+    refs = doc_refs.to_refs(documents)
+    restored = doc_refs.materialize(refs)
+
+    assert refs[0] == {"id": "chunk-b", "score": 0.5, "similarity": 0.75}
+    assert [doc.id for doc in restored] == ["chunk-b", None, "chunk-a"]
+    assert [doc.page_content for doc in restored] == ["beta", "web result", "alpha"]
+    assert restored[0].metadata == {"source": "b", "score": 0.5, "similarity": 0.75}
+    assert restored[1].metadata == {"url": "https://example.com"}
+
+
+def test_materialized_documents_are_copies(docstore):
+    (doc,) = doc_refs.materialize([{"id": "chunk-a", "score": 1.0}])
+    doc.metadata["extra"] = True
+
+    assert docstore.search("chunk-a").metadata == {"source": "a"}
+
+
+def test_missing_chunk_raises_key_error(docstore):
+    with pytest.raises(KeyError):
+        doc_refs.materialize([{"id": "chunk-z"}])
+
+
+def test_add_documents_builds_a_new_list():
+    existing = [{"id": "chunk-a"}]
+    state = {"doc_refs": existing}
+
+    update = doc_refs.add_documents(state, [Document(page_content="web")])
+
+    assert existing == [{"id": "chunk-a"}]
+    assert update["doc_refs"] == [{"id": "chunk-a"}, {"text": "web", "metadata": {}}]
@@ -0,0 +1,65 @@
+from benchmarks.fakes import TEXT
+from graph.budget import initial_state
+from graph.graph import app
+
+QUESTION = "How do agents use memory?"
+
+
+def _run(fakes, drafts, grounded, useful, **budget):
+    fakes.llm.set_script({TEXT: drafts, "GradeHallucinations": grounded, "GradeAnswer": useful})
+    return app.invoke(initial_state(QUESTION, **budget))
+
+
+def _grades(*values):
+    return [{"binary_score": value} for value in values]
+
+
+def test_budget_exhaustion_returns_last_grounded_draft(fakes):
+    # A: grounded but misses the question -> web search -> B, C: not grounded
+    result = _run(
+        fakes,
+        drafts=["A", "B", "C"],
+        grounded=_grades(True, False, False),
+        useful=_grades(False),
+        max_regenerations=1,
+        max_web_searches=1,
+    )
+
+    assert result["generation"] == "A"
+    assert result["verified"] is False
+    assert result["budget_exhausted"]
+
+
+def test_budget_exhaustion_without_grounded_draft_returns_latest(fakes):
+    result = _run(
+        fakes,
+        drafts=["A", "B"],
+        grounded=_grades(False),
+        useful=_grades(True),
+        max_regenerations=1,
+    )
+
+    assert result["generation"] == "B"
+    assert result["verified"] is False
+
+
+def test_grounded_latest_draft_is_kept(fakes):
+    result = _run(
+        fakes,
+        drafts=["A"],
+        grounded=_grades(True),
+        useful=_grades(False),
+        max_web_searches=0,
+    )
+
+    assert result["generation"] == "A"
+    assert result["best_generation"] == "A"
+    assert result["verified"] is False
+
+
+def test_useful_answer_is_verified(fakes):
+    result = _run(fakes, drafts=["A"], grounded=_grades(True), useful=_grades(True))
+
+    assert result["generation"] == "A"
+    assert result.get("verified", True) is True
+    assert "budget_exhausted" not in result
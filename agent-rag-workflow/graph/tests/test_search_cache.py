@@ -0,0 +1,101 @@
+import time
+
+import pytest
+
+from benchmarks.fakes import FakeSearchTool
+from graph.search_cache import (
+    CachedSearchTool,
+    DiskSearchCache,
+    MemorySearchCache,
+    search_cache_key,
+)
+
+
+class FailingSearchTool:
+    """Returns Tavily's error payload for the first ``failures`` calls, then results."""
+
+    def __init__(self, failures: int = 1):
+        self.failures = failures
+        self.search = FakeSearchTool()
+        self.calls = 0
+
+    def invoke(self, input):
+        self.calls += 1
+        if self.calls <= self.failures:
+            return {"error": ConnectionError("search API unreachable")}
+        return self.search.invoke(input)
+
+
+@pytest.fixture(params=["memory", "disk"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return MemorySearchCache(ttl_seconds=60)
+    return DiskSearchCache(str(tmp_path / "search.sqlite"), ttl_seconds=60)
+
+
+def test_repeated_query_is_served_from_cache(cache):
+    search = FakeSearchTool()
+    tool = CachedSearchTool(search, cache, params={"max_results": 3})
+
+    first = tool.invoke({"query": "Agent memory"})
+    second = tool.invoke("  agent   MEMORY ")
+
+    assert search.calls == 1
+    assert second == first
+    assert cache.stats()["hits"] == 1
+
+
+def test_parameters_are_part_of_the_key(cache):
+    search = FakeSearchTool()
+    tool = CachedSearchTool(search, cache, params={"max_results": 3})
+
+    tool.invoke({"query": "agent memory"})
+    tool.invoke({"query": "agent memory", "topic": "news"})
+
+    assert search.calls == 2
+    assert search_cache_key("q", {"max_results": 3}) != search_cache_key("q", {"max_results": 5})
+
+
+def test_error_payloads_are_not_cached(cache):
+    search = FailingSearchTool(failures=1)
+    tool = CachedSearchTool(search, cache)
+
+    failed = tool.invoke({"query": "agent memory"})
+    recovered = tool.invoke({"query": "agent memory"})
+    cached = tool.invoke({"query": "agent memory"})
+
+    assert "error" in failed
+    assert recovered["results"]
+    assert cached == recovered
+    assert search.calls == 2
+
+
+def test_cached_results_cannot_be_mutated_by_callers():
+    tool = CachedSearchTool(FakeSearchTool(), MemorySearchCache())
+
+    tool.invoke({"query": "agent memory"})["results"].clear()
+
+    assert tool.invoke({"query": "agent memory"})["results"]
+
+
+def test_expired_entries_are_fetched_again():
+    search = FakeSearchTool()
+    tool = CachedSearchTool(search, MemorySearchCache(ttl_seconds=0.01))
+
+    tool.invoke({"query": "agent memory"})
+    time.sleep(0.02)
+    tool.invoke({"query": "agent memory"})
+
+    assert search.calls == 2
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemorySearchCache(max_entries=2)
+    cache.set("a", {"results": []})
+    cache.set("b", {"results": []})
+    cache.get("a")
+    cache.set("c", {"results": []})
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["entries"] == 2
@@ -0,0 +1,50 @@
+import pytest
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_core.documents import Document
+
+from graph import doc_refs, similarity_gate
+from graph.nodes.grade_documents import grade_documents
+
+
+@pytest.fixture
+def gate(monkeypatch):
+    monkeypatch.setattr(similarity_gate, "GRADE_ACCEPT_SIMILARITY", 0.8)
+    monkeypatch.setattr(similarity_gate, "GRADE_REJECT_SIMILARITY", 0.2)
+
+
+@pytest.fixture
+def docstore(monkeypatch):
+    store = InMemoryDocstore(
+        {
+            chunk_id: Document(page_content=chunk_id, metadata={"source": chunk_id})
+            for chunk_id in ("high", "middle", "low", "unscored")
+        }
+    )
+    monkeypatch.setattr(doc_refs, "get_docstore", lambda: store)
+    return store
+
+
+def _retrieved():
+    similarities = {"high": 0.9, "middle": 0.5, "low": 0.1}
+    return [
+        Document(id=chunk_id, page_content=chunk_id, metadata={"similarity": similarity})
+        for chunk_id, similarity in similarities.items()
+    ] + [Document(id="unscored", page_content="unscored")]
+
+
+def test_triage_uses_both_thresholds(gate):
+    assert similarity_gate.triage(_retrieved()) == [True, None, False, None]
+
+
+def test_gate_decides_from_refs(gate, docstore, fakes, monkeypatch):
+    monkeypatch.setattr(doc_refs, "STATE_DOC_REFS", True)
+    fakes.llm.set_script({"GradeDocuments": [{"binary_score": "no"}]})
+    state = {"question": "What is agent memory?", "doc_refs": doc_refs.to_refs(_retrieved())}
+
+    update = grade_documents(state)
+
+    # Only the undecided chunks reach the LLM grader, which rejects both
+    assert fakes.llm.calls().get("GradeDocuments") == 2
+    assert [ref["id"] for ref in update["doc_refs"]] == ["high"]
+    assert update["doc_refs"][0]["similarity"] == 0.9
+    assert update["web_search"] is True
@@ -0,0 +1,63 @@
+import pytest
+
+from graph import speculation
+from graph.consts import RETRIEVE, WEBSEARCH
+from graph.graph import route_question
+from utils.events import bind_run
+
+QUESTION = "How do agents use memory?"
+
+
+@pytest.fixture
+def speculating(monkeypatch):
+    monkeypatch.setattr(speculation, "SPECULATIVE_RETRIEVAL", "retrieve")
+    monkeypatch.setattr(speculation, "stats", speculation.SpeculationStats())
+    yield
+    speculation._pending.clear()
+    speculation._graded.clear()
+
+
+def test_concurrent_runs_of_one_question_keep_their_own_speculation(speculating):
+    with bind_run("a"):
+        speculation.start(QUESTION)
+    with bind_run("b"):
+        speculation.start(QUESTION)
+    assert len(speculation._pending) == 2
+
+    with bind_run("a"):
+        assert speculation.take_documents(QUESTION)
+    with bind_run("b"):
+        assert speculation.take_documents(QUESTION)
+    with bind_run("c"):
+        assert speculation.take_documents(QUESTION) is None
+
+    assert speculation.stats.as_dict()["started"] == 2
+    assert speculation.stats.as_dict()["used"] == 2
+
+
+def test_vectorstore_route_keeps_speculation_for_retrieve(fakes, speculating):
+    with bind_run("run"):
+        assert route_question({"question": QUESTION}) == RETRIEVE
+        assert speculation.take_documents(QUESTION)
+
+    assert speculation.stats.as_dict()["used"] == 1
+
+
+def test_websearch_route_discards_speculation(fakes, speculating):
+    fakes.llm.set_script({"RouteQuery": [{"datasource": "websearch"}]})
+
+    with bind_run("run"):
+        assert route_question({"question": QUESTION}) == WEBSEARCH
+
+    assert not speculation._pending
+    assert speculation.stats.as_dict()["discarded"] == 1
+
+
+def test_router_failure_discards_speculation(fakes, speculating):
+    fakes.llm.set_script({"RouteQuery": [RuntimeError("router down")]})
+
+    with bind_run("run"), pytest.raises(RuntimeError):
+        route_question({"question": QUESTION})
+
+    assert not speculation._pending
+    assert speculation.stats.as_dict()["discarded"] == 1
@@ -0,0 +1,75 @@
+import pytest
+
+import graph.graph as workflow
+from graph.budget import initial_state
+from graph.consts import GRADE_GENERATION
+from graph.graph import app
+
+QUESTION = "How do agents use memory?"
+
+# Keys that describe how a run was routed and what it returned
+OUTCOME = [
+    "generation",
+    "best_generation",
+    "generation_grade",
+    "verified",
+    "budget_exhausted",
+    "regenerations",
+    "web_searches",
+]
+
+
+def _grades(*values):
+    return [{"binary_score": value} for value in values]
+
+
+def _run(fakes, script, speculative, monkeypatch):
+    """Run the graph with the given grading mode; returns nodes, outcome and LLM calls."""
+    monkeypatch.setattr(workflow, "SPECULATIVE_GRADING", speculative)
+    fakes.llm.set_script(script)
+    fakes.search.calls = 0
+    nodes, result = [], None
+    for mode, chunk in app.stream(initial_state(QUESTION), stream_mode=["updates", "values"]):
+        if mode == "updates":
+            nodes.extend(chunk)
+        else:
+            result = chunk
+    return nodes, {key: result.get(key) for key in OUTCOME}, fakes.llm.calls()
+
+
+@pytest.mark.parametrize(
+    "script",
+    [
+        pytest.param({}, id="grounded-and-useful"),
+        pytest.param({"GradeAnswer": _grades(False, True)}, id="not-useful-then-useful"),
+        pytest.param({"GradeHallucinations": _grades(False, True)}, id="regenerated-once"),
+        pytest.param({"GradeHallucinations": _grades(False)}, id="never-grounded"),
+        pytest.param({"GradeAnswer": _grades(False)}, id="never-useful"),
+    ],
+)
+def test_speculative_grading_routes_like_sequential_grading(fakes, monkeypatch, script):
+    nodes, outcome, calls = _run(fakes, script, False, monkeypatch)
+    spec_nodes, spec_outcome, spec_calls = _run(fakes, script, True, monkeypatch)
+
+    assert spec_nodes == nodes
+    assert spec_outcome == outcome
+    gradings = nodes.count(GRADE_GENERATION)
+    assert spec_calls["GradeHallucinations"] == calls["GradeHallucinations"] == gradings
+    # Speculation grades the answer on every draft; the sequential path only on grounded ones
+    assert spec_calls["GradeAnswer"] == gradings
+    assert calls.get("GradeAnswer", 0) == gradings - _ungrounded(script, gradings)
+
+
+def _ungrounded(script, gradings):
+    """Drafts the scripted hallucination grader rejects over ``gradings`` calls."""
+    outputs = script.get("GradeHallucinations", _grades(True))
+    return sum(not outputs[min(n, len(outputs) - 1)]["binary_score"] for n in range(gradings))
+
+
+def test_speculative_answer_grade_is_reused(fakes, monkeypatch):
+    _, outcome, calls = _run(fakes, {}, True, monkeypatch)
+
+    # The grounded draft is accepted with the answer grade computed alongside it
+    assert outcome["generation_grade"] == "useful"
+    assert calls["GradeHallucinations"] == 1
+    assert calls["GradeAnswer"] == 1
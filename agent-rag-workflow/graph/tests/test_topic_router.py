@@ -0,0 +1,105 @@
+import pytest
+
+from graph import speculation, topic_router
+from graph.consts import RETRIEVE, WEBSEARCH
+from graph.graph import route_question
+from utils.events import bind_run
+
+AGENT_TOPIC = "https://lilianweng.github.io/posts/2023-06-23-agent/"
+QUESTION = "How does agent memory and planning work?"
+
+
+@pytest.fixture
+def router_stats(monkeypatch):
+    stats = topic_router.RouteStats()
+    monkeypatch.setattr(topic_router, "stats", stats)
+    return stats
+
+
+@pytest.fixture
+def thresholds(monkeypatch):
+    """Set the fast path's thresholds for route_question."""
+
+    def set_thresholds(vectorstore=None, websearch=None):
+        monkeypatch.setattr(topic_router, "ROUTER_VECTORSTORE_SIMILARITY", vectorstore)
+        monkeypatch.setattr(topic_router, "ROUTER_WEBSEARCH_SIMILARITY", websearch)
+
+    return set_thresholds
+
+
+@pytest.fixture
+def speculating(monkeypatch):
+    monkeypatch.setattr(speculation, "SPECULATIVE_RETRIEVAL", "retrieve")
+    monkeypatch.setattr(speculation, "stats", speculation.SpeculationStats())
+    yield
+    speculation._pending.clear()
+    speculation._graded.clear()
+
+
+def _similarity(question=QUESTION) -> float:
+    return topic_router.route(question, 2.0, -2.0).similarity
+
+
+def test_closest_topic_is_reported(router_stats):
+    result = topic_router.route(QUESTION, vectorstore_threshold=2.0, websearch_threshold=-2.0)
+
+    assert result.topic == AGENT_TOPIC
+    assert 0.0 < result.similarity <= 1.0
+
+
+def test_similarity_bands(router_stats):
+    similarity = _similarity()
+
+    assert topic_router.route(QUESTION, similarity, -2.0).datasource == "vectorstore"
+    assert topic_router.route(QUESTION, similarity + 0.01, similarity).datasource == "websearch"
+    ambiguous = topic_router.route(QUESTION, similarity + 0.01, similarity - 0.01)
+    assert ambiguous.datasource is None
+    assert router_stats.as_dict() == {"fast": 2, "ambiguous": 2, "fast_rate": 0.5}
+
+
+def test_unset_threshold_only_decides_the_other_side(router_stats, thresholds):
+    similarity = _similarity()
+    thresholds(vectorstore=None, websearch=similarity - 0.01)
+
+    assert topic_router.route(QUESTION).datasource is None
+    assert topic_router.route(QUESTION, vectorstore_threshold=similarity).datasource == (
+        "vectorstore"
+    )
+
+
+def test_no_centroids_means_no_fast_path(router_stats, monkeypatch):
+    monkeypatch.setattr(topic_router, "get_topic_centroids", lambda: None)
+
+    assert topic_router.route(QUESTION, 0.0, 0.0) is None
+    assert router_stats.as_dict()["ambiguous"] == 0
+
+
+@pytest.mark.parametrize(
+    "band, expected",
+    [({"vectorstore": -1.0}, RETRIEVE), ({"websearch": 1.0}, WEBSEARCH)],
+)
+def test_fast_path_skips_the_router_llm_and_speculation(
+    fakes, router_stats, thresholds, speculating, band, expected
+):
+    thresholds(**band)
+
+    with bind_run("run"):
+        assert route_question({"question": QUESTION}) == expected
+
+    assert "RouteQuery" not in fakes.llm.calls()
+    assert speculation.stats.as_dict()["started"] == 0
+    assert not speculation._pending
+    assert router_stats.as_dict()["fast"] == 1
+
+
+def test_ambiguous_question_asks_the_router(fakes, router_stats, thresholds, speculating):
+    fakes.llm.set_script({"RouteQuery": [{"datasource": "websearch"}]})
+    thresholds(vectorstore=2.0, websearch=-2.0)
+
+    with bind_run("run"):
+        assert route_question({"question": QUESTION}) == WEBSEARCH
+
+    assert fakes.llm.calls()["RouteQuery"] == 1
+    assert speculation.stats.as_dict()["started"] == 1
+    assert speculation.stats.as_dict()["discarded"] == 1
+    assert router_stats.as_dict()["ambiguous"] == 1
@@ -0,0 +1,109 @@
+"""
+Embedding fast path for routing questions without the router LLM.
+
+The question embedding is compared with the topic centroids of the indexed
+chunks (see retrieval.centroids). The best cosine similarity decides:
+
+- >= ``ROUTER_VECTORSTORE_SIMILARITY``: close to an indexed topic -> vectorstore
+- <= ``ROUTER_WEBSEARCH_SIMILARITY``: far from every topic -> web search
+- in between: ambiguous, ``question_router`` decides as before
+
+Either threshold can be left unset to decide only one side instantly. The
+centroids are recomputed whenever the vectorstore is saved, so the topics
+follow the corpus instead of the router prompt.
+"""
+
+import os
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from ingestion import get_retriever, get_topic_centroids
+
+
+def _threshold(name: str) -> Optional[float]:
+    value = os.getenv(name, "")
+    return float(value) if value else None
+
+
+# Unset = that side of the fast path is off
+ROUTER_VECTORSTORE_SIMILARITY = _threshold("ROUTER_VECTORSTORE_SIMILARITY")
+ROUTER_WEBSEARCH_SIMILARITY = _threshold("ROUTER_WEBSEARCH_SIMILARITY")
+
+
+class TopicRoute(NamedTuple):
+    datasource: Optional[str]  # "vectorstore", "websearch", or None when ambiguous
+    topic: str
+    similarity: float
+
+
+class RouteStats:
+    """Process-wide counters for how often the fast path saved the router LLM call."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fast = 0
+        self.ambiguous = 0
+
+    def record(self, fast: bool) -> None:
+        with self._lock:
+            if fast:
+                self.fast += 1
+            else:
+                self.ambiguous += 1
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            total = self.fast + self.ambiguous
+            return {
+                "fast": self.fast,
+                "ambiguous": self.ambiguous,
+                "fast_rate": self.fast / total if total else 0.0,
+            }
+
+
+stats = RouteStats()
+
+
+def enabled() -> bool:
+    return ROUTER_VECTORSTORE_SIMILARITY is not None or ROUTER_WEBSEARCH_SIMILARITY is not None
+
+
+def route(
+    question: str,
+    vectorstore_threshold: Optional[float] = None,
+    websearch_threshold: Optional[float] = None,
+) -> Optional[TopicRoute]:
+    """
+    Route by similarity to the topic centroids.
+
+    Args:
+        question: The user question
+        vectorstore_threshold: Default ROUTER_VECTORSTORE_SIMILARITY
+        websearch_threshold: Default ROUTER_WEBSEARCH_SIMILARITY
+
+    Returns:
+        The closest topic and, if the similarity is clear-cut, the datasource;
+        None if the vectorstore has no centroids
+    """
+    centroids = get_topic_centroids()
+    if centroids is None or not centroids.topics:
+        return None
+
+    embeddings = get_retriever().vectorstore.embedding_function
+    query_vector = np.asarray(embeddings.embed_query(question), dtype=np.float32)
+    topic, similarity = centroids.best_match(query_vector)
+
+    if vectorstore_threshold is None:
+        vectorstore_threshold = ROUTER_VECTORSTORE_SIMILARITY
+    if websearch_threshold is None:
+        websearch_threshold = ROUTER_WEBSEARCH_SIMILARITY
+
+    datasource = None
+    if vectorstore_threshold is not None and similarity >= vectorstore_threshold:
+        datasource = "vectorstore"
+    elif websearch_threshold is not None and similarity <= websearch_threshold:
+        datasource = "websearch"
+    stats.record(fast=datasource is not None)
+    return TopicRoute(datasource, topic, similarity)
@@ -1,18 +1,33 @@
 """Document ingestion and vectorstore management."""
 
-# import os
+import os
 from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
-from langchain_community.document_loaders import WebBaseLoader
+from langchain_community.docstore.base import Docstore
 from langchain_community.vectorstores import FAISS
 from langchain_core.documents import Document
-from langchain_core.vectorstores import VectorStoreRetriever
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.retrievers import BaseRetriever
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from model.embeddings import CachedEmbeddings, get_embeddings
+from retrieval.bm25 import open_bm25
+from retrieval.centroids import TopicCentroids, load_centroids
+from retrieval.hybrid import HybridRetriever
+from retrieval.index import INDEX_TYPE, build_vectorstore, configure_search, supports_remove
+from retrieval.manifest import MANIFEST_FILENAME, chunk_ids, empty_manifest, load_manifest
+from retrieval.mmr import NativeMMRRetriever
+from retrieval.persistence import (
+    CorruptVectorstoreError,
+    has_store,
+    load_vectorstore,
+    save_vectorstore,
+    validate_store,
+)
+from retrieval.sources import FAILED, UNCHANGED, FetchResult, fetch_sources
+
 load_dotenv()
 
 # Configuration
@@ -22,10 +37,21 @@ URLS = [
     "https://lilianweng.github.io/posts/2023-03-15-prompt-engineering/",
     "https://lilianweng.github.io/posts/2023-10-25-adv-attack-llm/",
 ]
+# "native" runs MMR with batched NumPy over a normalized embedding matrix (same results)
+MMR_IMPL = os.getenv("MMR_IMPL", "langchain")
+# Hash the index files against the manifest on every load (slower for large corpora)
+VECTORSTORE_VERIFY = os.getenv("VECTORSTORE_VERIFY", "").lower() in {"1", "true", "yes"}
+# "hybrid" fuses the MMR results with BM25 keyword hits (reciprocal rank fusion)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "dense")
+# Results taken from each retriever before fusion in hybrid mode
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "10"))
+
+# Set once the unscored similarity gate warning has been printed
+_similarity_gate_warned = False
 
 
 @lru_cache(maxsize=1)
-def get_retriever(force_refresh: bool = False) -> VectorStoreRetriever:
+def get_retriever(force_refresh: bool = False, incremental: bool = False) -> BaseRetriever:
     """
     Get or create the retriever instance with caching.
 
@@ -34,41 +60,98 @@ def get_retriever(force_refresh: bool = False) -> VectorStoreRetriever:
 
     Args:
         force_refresh: If True, recreate vectorstore from source URLs
+        incremental: With force_refresh, only re-ingest sources that changed since
+            the last ingest (tracked in the manifest) instead of rebuilding everything
 
     Returns:
-        Configured retriever instance with MMR search
+        Configured retriever instance with MMR search (fused with BM25 in hybrid mode)
     """
     # Try to load existing vectorstore
-    if VECTORSTORE_PATH.exists() and not force_refresh:
+    if _vectorstore_exists() and not force_refresh:
         print(f"📂 Loading cached vectorstore from {VECTORSTORE_PATH}")
         try:
-            vectorstore = FAISS.load_local(
-                str(VECTORSTORE_PATH),
-                OpenAIEmbeddings(),
-                allow_dangerous_deserialization=True,
-            )
-            print(f"✓ Loaded vectorstore with {vectorstore.index.ntotal} vectors")
-        except Exception as e:
-            print(f"⚠️  Failed to load cached vectorstore: {e}")
-            print("Creating new vectorstore...")
-            vectorstore = _create_vectorstore()
+            vectorstore = _load_vectorstore()
+        except CorruptVectorstoreError as e:
+            # Fail fast: silently rebuilding would re-download and re-embed everything
+            print(f"❌ Cached vectorstore is corrupt: {e}")
+            print("   Run `python ingestion.py --refresh` to rebuild it.")
+            raise
+        print(f"✓ Loaded vectorstore with {vectorstore.index.ntotal} vectors")
+    elif incremental and _vectorstore_exists():
+        print("🔄 Incremental refresh requested...")
+        vectorstore = _update_vectorstore()
     else:
         if force_refresh:
             print("🔄 Force refresh requested...")
         print("Creating new vectorstore from URLs...")
         vectorstore = _create_vectorstore()
 
+    return _build_retriever(vectorstore)
+
+
+def _build_retriever(vectorstore: FAISS) -> BaseRetriever:
+    """Configure the MMR retriever over ``vectorstore`` (fused with BM25 in hybrid mode)."""
+    # Apply query-time nprobe / efSearch for approximate indexes
+    configure_search(vectorstore.index)
+
     # Configure retriever with MMR for better diversity
-    return vectorstore.as_retriever(
-        search_type="mmr",  # Maximum Marginal Relevance
-        search_kwargs={
-            "k": 4,  # Return top 4 results
-            "fetch_k": 20,  # Fetch 20 candidates before MMR filtering
-            "lambda_mult": 0.7,  # Balance: 0.7 = 70% relevance, 30% diversity
-        },
+    mmr_kwargs = {
+        "k": 4,  # Return top 4 results
+        "fetch_k": 20,  # Fetch 20 candidates before MMR filtering
+        "lambda_mult": 0.7,  # Balance: 0.7 = 70% relevance, 30% diversity
+    }
+    keyword = open_bm25(VECTORSTORE_PATH) if RETRIEVAL_MODE == "hybrid" else None
+    if RETRIEVAL_MODE == "hybrid" and keyword is None:
+        print("⚠️  No BM25 index next to the vectorstore, using dense retrieval only")
+        print("   Run `python ingestion.py --refresh` to build it.")
+    if keyword is not None:
+        # Rank more dense candidates; fusion cuts the result back to k
+        mmr_kwargs["k"] = max(mmr_kwargs["k"], HYBRID_CANDIDATES)
+        mmr_kwargs["fetch_k"] = max(mmr_kwargs["fetch_k"], HYBRID_CANDIDATES)
+
+    if MMR_IMPL == "native":
+        dense = NativeMMRRetriever(vectorstore=vectorstore, **mmr_kwargs)
+    else:
+        dense = vectorstore.as_retriever(
+            search_type="mmr",  # Maximum Marginal Relevance
+            search_kwargs=mmr_kwargs,
+        )
+    _check_similarity_gate(dense)
+    if keyword is None:
+        return dense
+    return HybridRetriever(
+        vectorstore=vectorstore, dense=dense, keyword=keyword, k=4, candidates=HYBRID_CANDIDATES
     )
 
 
+def get_docstore() -> Docstore:
+    """
+    Get the chunk store behind the retriever.
+
+    Graph state can reference chunks by ID (see graph.doc_refs) and fetch their
+    text from here. For a persisted store this reads ``chunks.sqlite`` on demand.
+
+    Returns:
+        Read-only docstore keyed by chunk ID
+    """
+    return get_retriever().vectorstore.docstore
+
+
+@lru_cache(maxsize=1)
+def get_topic_centroids() -> Optional[TopicCentroids]:
+    """
+    Get the per-source embedding centroids saved with the vectorstore.
+
+    Used by the router's embedding fast path (see graph.topic_router). They are
+    recomputed on every save, so a refresh picks up added or removed sources.
+
+    Returns:
+        Topic centroids, or None if the store was saved before they existed
+    """
+    get_retriever()  # Creates or migrates the store on first use
+    return load_centroids(VECTORSTORE_PATH)
+
+
 def _create_vectorstore() -> FAISS:
     """
     Create vectorstore from source URLs.
@@ -82,43 +165,44 @@ def _create_vectorstore() -> FAISS:
     try:
         # Load documents with error handling per URL
         print("📥 Downloading documents...")
-        all_docs: List[Document] = []
-        for url in URLS:
-            try:
-                loader = WebBaseLoader(url)
-                docs = loader.load()
-                all_docs.extend(docs)
-                print(f"  ✓ Loaded {url}")
-            except Exception as e:
-                print(f"  ✗ Failed to load {url}: {e}")
-
-        if not all_docs:
+        results: List[FetchResult] = []
+        for result in fetch_sources(URLS):
+            if result.status == FAILED:
+                print(f"  ✗ Failed to load {result.url}: {result.error}")
+                continue
+            results.append(result)
+            print(f"  ✓ Loaded {result.url}")
+
+        if not results:
             raise ValueError("No documents loaded successfully from any URL")
 
-        print(f"✓ Loaded {len(all_docs)} documents total")
+        print(f"✓ Loaded {len(results)} documents total")
 
         # Split documents with improved settings
         print("✂️  Splitting documents into chunks...")
-        text_splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            chunk_size=500,  # Larger chunks for better context (was 250)
-            chunk_overlap=50,  # 10% overlap to preserve context (was 0)
-        )
-        doc_splits = text_splitter.split_documents(all_docs)
+        text_splitter = _get_text_splitter()
+        manifest = empty_manifest()
+        doc_splits: List[Document] = []
+        ids: List[str] = []
+        for result in results:
+            splits, split_ids = _split_source(text_splitter, result.document)
+            doc_splits.extend(splits)
+            ids.extend(split_ids)
+            manifest["sources"][result.url] = {**result.fingerprint, "chunk_ids": split_ids}
         print(f"✓ Created {len(doc_splits)} chunks")
 
         # Create embeddings and FAISS index
-        print("🔢 Creating embeddings and building FAISS index...")
-        print("   (This may take a minute and will call OpenAI API...)")
-        vectorstore = FAISS.from_documents(
-            documents=doc_splits, embedding=OpenAIEmbeddings()
-        )
+        print(f"🔢 Creating embeddings and building FAISS index ({INDEX_TYPE})...")
+        print("   (Only new or changed chunks call the OpenAI API...)")
+        embeddings = get_embeddings()
+        if isinstance(embeddings, CachedEmbeddings):
+            embeddings.reset_stats()
+        vectorstore = build_vectorstore(doc_splits, ids, embeddings)
         print(f"✓ Created vectorstore with {vectorstore.index.ntotal} vectors")
+        _print_embedding_cache_stats(embeddings)
 
         # Save for future use
-        print(f"💾 Saving vectorstore to {VECTORSTORE_PATH}...")
-        VECTORSTORE_PATH.mkdir(parents=True, exist_ok=True)
-        vectorstore.save_local(str(VECTORSTORE_PATH))
-        print("✓ Saved successfully")
+        _save_vectorstore(vectorstore, manifest)
 
         return vectorstore
 
@@ -127,8 +211,169 @@ def _create_vectorstore() -> FAISS:
         raise
 
 
-# Lazy-loaded retriever (only created when accessed)
-retriever = get_retriever()
+def _update_vectorstore() -> FAISS:
+    """
+    Apply source changes to the existing vectorstore.
+
+    Each source is re-fetched with a conditional request against its manifest
+    fingerprint. Only changed sources are re-split; their old chunk IDs are
+    deleted from the index and the new chunks added. Sources no longer in URLS
+    are removed. Falls back to a full rebuild if there is no manifest yet.
+
+    Returns:
+        Updated FAISS vectorstore instance
+    """
+    manifest = load_manifest(VECTORSTORE_PATH)
+    if manifest is None:
+        print("⚠️  No manifest found next to the index, falling back to a full rebuild")
+        return _create_vectorstore()
+
+    vectorstore = _load_vectorstore(mmap=False)
+    sources = manifest["sources"]
+
+    print("📥 Checking sources for changes...")
+    text_splitter = _get_text_splitter()
+    stale_ids: List[str] = []
+    new_splits: List[Document] = []
+    new_ids: List[str] = []
+
+    for result in fetch_sources(URLS, previous=sources):
+        url = result.url
+        previous = sources.get(url)
+
+        if result.status == FAILED:
+            # Keep whatever was indexed last time
+            print(f"  ✗ Failed to load {url}: {result.error}")
+        elif result.status == UNCHANGED:
+            sources[url] = {**previous, **result.fingerprint}
+            print(f"  = Unchanged {url}")
+        else:
+            splits, split_ids = _split_source(text_splitter, result.document)
+            if previous:
+                stale_ids.extend(previous.get("chunk_ids", []))
+            new_splits.extend(splits)
+            new_ids.extend(split_ids)
+            sources[url] = {**result.fingerprint, "chunk_ids": split_ids}
+            print(f"  ✓ {'Updated' if previous else 'Added'} {url} ({len(split_ids)} chunks)")
+
+    for url in [url for url in sources if url not in URLS]:
+        stale_ids.extend(sources.pop(url).get("chunk_ids", []))
+        print(f"  - Removed {url}")
+
+    if not stale_ids and not new_splits:
+        print("✓ Vectorstore is up to date")
+        return vectorstore
+
+    indexed_ids = set(vectorstore.index_to_docstore_id.values())
+    stale_ids = [doc_id for doc_id in stale_ids if doc_id in indexed_ids]
+    if stale_ids and not supports_remove(vectorstore.index):
+        print("⚠️  This index type cannot delete vectors, falling back to a full rebuild")
+        return _create_vectorstore()
+    if stale_ids:
+        vectorstore.delete(stale_ids)
+    if new_splits:
+        embeddings = get_embeddings()
+        if isinstance(embeddings, CachedEmbeddings):
+            embeddings.reset_stats()
+        vectorstore.add_documents(new_splits, ids=new_ids)
+        _print_embedding_cache_stats(embeddings)
+    print(f"✓ Removed {len(stale_ids)} chunks, added {len(new_splits)} chunks")
+
+    _save_vectorstore(vectorstore, manifest)
+    return vectorstore
+
+
+def _vectorstore_exists() -> bool:
+    return (VECTORSTORE_PATH / MANIFEST_FILENAME).exists() or _legacy_vectorstore_exists()
+
+
+def _legacy_vectorstore_exists() -> bool:
+    return (VECTORSTORE_PATH / "index.pkl").exists()
+
+
+def _load_vectorstore(mmap: bool = True) -> FAISS:
+    """
+    Load the persisted vectorstore, converting the legacy pickle format once.
+
+    Args:
+        mmap: Memory-map the index read-only (False loads a writable copy)
+
+    Returns:
+        FAISS vectorstore instance
+
+    Raises:
+        CorruptVectorstoreError: If the store does not match its manifest
+    """
+    if not has_store(VECTORSTORE_PATH) and _legacy_vectorstore_exists():
+        _migrate_legacy_vectorstore()
+    return load_vectorstore(
+        VECTORSTORE_PATH, get_embeddings(), mmap=mmap, verify_checksums=VECTORSTORE_VERIFY
+    )
+
+
+def _migrate_legacy_vectorstore() -> None:
+    """Rewrite a save_local (pickle) vectorstore in the memory-mapped format."""
+    print("📦 Converting pickled vectorstore to the memory-mapped format...")
+    vectorstore = FAISS.load_local(
+        str(VECTORSTORE_PATH),
+        get_embeddings(),
+        allow_dangerous_deserialization=True,
+    )
+
+    # Record which chunks came from which source so incremental refresh can replace them
+    manifest = load_manifest(VECTORSTORE_PATH) or empty_manifest()
+    if not manifest["sources"]:
+        for doc_id in vectorstore.index_to_docstore_id.values():
+            source = vectorstore.docstore.search(doc_id).metadata.get("source")
+            if source:
+                entry = manifest["sources"].setdefault(source, {"chunk_ids": []})
+                entry["chunk_ids"].append(doc_id)
+
+    _save_vectorstore(vectorstore, manifest)
+
+
+def _save_vectorstore(vectorstore: FAISS, manifest: dict) -> None:
+    print(f"💾 Saving vectorstore to {VECTORSTORE_PATH}...")
+    save_vectorstore(vectorstore, VECTORSTORE_PATH, manifest)
+    print("✓ Saved successfully")
+
+
+def _get_text_splitter() -> RecursiveCharacterTextSplitter:
+    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+        chunk_size=500,  # Larger chunks for better context (was 250)
+        chunk_overlap=50,  # 10% overlap to preserve context (was 0)
+    )
+
+
+def _split_source(
+    text_splitter: RecursiveCharacterTextSplitter, document: Document
+) -> Tuple[List[Document], List[str]]:
+    splits = text_splitter.split_documents([document])
+    return splits, chunk_ids(document.metadata["source"], [s.page_content for s in splits])
+
+
+def _print_embedding_cache_stats(embeddings) -> None:
+    if isinstance(embeddings, CachedEmbeddings):
+        print(
+            f"✓ Embedding cache: {embeddings.hits}/{embeddings.hits + embeddings.misses} "
+            f"chunks reused ({embeddings.hit_rate:.0%} hit rate)"
+        )
+
+
+def _check_similarity_gate(dense: BaseRetriever) -> None:
+    """Warn once if the similarity gate is configured but the retriever gives it no scores."""
+    global _similarity_gate_warned
+    # Imported here: the gate pulls in the grader chain, which ingestion does not otherwise need
+    from graph import similarity_gate
+
+    if _similarity_gate_warned or not similarity_gate.enabled():
+        return
+    if isinstance(dense, NativeMMRRetriever):  # Scores every result
+        return
+    _similarity_gate_warned = True
+    print("⚠️  GRADE_ACCEPT_SIMILARITY / GRADE_REJECT_SIMILARITY are set, but MMR_IMPL=langchain")
+    print("   returns no similarity scores, so every chunk still goes to the LLM grader.")
+    print("   Set MMR_IMPL=native to use the similarity gate.")
 
 
 # CLI for manual ingestion management
@@ -143,8 +388,14 @@ Examples:
   # Refresh vectorstore from source URLs
   python ingestion.py --refresh
 
+  # Re-ingest only sources that changed since the last ingest
+  python ingestion.py --incremental
+
   # Check current vectorstore status
   python ingestion.py
+
+  # Verify index and chunk checksums against the manifest
+  python ingestion.py --verify
         """,
     )
     parser.add_argument(
@@ -152,13 +403,30 @@ Examples:
         action="store_true",
         help="Force refresh vectorstore from source URLs (re-download and re-embed)",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Refresh only new, changed or removed sources (uses the index manifest)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Verify vectorstore files against the manifest checksums",
+    )
     args = parser.parse_args()
 
     print("\n" + "=" * 60)
     print("📚 Vectorstore Management")
     print("=" * 60 + "\n")
 
-    retriever = get_retriever(force_refresh=args.refresh)
+    if args.verify and has_store(VECTORSTORE_PATH):
+        print("🔍 Verifying vectorstore checksums...")
+        validate_store(VECTORSTORE_PATH, verify_checksums=True)
+        print("✓ Index and chunks match the manifest")
+
+    retriever = get_retriever(
+        force_refresh=args.refresh or args.incremental, incremental=args.incremental
+    )
 
     print(f"\n{'=' * 60}")
     print("✅ Retriever ready!")
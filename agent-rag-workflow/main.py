@@ -1,15 +1,19 @@
 """Main entry point for the Adaptive RAG Workflow."""
 
 import argparse
+import asyncio
+import os
+from functools import lru_cache
+from pathlib import Path
 
 from dotenv import load_dotenv
 from rich.prompt import Prompt
 
-from graph.graph import app
 from utils import (
     print_error,
     print_final_result,
     print_header,
+    print_success,
     print_workflow_start,
     setup_logging,
 )
@@ -17,28 +21,169 @@ from utils import (
 load_dotenv()
 
 
-def run_query(question: str, verbose: bool = False) -> None:
+def run_query(
+    question: str, verbose: bool = False, stream: bool = False, checkpoint_db: str = None
+) -> None:
     """
     Run a single query through the RAG workflow.
 
     Args:
         question: The question to ask
         verbose: If True, show detailed workflow steps
+        stream: If True, print answer tokens as they are generated
+        checkpoint_db: SQLite file to checkpoint the run in, so it can be resumed
     """
+    # Imported here so `--help` does not pay for building the graph
+    from graph.budget import initial_state
+    from graph.doc_refs import with_documents
+    from utils.telemetry import RunTelemetry, export_run
+
+    app = _get_app(checkpoint_db)
+    telemetry = RunTelemetry()
+    config = {"callbacks": [telemetry]}
+    if checkpoint_db:
+        from graph.checkpoint import new_thread_id, thread_config
+
+        thread_id = new_thread_id()
+        config |= thread_config(thread_id)
+
     try:
         print_workflow_start(question)
-        result = app.invoke(input={"question": question})
-        print_final_result(result)
+        if stream:
+            from streaming import stream_query
+
+            result = stream_query(app, initial_state(question), config=config)
+        else:
+            result = app.invoke(input=initial_state(question), config=config)
+        print_final_result(with_documents(result), telemetry.summary())
+        _print_speculation_stats()
+        _print_gate_stats()
+        _print_router_stats()
     except Exception as e:
         print_error(f"Failed to process question: {str(e)}")
+        if checkpoint_db:
+            print(
+                f"Resume from the last completed step with: "
+                f"python main.py --checkpoint-db {checkpoint_db} --resume {thread_id}"
+            )
+    finally:
+        export_run(telemetry)
+
+
+def resume_query(thread_id: str, checkpoint_db: str) -> None:
+    """
+    Continue a checkpointed run from its last completed step.
 
+    The run gets a fresh deadline (RAG_DEADLINE_SECONDS from now); the saved one
+    has usually passed, which would send it straight to finalize. If only the
+    routing step had completed, resetting it routes the question again.
 
-def interactive_mode(verbose: bool = False) -> None:
+    Args:
+        thread_id: Thread ID printed when the run failed
+        checkpoint_db: SQLite file the run was checkpointed in
+    """
+    from graph.budget import DEADLINE_SECONDS, new_deadline
+    from graph.checkpoint import thread_config
+    from graph.doc_refs import with_documents
+    from utils.telemetry import RunTelemetry, export_run
+
+    app = _get_app(checkpoint_db)
+    config = thread_config(thread_id)
+    snapshot = app.get_state(config)
+    if not snapshot.values:
+        print_error(f"No checkpoint for thread {thread_id} in {checkpoint_db}")
+        return
+
+    print_workflow_start(snapshot.values["question"])
+    if not snapshot.next:
+        print_success("Run already completed; showing the saved result")
+        print_final_result(with_documents(snapshot.values))
+        return
+
+    telemetry = RunTelemetry()
+    try:
+        print_success(f"Resuming thread {thread_id} at: {', '.join(snapshot.next)}")
+        if snapshot.values.get("deadline") or DEADLINE_SECONDS:
+            app.update_state(config, {"deadline": new_deadline(DEADLINE_SECONDS)})
+        result = app.invoke(None, config={**config, "callbacks": [telemetry]})
+        print_final_result(with_documents(result), telemetry.summary())
+    except Exception as e:
+        print_error(f"Failed to resume: {str(e)}")
+        print(
+            f"Resume again with: "
+            f"python main.py --checkpoint-db {checkpoint_db} --resume {thread_id}"
+        )
+    finally:
+        export_run(telemetry)
+
+
+@lru_cache(maxsize=2)
+def _get_app(checkpoint_db: str = None):
+    from graph.graph import app, build_app
+
+    if not checkpoint_db:
+        return app
+
+    from graph.checkpoint import open_checkpointer
+
+    return build_app(open_checkpointer(checkpoint_db))
+
+
+def _print_speculation_stats() -> None:
+    from graph import speculation
+
+    if speculation.enabled():
+        stats = speculation.stats.as_dict()
+        print_success(
+            f"Speculative retrieval used {stats['used']}/{stats['started']} times, "
+            f"saved {stats['saved_seconds']:.2f}s"
+        )
+
+
+def _print_gate_stats() -> None:
+    from graph import similarity_gate
+
+    if similarity_gate.enabled():
+        stats = similarity_gate.stats.as_dict()
+        print_success(
+            f"Similarity gate skipped {stats['skipped']}/{stats['skipped'] + stats['graded']} "
+            f"grader calls ({stats['skip_rate']:.0%})"
+        )
+
+
+def _print_router_stats() -> None:
+    from graph import topic_router
+
+    if topic_router.enabled():
+        stats = topic_router.stats.as_dict()
+        print_success(
+            f"Embedding router decided {stats['fast']}/{stats['fast'] + stats['ambiguous']} "
+            f"questions without the router LLM ({stats['fast_rate']:.0%})"
+        )
+
+
+def _configure_events(verbose: bool, events_file: str = None) -> None:
+    from utils.events import ConsoleSink, FanoutSink, JSONLSink, set_sink
+
+    sinks = []
+    if verbose:
+        sinks.append(ConsoleSink())
+    if events_file:
+        sinks.append(JSONLSink(events_file))
+    if sinks:
+        set_sink(sinks[0] if len(sinks) == 1 else FanoutSink(sinks))
+
+
+def interactive_mode(
+    verbose: bool = False, stream: bool = False, checkpoint_db: str = None
+) -> None:
     """
     Run the application in interactive mode.
 
     Args:
         verbose: If True, show detailed workflow steps
+        stream: If True, print answer tokens as they are generated
+        checkpoint_db: SQLite file to checkpoint each run in
     """
     print_header()
     print("[dim]Type 'quit', 'exit', or 'q' to exit interactive mode.[/dim]\n")
@@ -55,7 +200,7 @@ def interactive_mode(verbose: bool = False) -> None:
                 print_error("Question cannot be empty. Please try again.")
                 continue
 
-            run_query(question, verbose)
+            run_query(question, verbose, stream=stream, checkpoint_db=checkpoint_db)
 
         except KeyboardInterrupt:
             print("\n\n[yellow]👋 Goodbye![/yellow]\n")
@@ -64,6 +209,44 @@ def interactive_mode(verbose: bool = False) -> None:
             print_error(f"An error occurred: {str(e)}")
 
 
+def batch_mode(input_path: str, output_path: str = None, concurrency: int = 8) -> None:
+    """
+    Answer every question in a JSONL file concurrently.
+
+    Args:
+        input_path: JSONL file with one ``{"question": ...}`` object per line
+        output_path: Results JSONL (defaults to <input>.results.jsonl)
+        concurrency: Maximum questions in flight
+    """
+    from batch import load_questions, run_batch
+    from graph.graph import app
+
+    questions = load_questions(Path(input_path))
+    output = Path(output_path) if output_path else Path(input_path).with_suffix(".results.jsonl")
+    print(f"Running {len(questions)} questions with concurrency {concurrency} → {output}")
+
+    summary = asyncio.run(run_batch(app, questions, output, concurrency=concurrency))
+    _print_speculation_stats()
+    _print_gate_stats()
+    _print_router_stats()
+
+    latency = summary["latency_s"]
+    print_success(
+        f"{summary['questions']} questions ({summary['errors']} failed) in "
+        f"{summary['wall_time_s']:.1f}s — {summary['questions_per_s']:.2f} questions/sec"
+    )
+    print_success(
+        f"Latency per question: p50 {latency['p50']:.2f}s, p95 {latency['p95']:.2f}s, "
+        f"max {latency['max']:.2f}s"
+    )
+    for node, node_latency in summary["node_latency_s"].items():
+        print(
+            f"  {node:<16} p50 {node_latency['p50']:.2f}s  p95 {node_latency['p95']:.2f}s  "
+            f"p99 {node_latency['p99']:.2f}s"
+        )
+    print_success(f"Estimated LLM cost: ${summary['cost_usd']:.4f}")
+
+
 def main():
     """Main entry point with CLI argument parsing."""
     parser = argparse.ArgumentParser(
@@ -82,6 +265,28 @@ Examples:
 
   # Interactive mode with verbose output
   python main.py -i -v
+
+  # Stream the answer as it is generated
+  python main.py -q "What is agent memory?" --stream
+
+  # Checkpoint the run; if it fails, resume from the last completed step
+  python main.py -q "What is agent memory?" --checkpoint-db .cache/checkpoints.sqlite
+  python main.py --checkpoint-db .cache/checkpoints.sqlite --resume 3f9c2a7b1d4e
+
+  # Record workflow events as JSON lines (quiet console)
+  python main.py --batch questions.jsonl --events-file events.jsonl
+
+  # Answer a JSONL file of questions, 16 at a time
+  python main.py --batch questions.jsonl --output results.jsonl --concurrency 16
+
+  # Serve questions over HTTP (POST /query, GET /health)
+  python main.py --serve --port 8000
+
+  # Render the workflow diagram to graph.png
+  python main.py --draw-graph
+
+  # Write Prometheus metrics and OpenTelemetry JSON spans for every run
+  python main.py --batch questions.jsonl --metrics-file metrics.prom --trace-file spans.jsonl
         """,
     )
 
@@ -106,6 +311,102 @@ Examples:
         help="Enable verbose output (show detailed workflow steps)",
     )
 
+    parser.add_argument(
+        "--events-file",
+        type=str,
+        metavar="PATH",
+        help="Append workflow events (node start/end, decisions, grades) to PATH as JSON lines",
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print the answer token by token as it is generated (single/interactive mode)",
+    )
+
+    parser.add_argument(
+        "--checkpoint-db",
+        type=str,
+        metavar="PATH",
+        default=os.getenv("CHECKPOINT_DB"),
+        help="Checkpoint runs in this SQLite file so failed runs can be resumed "
+        "(env: CHECKPOINT_DB)",
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="THREAD_ID",
+        help="Resume a failed checkpointed run from its last completed step",
+    )
+
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="JSONL",
+        help="Answer every question in a JSONL file (one {\"question\": ...} per line)",
+    )
+
+    parser.add_argument(
+        "--output",
+        type=str,
+        metavar="JSONL",
+        help="Batch results file (default: <batch>.results.jsonl)",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Maximum questions processed at once in batch or server mode (default: 8)",
+    )
+
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run an HTTP server (POST /query, GET /health) with the graph kept warm",
+    )
+
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="Server bind address")
+
+    parser.add_argument("--port", type=int, default=8000, help="Server port (default: 8000)")
+
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=64,
+        help="Server: requests allowed to wait beyond --concurrency before 503 (default: 64)",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=120.0,
+        help="Server: per-request timeout in seconds (default: 120)",
+    )
+
+    parser.add_argument(
+        "--draw-graph",
+        nargs="?",
+        const="graph.png",
+        metavar="PATH",
+        help="Render the workflow diagram to PATH (default: graph.png) and exit",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        metavar="PATH",
+        help="Write Prometheus text metrics to PATH after every run (env: TELEMETRY_METRICS_PATH)",
+    )
+
+    parser.add_argument(
+        "--trace-file",
+        type=str,
+        metavar="PATH",
+        help="Append OpenTelemetry JSON spans for every run to PATH (env: TELEMETRY_TRACE_PATH)",
+    )
+
     parser.add_argument(
         "--log-level",
         type=str,
@@ -118,21 +419,56 @@ Examples:
 
     # Setup logging
     setup_logging(level=args.log_level, suppress_warnings=True)
+    _configure_events(verbose=args.verbose, events_file=args.events_file)
+
+    if args.metrics_file or args.trace_file:
+        from utils.telemetry import configure_exports
+
+        configure_exports(metrics_path=args.metrics_file, trace_path=args.trace_file)
 
     # Determine mode
-    if args.interactive:
+    if args.draw_graph:
+        from graph.graph import draw_graph
+
+        draw_graph(args.draw_graph)
+        print_success(f"Graph written to {args.draw_graph}")
+    elif args.serve:
+        from server import run_server
+
+        run_server(
+            host=args.host,
+            port=args.port,
+            max_in_flight=args.concurrency,
+            max_queue=args.max_queue,
+            request_timeout=args.timeout,
+        )
+    elif args.resume:
+        if not args.checkpoint_db:
+            parser.error("--resume requires --checkpoint-db (or CHECKPOINT_DB)")
+        print_header()
+        resume_query(args.resume, args.checkpoint_db)
+    elif args.batch:
+        batch_mode(args.batch, args.output, concurrency=args.concurrency)
+    elif args.interactive:
         # Interactive mode
-        interactive_mode(verbose=args.verbose)
+        interactive_mode(
+            verbose=args.verbose, stream=args.stream, checkpoint_db=args.checkpoint_db
+        )
     elif args.question:
         # Single question mode
         print_header()
-        run_query(args.question, verbose=args.verbose)
+        run_query(
+            args.question,
+            verbose=args.verbose,
+            stream=args.stream,
+            checkpoint_db=args.checkpoint_db,
+        )
     else:
         # No arguments provided - show help and run default question
         print_header()
         print("[dim]No arguments provided. Running with default question...[/dim]")
         print('[dim]Use --help to see all available options.[/dim]\n')
-        run_query("What is agent memory?", verbose=args.verbose)
+        run_query("What is agent memory?", verbose=args.verbose, stream=args.stream)
 
 
 if __name__ == "__main__":
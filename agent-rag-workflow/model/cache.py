@@ -0,0 +1,114 @@
+"""Persistent response cache for chat model calls."""
+
+import hashlib
+import os
+from functools import lru_cache
+from typing import Any, Optional
+
+from dotenv import load_dotenv
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatGeneration, Generation
+from pydantic import BaseModel
+
+from utils.disk_cache import DiskCache
+
+load_dotenv()
+
+# Opt-in: set LLM_CACHE_PATH (e.g. ".cache/llm_cache.sqlite") to enable caching
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH")
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "0")) or None
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000")) or None
+
+
+class SQLiteLLMCache(BaseCache):
+    """
+    LangChain cache backed by :class:`utils.disk_cache.DiskCache`.
+
+    LangChain calls the cache with the fully rendered prompt and an ``llm_string``
+    that encodes the model name, temperature and any bound kwargs, which for
+    ``with_structured_output`` chains includes the output schema. The key is a
+    hash of both, so a prompt shared by two schemas or models never collides.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Args:
+            path: SQLite database file
+            ttl_seconds: Entry lifetime; None keeps entries until evicted
+            max_entries: LRU size bound; None means unbounded
+        """
+        self.store = DiskCache(
+            path, namespace="llm", ttl_seconds=ttl_seconds, max_entries=max_entries
+        )
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.store.get(_cache_key(prompt, llm_string))
+        if value is None:
+            return None
+        return [_mark_cache_hit(gen) for gen in loads(value.decode("utf-8"))]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        generations = [_serializable_generation(gen) for gen in return_val]
+        self.store.set(_cache_key(prompt, llm_string), dumps(generations).encode("utf-8"))
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the current entry count."""
+        return self.store.stats()
+
+
+def _cache_key(prompt: str, llm_string: str) -> str:
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+def _mark_cache_hit(generation: Generation) -> Generation:
+    # Lets callback handlers (utils.telemetry) tell replayed responses from API calls
+    if isinstance(generation, ChatGeneration):
+        generation.message.response_metadata["cache_hit"] = True
+    return generation
+
+
+def _serializable_generation(generation: Generation) -> Generation:
+    # Structured-output responses carry the parsed pydantic object in
+    # additional_kwargs["parsed"]; store it as a dict so it survives dumps/loads.
+    if not isinstance(generation, ChatGeneration):
+        return generation
+
+    parsed = generation.message.additional_kwargs.get("parsed")
+    if not isinstance(parsed, BaseModel):
+        return generation
+
+    message = generation.message.model_copy(
+        update={
+            "additional_kwargs": {
+                **generation.message.additional_kwargs,
+                "parsed": parsed.model_dump(),
+            }
+        }
+    )
+    return generation.model_copy(update={"message": message})
+
+
+@lru_cache(maxsize=1)
+def get_llm_cache() -> Optional[SQLiteLLMCache]:
+    """
+    Get the shared LLM cache if enabled via ``LLM_CACHE_PATH``.
+
+    Returns:
+        Cache instance, or None when caching is disabled
+    """
+    if not LLM_CACHE_PATH:
+        return None
+    return SQLiteLLMCache(
+        LLM_CACHE_PATH,
+        ttl_seconds=LLM_CACHE_TTL_SECONDS,
+        max_entries=LLM_CACHE_MAX_ENTRIES,
+    )
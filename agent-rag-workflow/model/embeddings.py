@@ -0,0 +1,101 @@
+"""Embedding model configuration with a persistent content-hash cache."""
+
+import hashlib
+import os
+from array import array
+from functools import lru_cache
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from langchain_core.embeddings import Embeddings
+from langchain_openai import OpenAIEmbeddings
+
+from utils.disk_cache import DiskCache
+
+load_dotenv()
+
+# Set EMBEDDING_CACHE_PATH to an empty string to disable the cache
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite")
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only calls the underlying model for unseen chunks.
+
+    Document vectors are stored as float32 under ``sha256(model + text)``, so a
+    rebuild pays only for chunks whose text (or embedding model) changed. Query
+    embeddings are not cached.
+    """
+
+    def __init__(self, underlying: Embeddings, store: DiskCache, model_name: str):
+        """
+        Args:
+            underlying: Embedding model used on cache misses
+            store: Persistent vector store for document embeddings
+            model_name: Embedding model identifier, part of every cache key
+        """
+        self.underlying = underlying
+        self.store = store
+        self.model_name = model_name
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key(text) for text in texts]
+        vectors: List[Optional[List[float]]] = []
+        for key in keys:
+            cached = self.store.get(key)
+            vectors.append(_decode(cached) if cached is not None else None)
+
+        # Embed each distinct missing text once, in a single batched call
+        missing = list(dict.fromkeys(text for text, vec in zip(texts, vectors) if vec is None))
+        self.hits += len(texts) - sum(vec is None for vec in vectors)
+        self.misses += sum(vec is None for vec in vectors)
+
+        if missing:
+            embedded = dict(zip(missing, self.underlying.embed_documents(missing)))
+            for text in missing:
+                self.store.set(self._key(text), _encode(embedded[text]))
+            vectors = [vec if vec is not None else embedded[text] for text, vec in zip(texts, vectors)]
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.underlying.embed_query(text)
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset_stats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+def _encode(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _decode(data: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+@lru_cache(maxsize=1)
+def get_embeddings() -> Embeddings:
+    """
+    Get the embedding model used for ingestion and retrieval.
+
+    Returns:
+        OpenAIEmbeddings, wrapped in CachedEmbeddings unless the cache is disabled
+    """
+    embeddings = OpenAIEmbeddings()
+    if not EMBEDDING_CACHE_PATH:
+        return embeddings
+    store = DiskCache(EMBEDDING_CACHE_PATH, namespace="embeddings")
+    return CachedEmbeddings(embeddings, store, embeddings.model)
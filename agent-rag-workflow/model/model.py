@@ -6,25 +6,35 @@ from functools import lru_cache
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 
+from model.cache import get_llm_cache
+
 load_dotenv()
 
 
-@lru_cache(maxsize=1)
-def get_llm(model: str = None, temperature: float = 0.0) -> ChatOpenAI:
+@lru_cache(maxsize=4)
+def get_llm(model: str = None, temperature: float = 0.0, cache: bool = True) -> ChatOpenAI:
     """
     Get configured LLM instance with caching.
 
+    Responses are cached on disk when ``LLM_CACHE_PATH`` is set (see model.cache).
+
     Args:
         model: Model name (defaults to env var OPENAI_MODEL or "gpt-4o-mini")
         temperature: Temperature setting (default: 0.0)
+        cache: If False, always call the API even when the response cache is enabled
 
     Returns:
         Configured ChatOpenAI instance
     """
     return ChatOpenAI(
-        temperature=temperature, model=model or os.getenv("OPENAI_MODEL", "gpt-5-mini")
+        temperature=temperature,
+        model=model or os.getenv("OPENAI_MODEL", "gpt-5-mini"),
+        cache=get_llm_cache() if cache else False,
     )
 
 
 # Default LLM instance (for backward compatibility)
 llm = get_llm()
+
+# Cache-bypassing instance for retries that must not replay a rejected response
+uncached_llm = get_llm(cache=False)
@@ -0,0 +1 @@
+"""Source fetching, index persistence and retrieval helpers for the vectorstore."""
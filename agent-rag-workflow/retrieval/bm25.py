@@ -0,0 +1,162 @@
+"""
+Local BM25 keyword index over the vectorstore's chunks.
+
+Dense retrieval ranks keyword-heavy questions (names, acronyms, attack names)
+poorly; an inverted index finds them by exact term. The index is rebuilt from
+the chunk table whenever the vectorstore is saved and stored next to it as
+``bm25.sqlite``:
+
+- ``postings``: (term, position, term frequency), clustered by term
+- ``terms``: document frequency per term
+- ``docs``: chunk ID and token count by index position
+- ``meta``: document count and average token count
+
+A query reads only the postings of its own terms, so like ``chunks.sqlite``
+the file is opened read-only and shared by worker processes.
+"""
+
+import heapq
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+BM25_FILENAME = "bm25.sqlite"
+
+# Term-frequency saturation and document-length normalization
+BM25_K1 = float(os.getenv("BM25_K1", "1.2"))
+BM25_B = float(os.getenv("BM25_B", "0.75"))
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric terms; rare terms are weighted up by IDF, so no stopword list."""
+    return _TOKEN.findall(text.lower())
+
+
+def write_bm25(path: Union[str, Path], chunks: Iterable[Tuple[str, str]]) -> int:
+    """
+    Build the inverted index and write it to a new SQLite file.
+
+    Args:
+        path: Output file (replaced if it exists)
+        chunks: ``(chunk ID, text)`` pairs in index position order
+
+    Returns:
+        Number of chunks indexed
+    """
+    path = Path(path)
+    path.unlink(missing_ok=True)
+
+    docs: List[Tuple[int, str, int]] = []
+    postings: List[Tuple[str, int, int]] = []
+    document_frequency: Counter = Counter()
+    for position, (doc_id, text) in enumerate(chunks):
+        counts = Counter(tokenize(text))
+        docs.append((position, doc_id, sum(counts.values())))
+        postings.extend((term, position, tf) for term, tf in counts.items())
+        document_frequency.update(counts.keys())
+
+    total_length = sum(length for _, _, length in docs)
+    conn = sqlite3.connect(str(path))
+    conn.executescript(
+        """
+        CREATE TABLE docs (
+            position INTEGER PRIMARY KEY, id TEXT NOT NULL, length INTEGER NOT NULL
+        );
+        CREATE TABLE terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+        CREATE TABLE postings (
+            term TEXT NOT NULL, position INTEGER NOT NULL, tf INTEGER NOT NULL,
+            PRIMARY KEY (term, position)
+        ) WITHOUT ROWID;
+        CREATE TABLE meta (key TEXT PRIMARY KEY, value REAL NOT NULL);
+        """
+    )
+    conn.executemany("INSERT INTO docs VALUES (?, ?, ?)", docs)
+    conn.executemany("INSERT INTO terms VALUES (?, ?)", document_frequency.items())
+    conn.executemany("INSERT INTO postings VALUES (?, ?, ?)", postings)
+    conn.executemany(
+        "INSERT INTO meta VALUES (?, ?)",
+        [("count", len(docs)), ("avg_length", total_length / len(docs) if docs else 0.0)],
+    )
+    conn.commit()
+    conn.close()
+    return len(docs)
+
+
+class BM25Index:
+    """Read-only BM25 search over a file written by :func:`write_bm25`."""
+
+    def __init__(self, path: Union[str, Path], k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Args:
+            path: Index file
+            k1: Term-frequency saturation
+            b: Document-length normalization (0 = none, 1 = full)
+        """
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        meta = dict(self._conn.execute("SELECT key, value FROM meta"))
+        self.count = int(meta["count"])
+        self.avg_length = meta["avg_length"] or 1.0
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """
+        Score every chunk containing a query term and return the best.
+
+        Args:
+            query: Query text
+            k: Results to return
+
+        Returns:
+            Up to ``k`` ``(chunk ID, score)`` pairs, best first
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        with self._lock:
+            for term in set(tokenize(query)):
+                row = self._conn.execute("SELECT df FROM terms WHERE term = ?", (term,)).fetchone()
+                if row is None:
+                    continue
+                idf = math.log(1 + (self.count - row[0] + 0.5) / (row[0] + 0.5))
+                for position, tf, length in self._conn.execute(
+                    "SELECT p.position, p.tf, d.length FROM postings p "
+                    "JOIN docs d ON d.position = p.position WHERE p.term = ?",
+                    (term,),
+                ):
+                    norm = self.k1 * (1 - self.b + self.b * length / self.avg_length)
+                    scores[position] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            results = []
+            for position, score in heapq.nlargest(k, scores.items(), key=lambda item: item[1]):
+                (doc_id,) = self._conn.execute(
+                    "SELECT id FROM docs WHERE position = ?", (position,)
+                ).fetchone()
+                results.append((doc_id, score))
+            return results
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def open_bm25(directory: Union[str, Path]) -> Optional[BM25Index]:
+    """
+    Open the BM25 index stored with a vectorstore.
+
+    Args:
+        directory: Vectorstore directory
+
+    Returns:
+        The index, or None for stores saved before BM25 indexes were written
+    """
+    path = Path(directory) / BM25_FILENAME
+    return BM25Index(path) if path.exists() else None
@@ -0,0 +1,114 @@
+"""
+Topic centroids of the indexed chunk embeddings, for routing without an LLM.
+
+Each source is a topic. Its chunks' normalized embeddings are clustered with
+spherical k-means into up to ``CENTROIDS_PER_TOPIC`` centroids, so a long post
+covering several subjects is not reduced to one blurred average. They are
+recomputed whenever the vectorstore is saved and stored next to it as
+``centroids.json``, so they always describe the current corpus.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+import faiss
+import numpy as np
+
+from retrieval.mmr import normalize_rows
+
+CENTROIDS_FILENAME = "centroids.json"
+CENTROIDS_PER_TOPIC = int(os.getenv("CENTROIDS_PER_TOPIC", "4"))
+
+KMEANS_ITERATIONS = 20
+KMEANS_SEED = 1234
+
+
+class TopicCentroids(NamedTuple):
+    topics: List[str]  # topic of each centroid row
+    matrix: np.ndarray  # normalized centroids, shape (n, d)
+
+    def best_match(self, query_vector: np.ndarray) -> Tuple[str, float]:
+        """
+        Closest topic to a query.
+
+        Args:
+            query_vector: Query embedding, shape (d,)
+
+        Returns:
+            Topic and its highest cosine similarity to the query
+        """
+        similarities = self.matrix @ normalize_rows(query_vector[None, :])[0]
+        best = int(np.argmax(similarities))
+        return self.topics[best], float(similarities[best])
+
+
+def compute_centroids(
+    vectors: np.ndarray, labels: List[str], per_topic: int = CENTROIDS_PER_TOPIC
+) -> TopicCentroids:
+    """
+    Cluster each topic's embeddings into centroids.
+
+    Args:
+        vectors: Chunk embeddings, shape (n, d)
+        labels: Topic (source) of each chunk
+        per_topic: Most centroids per topic
+
+    Returns:
+        Normalized centroids and the topic each belongs to
+    """
+    vectors = normalize_rows(vectors)
+    by_topic: Dict[str, List[int]] = {}
+    for position, label in enumerate(labels):
+        by_topic.setdefault(label, []).append(position)
+
+    topics: List[str] = []
+    rows: List[np.ndarray] = []
+    for topic, positions in sorted(by_topic.items()):
+        members = vectors[positions]
+        k = max(1, min(per_topic, len(positions)))
+        if k == 1:
+            centroids = members.mean(axis=0, keepdims=True)
+        else:
+            # A source has far fewer chunks than FAISS's 39 training points per
+            # centroid; that is expected here, so do not warn about it on every save
+            kmeans = faiss.Kmeans(
+                members.shape[1],
+                k,
+                niter=KMEANS_ITERATIONS,
+                seed=KMEANS_SEED,
+                spherical=True,
+                min_points_per_centroid=1,
+            )
+            kmeans.train(members)
+            centroids = kmeans.centroids
+        topics.extend([topic] * len(centroids))
+        rows.append(centroids)
+
+    dimension = vectors.shape[1] if vectors.ndim == 2 else 0
+    matrix = np.vstack(rows) if rows else np.zeros((0, dimension), dtype=np.float32)
+    return TopicCentroids(topics, normalize_rows(matrix))
+
+
+def write_centroids(path: Union[str, Path], centroids: TopicCentroids) -> None:
+    """Write centroids as JSON (topics plus one vector per centroid)."""
+    payload = {"topics": centroids.topics, "vectors": centroids.matrix.tolist()}
+    Path(path).write_text(json.dumps(payload), encoding="utf-8")
+
+
+def load_centroids(directory: Union[str, Path]) -> Optional[TopicCentroids]:
+    """
+    Load the centroids stored with a vectorstore.
+
+    Args:
+        directory: Vectorstore directory
+
+    Returns:
+        The centroids, or None for stores saved before centroids were written
+    """
+    path = Path(directory) / CENTROIDS_FILENAME
+    if not path.exists():
+        return None
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    return TopicCentroids(payload["topics"], np.asarray(payload["vectors"], dtype=np.float32))
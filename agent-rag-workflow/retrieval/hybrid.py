@@ -0,0 +1,81 @@
+"""Hybrid retrieval: dense MMR results fused with BM25 keyword hits by reciprocal rank fusion."""
+
+import os
+from typing import Dict, List, Tuple
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from retrieval.bm25 import BM25Index
+
+# Damping constant from the original RRF paper; larger values flatten rank differences
+RRF_K = int(os.getenv("RRF_K", "60"))
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = RRF_K) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked ID lists by summing ``1 / (k + rank)`` over the lists an ID appears in.
+
+    Args:
+        rankings: Ranked chunk IDs, best first, one list per retriever
+        k: Damping constant
+
+    Returns:
+        ``(chunk ID, fused score)`` pairs, best first; ties keep first-seen order
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Fuses a dense retriever with a BM25 index.
+
+    Both retrievers return ``candidates`` results; the top ``k`` after
+    :func:`reciprocal_rank_fusion` are returned, with the fused score in
+    ``metadata["score"]``. Keyword-only hits are read from the vectorstore's
+    docstore.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: FAISS
+    dense: BaseRetriever
+    keyword: BM25Index
+    k: int = 4
+    candidates: int = 10
+    rrf_k: int = RRF_K
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        dense = self.dense.invoke(query, config={"callbacks": run_manager.get_child()})
+        keyword = self.keyword.search(query, self.candidates)
+
+        by_id = {doc.id: doc for doc in dense if doc.id}
+        fused = reciprocal_rank_fusion(
+            [[doc.id for doc in dense if doc.id], [doc_id for doc_id, _ in keyword]], self.rrf_k
+        )
+
+        documents = []
+        for doc_id, score in fused:
+            document = by_id.get(doc_id) or self.vectorstore.docstore.search(doc_id)
+            if not isinstance(document, Document):
+                continue
+            # Copy: the in-memory docstore hands out its own objects
+            documents.append(
+                Document(
+                    id=doc_id,
+                    page_content=document.page_content,
+                    metadata={**document.metadata, "score": score},
+                )
+            )
+            if len(documents) == self.k:
+                break
+        return documents
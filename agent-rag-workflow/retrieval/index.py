@@ -0,0 +1,160 @@
+"""FAISS index construction for exact and approximate nearest-neighbour search."""
+
+import math
+import os
+from typing import List, Optional
+
+import faiss
+import numpy as np
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+FLAT = "flat"
+IVF_FLAT = "ivf_flat"
+HNSW = "hnsw"
+IVF_PQ = "ivf_pq"
+INDEX_TYPES = (FLAT, IVF_FLAT, HNSW, IVF_PQ)
+
+# Build-time settings (used during ingestion)
+INDEX_TYPE = os.getenv("VECTORSTORE_INDEX_TYPE", FLAT)
+IVF_NLIST = int(os.getenv("VECTORSTORE_IVF_NLIST", "0"))  # 0 = about 4 * sqrt(n)
+HNSW_M = int(os.getenv("VECTORSTORE_HNSW_M", "32"))
+HNSW_EF_CONSTRUCTION = int(os.getenv("VECTORSTORE_HNSW_EF_CONSTRUCTION", "80"))
+PQ_M = int(os.getenv("VECTORSTORE_PQ_M", "16"))  # sub-quantizers; must divide the dimension
+PQ_NBITS = int(os.getenv("VECTORSTORE_PQ_NBITS", "8"))
+
+# Query-time settings
+NPROBE = int(os.getenv("VECTORSTORE_NPROBE", "16"))
+EF_SEARCH = int(os.getenv("VECTORSTORE_EF_SEARCH", "64"))
+
+# FAISS k-means wants ~39 training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+def create_index(
+    vectors: np.ndarray,
+    index_type: str = INDEX_TYPE,
+    nlist: int = IVF_NLIST,
+    hnsw_m: int = HNSW_M,
+    pq_m: int = PQ_M,
+    pq_nbits: int = PQ_NBITS,
+) -> faiss.Index:
+    """
+    Create an empty L2 index of the requested type, trained on ``vectors``.
+
+    IVF and PQ indexes need enough training points; for small corpora the
+    number of lists is reduced, and below that an exact flat index is used.
+
+    Args:
+        vectors: Training vectors, shape (n, d)
+        index_type: One of flat, ivf_flat, hnsw, ivf_pq
+        nlist: IVF lists (0 picks about 4 * sqrt(n))
+        hnsw_m: HNSW graph degree
+        pq_m: PQ sub-quantizers
+        pq_nbits: Bits per PQ code
+
+    Returns:
+        Trained, empty FAISS index
+
+    Raises:
+        ValueError: If index_type is unknown
+    """
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type {index_type!r}, expected one of {INDEX_TYPES}")
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n, d = vectors.shape
+
+    if index_type == FLAT:
+        return faiss.IndexFlatL2(d)
+
+    if index_type == HNSW:
+        index = faiss.IndexHNSWFlat(d, hnsw_m)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        return index
+
+    nlist = min(nlist or int(4 * math.sqrt(n)), n // MIN_POINTS_PER_CENTROID)
+    if nlist < 1 or (index_type == IVF_PQ and n < MIN_POINTS_PER_CENTROID * 2**pq_nbits):
+        print(f"   ({n} vectors is too few to train {index_type}, using an exact flat index)")
+        return faiss.IndexFlatL2(d)
+
+    if index_type == IVF_FLAT:
+        index = faiss.index_factory(d, f"IVF{nlist},Flat")
+    else:
+        if d % pq_m:
+            raise ValueError(f"PQ sub-quantizers ({pq_m}) must divide the dimension ({d})")
+        index = faiss.index_factory(d, f"IVF{nlist},PQ{pq_m}x{pq_nbits}")
+    index.train(vectors)
+    # MMR reconstructs candidate vectors by ID
+    index.set_direct_map_type(faiss.DirectMap.Hashtable)
+    return index
+
+
+def build_vectorstore(
+    documents: List[Document],
+    ids: List[str],
+    embeddings: Embeddings,
+    index_type: str = INDEX_TYPE,
+) -> FAISS:
+    """
+    Embed documents and build a FAISS vectorstore with the configured index type.
+
+    Args:
+        documents: Chunks to index
+        ids: Chunk IDs, one per document
+        embeddings: Embedding model
+        index_type: One of flat, ivf_flat, hnsw, ivf_pq
+
+    Returns:
+        FAISS vectorstore instance
+    """
+    texts = [doc.page_content for doc in documents]
+    vectors = np.asarray(embeddings.embed_documents(texts), dtype=np.float32)
+
+    vectorstore = FAISS(
+        embedding_function=embeddings,
+        index=create_index(vectors, index_type),
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+    )
+    vectorstore.add_embeddings(
+        zip(texts, vectors.tolist()), metadatas=[doc.metadata for doc in documents], ids=ids
+    )
+    return vectorstore
+
+
+def configure_search(
+    index: faiss.Index, nprobe: Optional[int] = NPROBE, ef_search: Optional[int] = EF_SEARCH
+) -> None:
+    """
+    Apply query-time accuracy/speed settings to an index (no-op for flat indexes).
+
+    Args:
+        index: FAISS index
+        nprobe: IVF lists scanned per query
+        ef_search: HNSW candidate list size per query
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and nprobe:
+        ivf.nprobe = nprobe
+    if isinstance(index, faiss.IndexHNSW) and ef_search:
+        index.hnsw.efSearch = ef_search
+
+
+def supports_remove(index: faiss.Index) -> bool:
+    """
+    Whether vectors can be deleted in place.
+
+    Only flat indexes qualify. HNSW graphs cannot remove vectors, and IVF
+    ``remove_ids`` leaves gaps in the ID range while the FAISS vectorstore
+    renumbers ``index_to_docstore_id`` as if they closed, so IDs would stop
+    matching positions (and later adds would reuse live IDs).
+    """
+    return isinstance(index, faiss.IndexFlat)
+
+
+def index_size_bytes(index: faiss.Index) -> int:
+    """Serialized size of an index."""
+    return int(faiss.serialize_index(index).size)
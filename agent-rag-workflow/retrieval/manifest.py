@@ -0,0 +1,66 @@
+"""Vectorstore manifest: per-source fingerprints and chunk IDs stored next to the index."""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def empty_manifest() -> Dict[str, Any]:
+    """Return a manifest with no sources."""
+    return {"version": MANIFEST_VERSION, "sources": {}}
+
+
+def load_manifest(directory: Path) -> Dict[str, Any] | None:
+    """
+    Load the manifest stored alongside a vectorstore.
+
+    Args:
+        directory: Vectorstore directory
+
+    Returns:
+        Manifest dictionary, or None if the directory has no manifest
+    """
+    path = Path(directory) / MANIFEST_FILENAME
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(directory: Path, manifest: Dict[str, Any]) -> None:
+    """
+    Atomically write the manifest next to the vectorstore.
+
+    Args:
+        directory: Vectorstore directory
+        manifest: Manifest dictionary to persist
+    """
+    path = Path(directory) / MANIFEST_FILENAME
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 of a source's extracted text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def chunk_ids(url: str, chunks: List[str]) -> List[str]:
+    """
+    Deterministic IDs for a source's chunks.
+
+    Args:
+        url: Source URL the chunks were split from
+        chunks: Chunk texts, in split order
+
+    Returns:
+        One ID per chunk, stable across rebuilds of unchanged content
+    """
+    return [
+        hashlib.sha256(f"{url}\x00{position}\x00{text}".encode("utf-8")).hexdigest()[:32]
+        for position, text in enumerate(chunks)
+    ]
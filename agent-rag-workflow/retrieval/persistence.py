@@ -0,0 +1,326 @@
+"""
+Pickle-free vectorstore persistence.
+
+Layout of a vectorstore directory:
+- ``index.bin``: raw FAISS index written with ``faiss.write_index``; opened
+  memory-mapped and read-only so worker processes share its pages
+- ``chunks.sqlite``: chunk IDs, text and JSON metadata keyed by index position
+- ``bm25.sqlite``: keyword index over the chunk text (see retrieval.bm25)
+- ``centroids.json``: per-source embedding centroids (see retrieval.centroids)
+- ``manifest.json``: format version, vector count, dimension and the size and
+  SHA-256 of each file (plus the source fingerprints, see retrieval.manifest)
+
+Loading validates the manifest and file sizes up front and raises
+CorruptVectorstoreError on any mismatch instead of returning a broken store.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import faiss
+import numpy as np
+from langchain_community.docstore.base import Docstore
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from retrieval.bm25 import BM25_FILENAME, write_bm25
+from retrieval.centroids import CENTROIDS_FILENAME, compute_centroids, write_centroids
+from retrieval.manifest import empty_manifest, load_manifest, save_manifest
+
+INDEX_FILENAME = "index.bin"
+CHUNKS_FILENAME = "chunks.sqlite"
+STORE_FORMAT = "faiss-raw+sqlite"
+STORE_FORMAT_VERSION = 1
+
+
+class CorruptVectorstoreError(RuntimeError):
+    """The persisted vectorstore is missing files or does not match its manifest."""
+
+
+class ChunkStore:
+    """Read-only access to ``chunks.sqlite``, shared by the docstore and ID map."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+
+    def id_at(self, position: int) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id FROM chunks WHERE position = ?", (position,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, doc_id: str) -> Optional[Document]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT page_content, metadata FROM chunks WHERE id = ?", (doc_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return Document(id=doc_id, page_content=row[0], metadata=json.loads(row[1]))
+
+    def get_many(self, doc_ids: List[str]) -> List[Optional[Document]]:
+        return [self.get(doc_id) for doc_id in doc_ids]
+
+    def ids(self) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM chunks ORDER BY position")]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+
+class SQLiteDocstore(Docstore):
+    """Read-only docstore that fetches chunks from a ChunkStore on demand."""
+
+    def __init__(self, chunks: ChunkStore):
+        self.chunks = chunks
+
+    def search(self, search: str) -> Union[str, Document]:
+        document = self.chunks.get(search)
+        return document if document is not None else f"ID {search} not found."
+
+
+class PositionToIdMap(Mapping):
+    """Lazy ``index position -> chunk ID`` mapping backed by a ChunkStore."""
+
+    def __init__(self, chunks: ChunkStore, size: int):
+        self.chunks = chunks
+        self.size = size
+
+    def __getitem__(self, position: int) -> str:
+        doc_id = self.chunks.id_at(int(position))
+        if doc_id is None:
+            raise KeyError(position)
+        return doc_id
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.size))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def values(self):
+        return self.chunks.ids()
+
+
+def has_store(directory: Path) -> bool:
+    """Whether ``directory`` holds a vectorstore in this format."""
+    manifest = load_manifest(directory)
+    return bool(manifest and manifest.get("store"))
+
+
+def save_vectorstore(
+    vectorstore: FAISS, directory: Path, manifest: Optional[Dict[str, Any]] = None
+) -> None:
+    """
+    Write the index, chunk table and manifest.
+
+    Files are written under temporary names and renamed into place, and the
+    manifest is written last, so a crash mid-save never leaves a store that
+    validates against the wrong files.
+
+    Args:
+        vectorstore: FAISS vectorstore to persist
+        directory: Target directory
+        manifest: Manifest to extend with the store section (sources are kept)
+
+    Raises:
+        ValueError: If the index IDs are not 0..ntotal-1 or a chunk is missing
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = manifest or load_manifest(directory) or empty_manifest()
+
+    index_tmp = directory / f"{INDEX_FILENAME}.tmp"
+    faiss.write_index(vectorstore.index, str(index_tmp))
+
+    chunks_tmp = directory / f"{CHUNKS_FILENAME}.tmp"
+    chunks_tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(chunks_tmp))
+    conn.execute(
+        "CREATE TABLE chunks (position INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, "
+        "page_content TEXT NOT NULL, metadata TEXT NOT NULL)"
+    )
+    # Positions double as FAISS IDs: search labels index ``index_to_docstore_id``
+    positions = range(vectorstore.index.ntotal)
+    if set(vectorstore.index_to_docstore_id) != set(positions):
+        raise ValueError("Index IDs are not contiguous from 0; rebuild the index before saving")
+    rows = []
+    sources = []
+    for position in positions:
+        doc_id = vectorstore.index_to_docstore_id[position]
+        document = vectorstore.docstore.search(doc_id)
+        if not isinstance(document, Document):
+            raise ValueError(f"Chunk {doc_id} at position {position} missing from docstore")
+        rows.append((position, doc_id, document.page_content, json.dumps(document.metadata)))
+        sources.append(document.metadata.get("source", ""))
+    conn.executemany("INSERT INTO chunks VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+    # Derived indexes are rebuilt on every save so they always match the chunk table
+    bm25_tmp = directory / f"{BM25_FILENAME}.tmp"
+    write_bm25(bm25_tmp, ((doc_id, text) for _, doc_id, text, _ in rows))
+    centroids_tmp = directory / f"{CENTROIDS_FILENAME}.tmp"
+    # Vectors by the same IDs as the rows, so each lines up with its source
+    vectors = vectorstore.index.reconstruct_batch(np.asarray(positions, dtype=np.int64))
+    write_centroids(centroids_tmp, compute_centroids(vectors, sources))
+
+    index_tmp.replace(directory / INDEX_FILENAME)
+    chunks_tmp.replace(directory / CHUNKS_FILENAME)
+    bm25_tmp.replace(directory / BM25_FILENAME)
+    centroids_tmp.replace(directory / CENTROIDS_FILENAME)
+
+    manifest["store"] = {
+        "format": STORE_FORMAT,
+        "format_version": STORE_FORMAT_VERSION,
+        "ntotal": vectorstore.index.ntotal,
+        "dimension": vectorstore.index.d,
+        "index_class": type(vectorstore.index).__name__,
+        "files": {
+            name: {"size": (directory / name).stat().st_size, "sha256": _sha256(directory / name)}
+            for name in (INDEX_FILENAME, CHUNKS_FILENAME, BM25_FILENAME, CENTROIDS_FILENAME)
+        },
+    }
+    save_manifest(directory, manifest)
+
+
+def load_vectorstore(
+    directory: Path,
+    embeddings: Embeddings,
+    mmap: bool = True,
+    verify_checksums: bool = False,
+) -> FAISS:
+    """
+    Open a persisted vectorstore.
+
+    With ``mmap=True`` the index is memory-mapped read-only and chunks are read
+    from SQLite on demand, so load time does not grow with corpus size. With
+    ``mmap=False`` everything is read into memory and the store can be modified
+    (used for incremental updates).
+
+    Args:
+        directory: Vectorstore directory
+        embeddings: Embedding model for queries
+        mmap: Memory-map the index and read chunks lazily
+        verify_checksums: Also hash every file and compare with the manifest
+
+    Returns:
+        FAISS vectorstore instance
+
+    Raises:
+        CorruptVectorstoreError: If the manifest, files or index do not agree
+    """
+    directory = Path(directory)
+    store = validate_store(directory, verify_checksums=verify_checksums)
+
+    try:
+        index = _read_index(directory / INDEX_FILENAME, mmap=mmap)
+    except Exception as e:
+        raise CorruptVectorstoreError(f"Cannot read {INDEX_FILENAME}: {e}") from e
+    if index.ntotal != store["ntotal"] or index.d != store["dimension"]:
+        raise CorruptVectorstoreError(
+            f"Index has {index.ntotal} vectors of dimension {index.d}, manifest expects "
+            f"{store['ntotal']} of dimension {store['dimension']}"
+        )
+
+    chunks = ChunkStore(directory / CHUNKS_FILENAME)
+    try:
+        chunk_count = len(chunks)
+    except sqlite3.DatabaseError as e:
+        raise CorruptVectorstoreError(f"Cannot read {CHUNKS_FILENAME}: {e}") from e
+    if chunk_count != index.ntotal:
+        raise CorruptVectorstoreError(
+            f"{CHUNKS_FILENAME} has {chunk_count} chunks, index has {index.ntotal} vectors"
+        )
+
+    if mmap:
+        return FAISS(
+            embedding_function=embeddings,
+            index=index,
+            docstore=SQLiteDocstore(chunks),
+            index_to_docstore_id=PositionToIdMap(chunks, index.ntotal),
+        )
+
+    ids = chunks.ids()
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore({doc_id: chunks.get(doc_id) for doc_id in ids}),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+
+
+def validate_store(directory: Path, verify_checksums: bool = False) -> Dict[str, Any]:
+    """
+    Check the manifest and files without loading the index.
+
+    Args:
+        directory: Vectorstore directory
+        verify_checksums: Also compare SHA-256 of each file (reads the whole file)
+
+    Returns:
+        The manifest's store section
+
+    Raises:
+        CorruptVectorstoreError: On a missing/unknown manifest, missing file,
+            size mismatch or checksum mismatch
+    """
+    try:
+        manifest = load_manifest(directory)
+    except (OSError, ValueError) as e:
+        raise CorruptVectorstoreError(f"Unreadable manifest: {e}") from e
+    store = (manifest or {}).get("store")
+    if not store:
+        raise CorruptVectorstoreError(f"No vectorstore manifest in {directory}")
+    if store.get("format") != STORE_FORMAT or store.get("format_version") != STORE_FORMAT_VERSION:
+        raise CorruptVectorstoreError(
+            f"Unsupported vectorstore format {store.get('format')} v{store.get('format_version')}"
+        )
+
+    for name, expected in store["files"].items():
+        path = directory / name
+        if not path.exists():
+            raise CorruptVectorstoreError(f"Missing {name}")
+        if path.stat().st_size != expected["size"]:
+            raise CorruptVectorstoreError(
+                f"{name} is {path.stat().st_size} bytes, manifest expects {expected['size']}"
+            )
+        if verify_checksums and _sha256(path) != expected["sha256"]:
+            raise CorruptVectorstoreError(f"Checksum mismatch for {name}")
+
+    return store
+
+
+def _read_index(path: Path, mmap: bool) -> faiss.Index:
+    if not mmap:
+        return faiss.read_index(str(path))
+    # IO_FLAG_MMAP_IFC (newer FAISS) also maps flat codes; older builds only support IO_FLAG_MMAP
+    flags = getattr(faiss, "IO_FLAG_MMAP_IFC", faiss.IO_FLAG_MMAP) | faiss.IO_FLAG_READ_ONLY
+    try:
+        return faiss.read_index(str(path), flags)
+    except RuntimeError:
+        # Index type without mmap support: fall back to a regular read
+        return faiss.read_index(str(path))
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
@@ -0,0 +1,219 @@
+"""Fetching source pages concurrently with conditional requests for change detection."""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+from bs4 import BeautifulSoup
+from langchain_core.documents import Document
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from retrieval.manifest import content_hash
+
+REQUEST_TIMEOUT = float(os.getenv("INGEST_REQUEST_TIMEOUT", "30"))
+MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "8"))
+PER_HOST_LIMIT = int(os.getenv("INGEST_PER_HOST_LIMIT", "2"))
+PER_HOST_DELAY = float(os.getenv("INGEST_PER_HOST_DELAY", "0.25"))
+MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES", "3"))
+RETRY_BACKOFF = float(os.getenv("INGEST_RETRY_BACKOFF", "0.5"))
+
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+FAILED = "failed"
+
+
+class FetchResult(NamedTuple):
+    """Outcome of fetching one source URL."""
+
+    url: str
+    status: str  # UNCHANGED, CHANGED or FAILED
+    document: Optional[Document] = None
+    fingerprint: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+class HostThrottle:
+    """
+    Per-host politeness limits shared by all fetch workers.
+
+    Caps concurrent requests to each host and spaces out request starts to the
+    same host by at least ``min_interval`` seconds.
+    """
+
+    def __init__(
+        self, max_concurrent: int = PER_HOST_LIMIT, min_interval: float = PER_HOST_DELAY
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.Semaphore] = defaultdict(
+            lambda: threading.Semaphore(self.max_concurrent)
+        )
+        self._next_start: Dict[str, float] = defaultdict(float)
+
+    def acquire(self, host: str) -> None:
+        with self._lock:
+            semaphore = self._semaphores[host]
+        semaphore.acquire()
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start[host])
+            self._next_start[host] = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, host: str) -> None:
+        with self._lock:
+            semaphore = self._semaphores[host]
+        semaphore.release()
+
+
+def new_session(
+    pool_size: int = MAX_WORKERS,
+    max_retries: int = MAX_RETRIES,
+    backoff: float = RETRY_BACKOFF,
+) -> requests.Session:
+    """
+    Create an HTTP session with a shared connection pool and retry policy.
+
+    Connection errors and 429/5xx responses are retried with exponential
+    backoff (honouring Retry-After).
+
+    Args:
+        pool_size: Connections kept per host; match the worker count
+        max_retries: Retries per request after the first attempt
+        backoff: Backoff factor in seconds (sleeps backoff * 2**n between tries)
+
+    Returns:
+        Configured requests session
+    """
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = os.getenv("USER_AGENT", "AdaptiveRAG/1.0")
+    return session
+
+
+def fetch_sources(
+    urls: List[str],
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+    session: Optional[requests.Session] = None,
+    max_workers: int = MAX_WORKERS,
+    throttle: Optional[HostThrottle] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> List[FetchResult]:
+    """
+    Fetch many sources concurrently over one pooled session.
+
+    Failures are reported as FAILED results rather than raised, so callers can
+    skip them individually.
+
+    Args:
+        urls: Source URLs
+        previous: Manifest fingerprints by URL, for conditional requests
+        session: Shared session (defaults to ``new_session(max_workers)``)
+        max_workers: Number of fetch threads
+        throttle: Per-host politeness limits (defaults to HostThrottle())
+        timeout: Per-request timeout in seconds
+
+    Returns:
+        One FetchResult per URL, in the same order as ``urls``
+    """
+    previous = previous or {}
+    session = session or new_session(pool_size=max_workers)
+    throttle = throttle or HostThrottle()
+
+    def _fetch(url: str) -> FetchResult:
+        host = urlsplit(url).netloc
+        throttle.acquire(host)
+        try:
+            return fetch_source(session, url, previous.get(url), timeout=timeout)
+        finally:
+            throttle.release(host)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        return list(executor.map(_fetch, urls))
+
+
+def fetch_source(
+    session: requests.Session,
+    url: str,
+    previous: Optional[Dict[str, Any]] = None,
+    timeout: float = REQUEST_TIMEOUT,
+) -> FetchResult:
+    """
+    Fetch a source page, skipping it when it has not changed.
+
+    Sends If-None-Match / If-Modified-Since from the previous fingerprint; a 304
+    or an identical content hash means the source is unchanged.
+
+    Args:
+        session: HTTP session to use
+        url: Source URL
+        previous: Fingerprint recorded in the manifest by the last ingest
+        timeout: Request timeout in seconds
+
+    Returns:
+        FetchResult with the parsed Document when the source changed
+    """
+    previous = previous or {}
+    headers = {}
+    if previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+    if previous.get("last_modified"):
+        headers["If-Modified-Since"] = previous["last_modified"]
+
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return FetchResult(url, UNCHANGED, fingerprint=previous)
+        response.raise_for_status()
+        response.encoding = response.apparent_encoding
+        document = html_to_document(url, response.text)
+    except Exception as e:
+        return FetchResult(url, FAILED, error=str(e))
+
+    fingerprint = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "content_hash": content_hash(document.page_content),
+    }
+    if fingerprint["content_hash"] == previous.get("content_hash"):
+        return FetchResult(url, UNCHANGED, fingerprint={**previous, **fingerprint})
+    return FetchResult(url, CHANGED, document=document, fingerprint=fingerprint)
+
+
+def html_to_document(url: str, html: str) -> Document:
+    """
+    Convert an HTML page into a Document the same way WebBaseLoader does.
+
+    Args:
+        url: Page URL, stored as the ``source`` metadata
+        html: Raw HTML
+
+    Returns:
+        Document with the page text and source/title/description/language metadata
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    metadata: Dict[str, Any] = {"source": url}
+    if title := soup.find("title"):
+        metadata["title"] = title.get_text()
+    if description := soup.find("meta", attrs={"name": "description"}):
+        metadata["description"] = description.get("content", "No description found.")
+    if html_tag := soup.find("html"):
+        metadata["language"] = html_tag.get("lang", "No language found.")
+    return Document(page_content=soup.get_text(), metadata=metadata)
@@ -0,0 +1,75 @@
+import math
+
+import pytest
+
+from retrieval.bm25 import BM25Index, open_bm25, tokenize, write_bm25
+
+CHUNKS = [
+    ("c0", "Prompt injection attacks hijack the model."),
+    ("c1", "Jailbreak prompts bypass safety training; a jailbreak is a prompt attack."),
+    ("c2", "Agents plan with memory and tools."),
+    ("c3", "Memory"),
+]
+
+
+@pytest.fixture
+def index(tmp_path) -> BM25Index:
+    path = tmp_path / "bm25.sqlite"
+    assert write_bm25(path, CHUNKS) == len(CHUNKS)
+    return BM25Index(path, k1=1.2, b=0.75)
+
+
+def _bm25(tf: int, df: int, length: int, count: int, avg_length: float) -> float:
+    idf = math.log(1 + (count - df + 0.5) / (df + 0.5))
+    norm = 1.2 * (1 - 0.75 + 0.75 * length / avg_length)
+    return idf * tf * 2.2 / (tf + norm)
+
+
+def test_tokenize_lowercases_and_splits_on_punctuation():
+    assert tokenize("GPT-4's Chain-of-Thought") == ["gpt", "4", "s", "chain", "of", "thought"]
+
+
+def test_score_matches_the_bm25_formula(index):
+    lengths = [len(tokenize(text)) for _, text in CHUNKS]
+    avg_length = sum(lengths) / len(lengths)
+
+    ((doc_id, score),) = index.search("jailbreak", k=5)
+
+    assert doc_id == "c1"
+    assert score == pytest.approx(_bm25(2, 1, lengths[1], len(CHUNKS), avg_length))
+
+
+def test_scores_sum_over_query_terms_and_rank_best_first(index):
+    results = index.search("prompt injection", k=5)
+
+    assert [doc_id for doc_id, _ in results] == ["c0", "c1"]
+    assert results[0][1] > results[1][1]
+
+
+def test_shorter_chunk_wins_at_equal_term_frequency(index):
+    results = index.search("memory", k=5)
+
+    assert [doc_id for doc_id, _ in results] == ["c3", "c2"]
+
+
+def test_missing_terms_are_skipped(index):
+    assert index.search("xylophone", k=5) == []
+    assert index.search("xylophone jailbreak", k=5) == index.search("jailbreak", k=5)
+    assert index.search("", k=5) == []
+
+
+def test_k_limits_results(index):
+    assert len(index.search("prompt memory", k=2)) == 2
+
+
+def test_open_bm25_without_index_returns_none(tmp_path):
+    assert open_bm25(tmp_path) is None
+
+
+def test_empty_corpus(tmp_path):
+    write_bm25(tmp_path / "bm25.sqlite", [])
+
+    index = open_bm25(tmp_path)
+
+    assert len(index) == 0
+    assert index.search("anything", k=3) == []
@@ -0,0 +1,99 @@
+import requests
+
+from retrieval.manifest import content_hash
+from retrieval.sources import CHANGED, FAILED, UNCHANGED, fetch_source, html_to_document
+
+URL = "https://example.com/post"
+HTML = "<html lang='en'><title>Post</title><p>Agents use memory.</p></html>"
+TEXT = html_to_document(URL, HTML).page_content
+
+
+class FakeSession:
+    """Answers every GET with one canned response and records the request headers."""
+
+    def __init__(self, status=200, body=HTML, headers=None, error=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.error = error
+        self.sent = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.sent.append(headers or {})
+        if self.error:
+            raise self.error
+        response = requests.Response()
+        response.status_code = self.status
+        response._content = self.body.encode("utf-8")
+        response.headers.update(self.headers)
+        response.url = url
+        return response
+
+
+def test_first_fetch_is_unconditional_and_changed():
+    session = FakeSession(
+        headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    )
+
+    result = fetch_source(session, URL)
+
+    assert session.sent == [{}]
+    assert result.status == CHANGED
+    assert result.document.page_content == TEXT
+    assert result.document.metadata == {"source": URL, "title": "Post", "language": "en"}
+    assert result.fingerprint == {
+        "etag": '"v1"',
+        "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+        "content_hash": content_hash(TEXT),
+    }
+
+
+def test_not_modified_keeps_the_previous_fingerprint():
+    previous = {
+        "etag": '"v1"',
+        "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT",
+        "content_hash": "abc",
+        "chunk_ids": ["chunk-1"],
+    }
+    session = FakeSession(status=304, body="")
+
+    result = fetch_source(session, URL, previous)
+
+    assert session.sent == [
+        {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    ]
+    assert result.status == UNCHANGED
+    assert result.document is None
+    assert result.fingerprint == previous
+
+
+def test_identical_content_is_unchanged_without_validators():
+    # The server ignores conditional requests, but the text hashes the same
+    previous = {"etag": None, "content_hash": content_hash(TEXT), "chunk_ids": ["chunk-1"]}
+    session = FakeSession(headers={"ETag": '"v2"'})
+
+    result = fetch_source(session, URL, previous)
+
+    assert result.status == UNCHANGED
+    assert result.document is None
+    assert result.fingerprint["etag"] == '"v2"'
+    assert result.fingerprint["chunk_ids"] == ["chunk-1"]
+
+
+def test_changed_content_is_changed():
+    previous = {"etag": '"v1"', "content_hash": content_hash("old text")}
+
+    result = fetch_source(FakeSession(headers={"ETag": '"v2"'}), URL, previous)
+
+    assert result.status == CHANGED
+    assert result.fingerprint["etag"] == '"v2"'
+    assert result.fingerprint["content_hash"] == content_hash(TEXT)
+
+
+def test_http_and_connection_errors_fail():
+    not_found = fetch_source(FakeSession(status=404, body="missing"), URL)
+    unreachable = fetch_source(FakeSession(error=requests.ConnectionError("refused")), URL)
+
+    assert (not_found.status, unreachable.status) == (FAILED, FAILED)
+    assert "404" in not_found.error
+    assert "refused" in unreachable.error
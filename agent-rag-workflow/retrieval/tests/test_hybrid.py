@@ -0,0 +1,46 @@
+import pytest
+from langchain_core.documents import Document
+
+from benchmarks.fakes import build_fake_retriever
+from retrieval.hybrid import HybridRetriever, reciprocal_rank_fusion
+
+
+def test_rrf_sums_reciprocal_ranks():
+    fused = dict(reciprocal_rank_fusion([["a", "b"], ["b", "c"]], k=60))
+
+    assert fused["a"] == pytest.approx(1 / 61)
+    assert fused["b"] == pytest.approx(1 / 62 + 1 / 61)
+    assert fused["c"] == pytest.approx(1 / 62)
+
+
+def test_rrf_ranks_agreement_above_a_single_top_hit():
+    fused = reciprocal_rank_fusion([["a", "b"], ["c", "b"]], k=60)
+
+    # b is second in both lists; a and c tie as one list's top hit each
+    assert [doc_id for doc_id, _ in fused] == ["b", "a", "c"]
+
+
+def test_rrf_ties_keep_first_seen_order():
+    fused = reciprocal_rank_fusion([["a", "b"], ["b", "a"]], k=60)
+
+    assert [doc_id for doc_id, _ in fused] == ["a", "b"]
+    assert fused[0][1] == fused[1][1]
+
+
+def test_rrf_of_nothing_is_empty():
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
+
+
+def test_hybrid_retriever_returns_k_fused_copies():
+    retriever = build_fake_retriever(hybrid=True, candidates=10)
+    assert isinstance(retriever, HybridRetriever)
+
+    documents = retriever.invoke("jailbreak prompt injection")
+
+    assert len(documents) == retriever.k
+    assert all(isinstance(doc, Document) and doc.id for doc in documents)
+    scores = [doc.metadata["score"] for doc in documents]
+    assert scores == sorted(scores, reverse=True)
+    stored = retriever.vectorstore.docstore.search(documents[0].id)
+    assert "score" not in stored.metadata
@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from retrieval.index import FLAT, HNSW, IVF_FLAT, IVF_PQ, create_index, supports_remove
+
+
+@pytest.fixture(scope="module")
+def vectors() -> np.ndarray:
+    return np.random.default_rng(0).random((2_000, 16), dtype=np.float32)
+
+
+def test_only_flat_indexes_support_remove(vectors):
+    assert supports_remove(create_index(vectors, FLAT))
+    assert not supports_remove(create_index(vectors, HNSW))
+    assert not supports_remove(create_index(vectors, IVF_FLAT, nlist=8))
+    assert not supports_remove(create_index(vectors, IVF_PQ, nlist=8, pq_m=4, pq_nbits=4))
+
+
+def test_too_small_corpus_falls_back_to_flat(vectors):
+    index = create_index(vectors[:10], IVF_FLAT)
+    assert index.ntotal == 0
+    assert supports_remove(index)
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+from langchain_community.vectorstores.utils import maximal_marginal_relevance
+
+from benchmarks.fakes import HashEmbeddings, synthetic_corpus
+from retrieval.index import FLAT, build_vectorstore
+from retrieval.mmr import NativeMMRRetriever, mmr_select, normalize_rows
+
+
+def _batch(seed: int, batch: int = 8, fetch_k: int = 20, dim: int = 16):
+    rng = np.random.default_rng(seed)
+    queries = normalize_rows(rng.standard_normal((batch, dim)))
+    candidates = normalize_rows(rng.standard_normal((batch, fetch_k, dim)))
+    return queries, candidates, np.ones((batch, fetch_k), dtype=bool)
+
+
+@pytest.mark.parametrize("lambda_mult", [0.0, 0.5, 0.7, 1.0])
+def test_matches_langchain_mmr(lambda_mult):
+    queries, candidates, valid = _batch(seed=0)
+
+    selected = mmr_select(queries, candidates, valid, k=5, lambda_mult=lambda_mult)
+
+    for query, rows, picks in zip(queries, candidates, selected):
+        expected = maximal_marginal_relevance(query, rows, lambda_mult=lambda_mult, k=5)
+        assert picks.tolist() == expected
+
+
+def test_pure_relevance_is_a_similarity_ranking():
+    queries, candidates, valid = _batch(seed=1)
+
+    selected = mmr_select(queries, candidates, valid, k=4, lambda_mult=1.0)
+
+    similarity = np.einsum("bfd,bd->bf", candidates, queries)
+    assert selected.tolist() == np.argsort(-similarity, axis=1)[:, :4].tolist()
+
+
+def test_invalid_candidates_are_never_picked():
+    queries, candidates, valid = _batch(seed=2, batch=2, fetch_k=6)
+    valid[0, 3:] = False
+
+    selected = mmr_select(queries, candidates, valid, k=5, lambda_mult=0.5)
+
+    assert set(selected[0, :3].tolist()) == {0, 1, 2}
+    assert selected[0, 3:].tolist() == [-1, -1]
+    assert -1 not in selected[1].tolist()
+
+
+def test_k_larger_than_fetch_k_is_capped():
+    queries, candidates, valid = _batch(seed=3, batch=1, fetch_k=3)
+
+    assert mmr_select(queries, candidates, valid, k=10, lambda_mult=0.5).shape == (1, 3)
+
+
+def test_normalize_rows_keeps_zero_rows():
+    rows = normalize_rows(np.array([[3.0, 4.0], [0.0, 0.0]]))
+
+    np.testing.assert_allclose(rows, [[0.6, 0.8], [0.0, 0.0]])
+    assert rows.dtype == np.float32
+
+
+def test_retriever_matches_faiss_mmr_and_reports_similarity():
+    documents = synthetic_corpus()
+    ids = [f"chunk-{i}" for i in range(len(documents))]
+    vectorstore = build_vectorstore(documents, ids, HashEmbeddings(), FLAT)
+    kwargs = {"k": 4, "fetch_k": 20, "lambda_mult": 0.7}
+    native = NativeMMRRetriever(vectorstore=vectorstore, **kwargs)
+    reference = vectorstore.as_retriever(search_type="mmr", search_kwargs=kwargs)
+
+    for query in ["agent memory", "jailbreak attacks", "chain of thought prompting"]:
+        results = native.invoke(query)
+        assert [doc.id for doc in results] == [doc.id for doc in reference.invoke(query)]
+        assert all(-1.0 <= doc.metadata["similarity"] <= 1.0 for doc in results)
+        assert "similarity" not in vectorstore.docstore.search(results[0].id).metadata
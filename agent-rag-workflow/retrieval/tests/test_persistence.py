@@ -0,0 +1,134 @@
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from benchmarks.fakes import HashEmbeddings
+from retrieval.centroids import load_centroids
+from retrieval.index import FLAT, build_vectorstore
+from retrieval.manifest import load_manifest, save_manifest
+from retrieval.mmr import normalize_rows
+from retrieval.persistence import (
+    CHUNKS_FILENAME,
+    INDEX_FILENAME,
+    STORE_FORMAT_VERSION,
+    CorruptVectorstoreError,
+    load_vectorstore,
+    save_vectorstore,
+    validate_store,
+)
+
+TEXTS = {
+    "a": "agents plan with memory and tools",
+    "b": "prompt engineering with few-shot examples",
+    "c": "adversarial attacks and jailbreak prompts",
+}
+
+
+@pytest.fixture
+def vectorstore():
+    documents = [Document(page_content=text, metadata={"source": s}) for s, text in TEXTS.items()]
+    return build_vectorstore(documents, list(TEXTS), HashEmbeddings(), FLAT)
+
+
+def test_centroids_follow_chunks_after_delete(vectorstore, tmp_path):
+    # Flat deletes shift every later vector down one position
+    vectorstore.delete(["a"])
+
+    save_vectorstore(vectorstore, tmp_path)
+    centroids = load_centroids(tmp_path)
+
+    expected = normalize_rows(
+        np.asarray(HashEmbeddings().embed_documents([TEXTS["b"], TEXTS["c"]]))
+    )
+    assert centroids.topics == ["b", "c"]
+    np.testing.assert_allclose(centroids.matrix, expected, atol=1e-6)
+
+
+def test_round_trip_keeps_chunks_by_position(vectorstore, tmp_path):
+    save_vectorstore(vectorstore, tmp_path)
+
+    loaded = load_vectorstore(tmp_path, HashEmbeddings(), mmap=False)
+
+    assert loaded.index_to_docstore_id == {0: "a", 1: "b", 2: "c"}
+    assert loaded.docstore.search("c").page_content == TEXTS["c"]
+
+
+def test_non_contiguous_ids_are_rejected(vectorstore, tmp_path):
+    del vectorstore.index_to_docstore_id[1]
+
+    with pytest.raises(ValueError, match="contiguous"):
+        save_vectorstore(vectorstore, tmp_path)
+
+
+@pytest.fixture
+def store_dir(vectorstore, tmp_path):
+    save_vectorstore(vectorstore, tmp_path)
+    return tmp_path
+
+
+def _rewrite(path, old: bytes, new: bytes) -> None:
+    """Replace bytes in place, keeping the file size."""
+    assert len(old) == len(new)
+    data = path.read_bytes()
+    assert old in data
+    path.write_bytes(data.replace(old, new))
+
+
+def _edit_store_manifest(directory, **changes) -> None:
+    manifest = load_manifest(directory)
+    manifest["store"].update(changes)
+    save_manifest(directory, manifest)
+
+
+def test_size_mismatch_is_corrupt(store_dir):
+    with open(store_dir / CHUNKS_FILENAME, "ab") as f:
+        f.write(b"\0")
+
+    with pytest.raises(CorruptVectorstoreError, match=f"{CHUNKS_FILENAME} is .* bytes"):
+        load_vectorstore(store_dir, HashEmbeddings())
+
+
+def test_checksums_are_only_compared_when_verifying(store_dir):
+    _rewrite(store_dir / CHUNKS_FILENAME, b"jailbreak", b"JAILBREAK")
+
+    # Same size, so the cheap checks pass
+    assert validate_store(store_dir)["ntotal"] == 3
+    with pytest.raises(CorruptVectorstoreError, match=f"Checksum mismatch for {CHUNKS_FILENAME}"):
+        validate_store(store_dir, verify_checksums=True)
+    with pytest.raises(CorruptVectorstoreError, match="Checksum mismatch"):
+        load_vectorstore(store_dir, HashEmbeddings(), verify_checksums=True)
+
+
+def test_ntotal_mismatch_is_corrupt(store_dir):
+    _edit_store_manifest(store_dir, ntotal=4)
+
+    with pytest.raises(CorruptVectorstoreError, match="Index has 3 vectors .* expects 4"):
+        load_vectorstore(store_dir, HashEmbeddings())
+
+
+def test_missing_file_is_corrupt(store_dir):
+    (store_dir / INDEX_FILENAME).unlink()
+
+    with pytest.raises(CorruptVectorstoreError, match=f"Missing {INDEX_FILENAME}"):
+        validate_store(store_dir)
+
+
+def test_unknown_format_is_corrupt(store_dir):
+    _edit_store_manifest(store_dir, format_version=STORE_FORMAT_VERSION + 1)
+
+    with pytest.raises(CorruptVectorstoreError, match="Unsupported vectorstore format"):
+        validate_store(store_dir)
+
+
+def test_directory_without_manifest_is_corrupt(tmp_path):
+    with pytest.raises(CorruptVectorstoreError, match="No vectorstore manifest"):
+        load_vectorstore(tmp_path, HashEmbeddings())
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_intact_store_loads_and_searches(store_dir, mmap):
+    loaded = load_vectorstore(store_dir, HashEmbeddings(), mmap=mmap, verify_checksums=True)
+
+    (doc,) = loaded.similarity_search(TEXTS["c"], k=1)
+    assert doc.page_content == TEXTS["c"]
+    assert doc.metadata == {"source": "c"}
@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from retrieval.sources import (
+    CHANGED,
+    FAILED,
+    UNCHANGED,
+    HostThrottle,
+    fetch_sources,
+    new_session,
+)
+
+ETAG = '"fixture-v1"'
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """
+    Local HTTP fixture.
+
+    ``/page/*`` serves HTML with an ETag, ``/missing/*`` is a 404 and
+    ``/flaky/*`` fails with a 503 on the first request to each path. Every
+    request is counted, and the start time and peak concurrency recorded.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.requests: Counter = Counter()
+        self.starts: list = []
+        self.active = 0
+        self.peak_active = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    server: FixtureServer
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] += 1
+            attempt = server.requests[self.path]
+            server.starts.append(time.monotonic())
+            server.active += 1
+            server.peak_active = max(server.peak_active, server.active)
+        try:
+            time.sleep(server.latency)
+            self._respond(attempt)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _respond(self, attempt: int) -> None:
+        if self.path.startswith("/missing/"):
+            self.send_error(404)
+            return
+        if self.path.startswith("/flaky/") and attempt == 1:
+            self.send_error(503)
+            return
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        body = f"<html lang='en'><title>{self.path}</title><p>Fixture</p></html>".encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    server = FixtureServer(latency=0.02)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _fetch(urls, max_retries=0, throttle=None, workers=4, previous=None):
+    return fetch_sources(
+        urls,
+        previous=previous,
+        session=new_session(pool_size=workers, max_retries=max_retries, backoff=0.0),
+        max_workers=workers,
+        throttle=throttle or HostThrottle(max_concurrent=workers, min_interval=0.0),
+    )
+
+
+def test_partial_failure_keeps_other_results_in_order(server):
+    urls = [
+        f"{server.base_url}/page/0",
+        f"{server.base_url}/missing/0",
+        f"{server.base_url}/page/1",
+    ]
+
+    results = _fetch(urls)
+
+    assert [result.url for result in results] == urls
+    assert [result.status for result in results] == [CHANGED, FAILED, CHANGED]
+    assert "404" in results[1].error
+    assert results[0].document.metadata["source"] == urls[0]
+    assert results[0].fingerprint["etag"] == ETAG
+
+
+def test_retries_transient_server_errors(server):
+    url = f"{server.base_url}/flaky/0"
+
+    (result,) = _fetch([url], max_retries=2)
+
+    assert result.status == CHANGED
+    assert server.requests["/flaky/0"] == 2
+
+
+def test_without_retries_transient_errors_fail(server):
+    (result,) = _fetch([f"{server.base_url}/flaky/0"], max_retries=0)
+
+    assert result.status == FAILED
+    assert server.requests["/flaky/0"] == 1
+
+
+def test_conditional_request_reports_unchanged(server):
+    url = f"{server.base_url}/page/0"
+    previous = {url: {"etag": ETAG, "content_hash": "old", "chunk_ids": ["a"]}}
+
+    (result,) = _fetch([url], previous=previous)
+
+    assert result.status == UNCHANGED
+    assert result.document is None
+    assert result.fingerprint == previous[url]
+
+
+def test_per_host_throttle_limits_concurrency_and_spaces_starts(server):
+    urls = [f"{server.base_url}/page/{i}" for i in range(4)]
+    interval = 0.05
+
+    results = _fetch(urls, throttle=HostThrottle(max_concurrent=1, min_interval=interval))
+
+    assert all(result.status == CHANGED for result in results)
+    assert server.peak_active == 1
+    gaps = [later - earlier for earlier, later in zip(server.starts, server.starts[1:])]
+    assert min(gaps) >= interval * 0.9
@@ -0,0 +1,259 @@
+"""
+Asyncio HTTP server for the Adaptive RAG workflow.
+
+Keeps one compiled graph and the loaded retriever warm for the life of the
+process and answers questions concurrently via ``app.ainvoke``.
+
+Endpoints:
+    GET  /health  -> {"status": "ok", "in_flight": n, "queued": n}
+    POST /query   {"question": "..."} -> {"run_id", "question", "generation", "verified",
+                                          "web_search", "sources", "latency_s",
+                                          "usage"}
+
+Every answered request is recorded with :mod:`utils.telemetry`, so the
+Prometheus and span files configured there stay current while serving.
+
+At most ``max_in_flight`` questions run at once and up to ``max_queue`` more
+wait; beyond that requests are rejected immediately with 503. Requests that
+take longer than ``request_timeout`` (including queue time) get 504.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Dict, Optional, Tuple
+
+from batch import document_sources
+from graph.budget import initial_state
+from graph.doc_refs import load_documents
+from utils import get_logger
+from utils.events import bind_run
+from utils.telemetry import RunTelemetry, export_run
+
+logger = get_logger(__name__)
+
+MAX_BODY_BYTES = 64 * 1024
+
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+class RAGServer:
+    """HTTP front end around any graph-like object exposing ``ainvoke``."""
+
+    def __init__(
+        self,
+        app,
+        max_in_flight: int = 16,
+        max_queue: int = 64,
+        request_timeout: float = 120.0,
+    ):
+        """
+        Args:
+            app: Compiled LangGraph app (or a fake with the same ``ainvoke``)
+            max_in_flight: Questions processed concurrently
+            max_queue: Additional questions allowed to wait for a slot
+            request_timeout: Seconds before a request is answered with 504
+        """
+        self.app = app
+        self.max_in_flight = max_in_flight
+        self.capacity = max_in_flight + max_queue
+        self.request_timeout = request_timeout
+        self.pending = 0
+        self.in_flight = 0
+        self._slots = asyncio.Semaphore(max_in_flight)
+
+    async def handle_request(
+        self, method: str, path: str, body: bytes
+    ) -> Tuple[int, Dict[str, Any]]:
+        """
+        Route one request (transport-independent, so it can be called directly in tests).
+
+        Args:
+            method: HTTP method
+            path: Request path
+            body: Raw request body
+
+        Returns:
+            Status code and JSON-serializable payload
+        """
+        if path == "/health":
+            if method != "GET":
+                return 405, {"error": "Use GET"}
+            return 200, {
+                "status": "ok",
+                "in_flight": self.in_flight,
+                "queued": self.pending - self.in_flight,
+            }
+
+        if path != "/query":
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        try:
+            question = json.loads(body or b"{}").get("question", "")
+        except (ValueError, AttributeError):
+            return 400, {"error": "Body must be a JSON object"}
+        if not isinstance(question, str) or not question.strip():
+            return 400, {"error": "Missing 'question'"}
+
+        # Backpressure: reject instead of queueing without bound
+        if self.pending >= self.capacity:
+            return 503, {"error": "Server busy, retry later"}
+
+        self.pending += 1
+        try:
+            return await asyncio.wait_for(self._answer(question), self.request_timeout)
+        except asyncio.TimeoutError:
+            return 504, {"error": f"Timed out after {self.request_timeout:g}s"}
+        finally:
+            self.pending -= 1
+
+    async def _answer(self, question: str) -> Tuple[int, Dict[str, Any]]:
+        async with self._slots:
+            self.in_flight += 1
+            start = time.perf_counter()
+            telemetry = RunTelemetry()
+            run_id = uuid.uuid4().hex[:12]
+            try:
+                with bind_run(run_id):
+                    result = await self.app.ainvoke(
+                        initial_state(question), config={"callbacks": [telemetry]}
+                    )
+            except Exception as e:
+                logger.exception("Query failed")
+                return 500, {"error": str(e)}
+            finally:
+                self.in_flight -= 1
+                export_run(telemetry)
+
+        usage = telemetry.summary()
+        return 200, {
+            "run_id": run_id,
+            "question": question,
+            "generation": result.get("generation"),
+            "verified": result.get("verified", True),
+            "web_search": result.get("web_search", False),
+            "sources": document_sources(load_documents(result)),
+            "latency_s": round(time.perf_counter() - start, 4),
+            "usage": {
+                "llm_calls": usage["llm_calls"],
+                "cache_hits": usage["cache_hits"],
+                "prompt_tokens": usage["prompt_tokens"],
+                "completion_tokens": usage["completion_tokens"],
+                "cost_usd": round(usage["cost_usd"], 6),
+            },
+        }
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve a single HTTP/1.1 request per connection."""
+        try:
+            request = await _read_request(reader)
+            if request is None:
+                status, payload = 400, {"error": "Malformed request"}
+            elif request == "too_large":
+                status, payload = 413, {"error": f"Body exceeds {MAX_BODY_BYTES} bytes"}
+            else:
+                status, payload = await self.handle_request(*request)
+            await _write_response(writer, status, payload)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8000) -> None:
+        """Listen until cancelled."""
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logger.warning("Serving Adaptive RAG on http://%s:%d", host, port)
+        async with server:
+            await server.serve_forever()
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    request_line = await reader.readline()
+    parts = request_line.decode("latin-1").split()
+    if len(parts) != 3:
+        return None
+    method, path, _ = parts
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", "0") or 0)
+    except ValueError:
+        return None
+    if length < 0:
+        return None
+    if length > MAX_BODY_BYTES:
+        return "too_large"
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0], body
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any]
+) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    headers = [
+        f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+        "Content-Type: application/json",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ]
+    if status == 503:
+        headers.append("Retry-After: 1")
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+def run_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    max_in_flight: int = 16,
+    max_queue: int = 64,
+    request_timeout: float = 120.0,
+    app: Optional[Any] = None,
+) -> None:
+    """
+    Warm up the graph and retriever, then serve until interrupted.
+
+    Args:
+        host: Bind address
+        port: Bind port
+        max_in_flight: Questions processed concurrently
+        max_queue: Additional questions allowed to wait
+        request_timeout: Per-request timeout in seconds
+        app: Graph to serve (defaults to graph.graph.app)
+    """
+    if app is None:
+        from graph.graph import app
+        from ingestion import get_retriever
+
+        # Load the vectorstore now rather than on the first request
+        get_retriever()
+
+    server = RAGServer(
+        app, max_in_flight=max_in_flight, max_queue=max_queue, request_timeout=request_timeout
+    )
+    try:
+        asyncio.run(server.serve(host, port))
+    except KeyboardInterrupt:
+        pass
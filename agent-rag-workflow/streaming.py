@@ -0,0 +1,125 @@
+"""
+Stream graph progress and answer tokens to the terminal as they arrive.
+
+Uses ``app.stream(stream_mode=["updates", "messages"])``: node updates drive the
+accumulated final state and draft progress events, while message chunks from the
+generate node are written straight to stdout. Whether each draft was accepted,
+rejected or left unverified is written next to it, and also emitted through the
+event sink like the nodes' own events (recorded with ``--events-file``); other
+progress goes only to the sink. The router and grader chains are tagged ``nostream`` so their
+structured outputs never show up as tokens.
+
+Grading runs after a draft has been streamed, so a draft can still be rejected.
+That is detected from what the graph does next:
+
+- generate streams again     -> not grounded, regenerating
+- the websearch node runs    -> answer missed the question
+- the finalize node runs     -> budget spent, best draft unverified
+"""
+
+import sys
+import time
+from typing import Any, Dict, Optional, TextIO
+
+from graph.consts import FINALIZE, GENERATE, WEBSEARCH
+from utils.events import FAIL, INFO, OK, Decision, Event, Grade, emit
+
+
+def stream_query(
+    app,
+    state: Dict[str, Any],
+    config: Optional[Dict[str, Any]] = None,
+    out: TextIO = sys.stdout,
+) -> Dict[str, Any]:
+    """
+    Run the graph, printing each draft answer token by token.
+
+    Args:
+        app: Compiled LangGraph application
+        state: Graph input (see graph.budget.initial_state)
+        config: Runnable config (callbacks etc.)
+        out: Stream the tokens are written to
+
+    Returns:
+        Final graph state, merged from the node updates
+    """
+    result = dict(state)
+    start = time.perf_counter()
+    first_token_s: Optional[float] = None
+    drafts = 0
+    streaming = False  # tokens of the current draft are being written
+    grading = False  # the last draft is finished and waiting on the graders
+
+    for mode, chunk in app.stream(state, config=config, stream_mode=["updates", "messages"]):
+        if mode == "messages":
+            message, metadata = chunk
+            content = message.content if isinstance(message.content, str) else ""
+            if metadata.get("langgraph_node") != GENERATE or not content:
+                continue
+            if grading:
+                _reject(out, drafts, "not grounded in the documents → regenerating")
+                grading = False
+            if not streaming:
+                drafts += 1
+                out.write(f"\n✍️  Draft {drafts}: ")
+                streaming = True
+            if first_token_s is None:
+                first_token_s = time.perf_counter() - start
+            out.write(content)
+            out.flush()
+            continue
+
+        for node, update in chunk.items():
+            draft = result.get("generation")
+            result.update(update or {})
+            if node == GENERATE:
+                if streaming:
+                    out.write("\n\n")
+                    out.flush()
+                    streaming = False
+                else:
+                    # No token chunks arrived for this draft
+                    if grading:
+                        _reject(out, drafts, "not grounded in the documents → regenerating")
+                    drafts += 1
+                grading = True
+                emit(Event("STREAM", f"Draft {drafts} complete, grading", level=INFO))
+            elif grading and node == WEBSEARCH:
+                _reject(out, drafts, "doesn't address the question → searching the web")
+                grading = False
+            elif grading and node == FINALIZE:
+                if result.get("generation") != draft:
+                    message = "returning the last grounded draft, unverified"
+                else:
+                    message = f"draft {drafts} is unverified"
+                _report(
+                    out,
+                    Decision(
+                        "STREAM",
+                        f"⚠ Budget spent: {message}",
+                        outcome="budget exhausted",
+                        level=FAIL,
+                    ),
+                )
+                grading = False
+
+    if grading:
+        _report(out, Grade("STREAM", f"✓ Draft {drafts} accepted", subject="draft", passed=True))
+
+    total_s = time.perf_counter() - start
+    if first_token_s is not None:
+        message = f"First token after {first_token_s:.2f}s, done after {total_s:.2f}s"
+        _report(out, Event("STREAM", message, level=OK))
+    return result
+
+
+def _report(out: TextIO, event: Event) -> None:
+    """Write a draft status line next to the drafts, and emit it to the sink."""
+    out.write(f"{event.message}\n")
+    out.flush()
+    emit(event)
+
+
+def _reject(out: TextIO, draft: int, reason: str) -> None:
+    message = f"✗ Draft {draft} rejected: {reason}"
+    _report(out, Grade("STREAM", message, subject="draft", passed=False))
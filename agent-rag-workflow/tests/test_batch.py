@@ -0,0 +1,139 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.documents import Document
+
+from batch import load_questions, run_batch
+from benchmarks.fakes import DEFAULT_SCRIPT, TEXT
+from graph.graph import app
+from utils import telemetry
+from utils.telemetry import MetricsRegistry
+
+
+class SleepyApp:
+    """Graph stand-in that answers after a per-question delay and tracks concurrency."""
+
+    def __init__(self, delays, failing=()):
+        self.delays = delays
+        self.failing = set(failing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, state, config=None):
+        question = state["question"]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delays.get(question, 0.0))
+            if question in self.failing:
+                raise RuntimeError(f"no answer for {question}")
+            source = {"source": f"https://example.com/{question}"}
+            return {
+                "generation": f"answer to {question}",
+                "documents": [Document("", metadata=source)],
+            }
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    # run_batch reports node latency from the process-wide registry
+    registry = MetricsRegistry()
+    monkeypatch.setattr(telemetry, "metrics", registry)
+    monkeypatch.setattr("batch.metrics", registry)
+    return registry
+
+
+def _questions(*names):
+    return [{"id": i, "question": name} for i, name in enumerate(names, 1)]
+
+
+def _read(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_results_are_written_as_they_complete(tmp_path):
+    app_ = SleepyApp({"slow": 0.06, "medium": 0.03, "fast": 0.0})
+    output = tmp_path / "out" / "results.jsonl"
+
+    summary = asyncio.run(run_batch(app_, _questions("slow", "medium", "fast"), output))
+
+    results = _read(output)
+    assert [r["question"] for r in results] == ["fast", "medium", "slow"]
+    assert results[0] == {
+        "id": 3,
+        "question": "fast",
+        "generation": "answer to fast",
+        "verified": True,
+        "web_search": False,
+        "sources": ["https://example.com/fast"],
+        "latency_s": results[0]["latency_s"],
+        "telemetry": results[0]["telemetry"],
+    }
+    assert summary["questions"] == 3
+    assert summary["errors"] == 0
+
+
+def test_failed_question_is_recorded_without_stopping_the_batch(tmp_path):
+    app_ = SleepyApp({"first": 0.02}, failing={"broken"})
+    output = tmp_path / "results.jsonl"
+
+    summary = asyncio.run(run_batch(app_, _questions("first", "broken", "last"), output))
+
+    results = {r["question"]: r for r in _read(output)}
+    assert set(results) == {"first", "broken", "last"}
+    assert results["broken"]["error"] == "no answer for broken"
+    assert "generation" not in results["broken"]
+    assert results["last"]["generation"] == "answer to last"
+    assert summary["errors"] == 1
+
+
+def test_concurrency_limit(tmp_path):
+    names = [f"q{i}" for i in range(6)]
+    app_ = SleepyApp({name: 0.01 for name in names})
+
+    asyncio.run(run_batch(app_, _questions(*names), tmp_path / "results.jsonl", concurrency=2))
+
+    assert app_.max_in_flight == 2
+
+
+def test_latency_summary(tmp_path):
+    app_ = SleepyApp({"slow": 0.05, "fast": 0.0})
+
+    summary = asyncio.run(run_batch(app_, _questions("slow", "fast"), tmp_path / "results.jsonl"))
+
+    latencies = [r["latency_s"] for r in _read(tmp_path / "results.jsonl")]
+    assert summary["latency_s"]["count"] == 2
+    assert summary["latency_s"]["max"] == max(latencies) >= 0.05
+    assert summary["latency_s"]["mean"] == pytest.approx(sum(latencies) / 2)
+    assert summary["wall_time_s"] >= 0.05
+    assert summary["questions_per_s"] == pytest.approx(2 / summary["wall_time_s"])
+
+
+def test_batch_through_the_graph(fakes, tmp_path):
+    questions = _questions("What is agent memory?", "How do agents use tools?")
+    output = tmp_path / "results.jsonl"
+
+    summary = asyncio.run(run_batch(app, questions, output, concurrency=2))
+
+    results = sorted(_read(output), key=lambda r: r["id"])
+    assert [r["question"] for r in results] == [q["question"] for q in questions]
+    for result in results:
+        assert result["generation"] == DEFAULT_SCRIPT[TEXT][0]
+        assert result["sources"]
+        assert result["telemetry"]["llm_calls"] > 0
+    assert summary["errors"] == 0
+    assert summary["node_latency_s"]["retrieve"]["count"] == 2
+    assert summary["node_latency_s"]["generate"]["count"] == 2
+
+
+def test_load_questions(tmp_path):
+    path = tmp_path / "questions.jsonl"
+    path.write_text('{"question": "first"}\n\n{"id": "q2", "question": "second"}\n')
+
+    assert load_questions(path) == [
+        {"id": 1, "question": "first"},
+        {"id": "q2", "question": "second"},
+    ]
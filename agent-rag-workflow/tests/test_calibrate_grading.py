@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from calibrate_grading import _env_lines, calibrate, load_examples
+
+
+def _examples(*groups):
+    """Expand ``(similarity, relevant, count)`` groups into examples."""
+    return [(similarity, relevant) for similarity, relevant, count in groups for _ in range(count)]
+
+
+def test_separable_examples_are_all_decided():
+    examples = [(0.8 + i / 100, True) for i in range(10)] + [
+        (0.1 + i / 100, False) for i in range(10)
+    ]
+
+    result = calibrate(examples, target=1.0, min_support=5)
+
+    assert result.accept == pytest.approx(0.8)
+    assert result.reject == pytest.approx(0.19)
+    assert (result.accepted, result.rejected) == (10, 10)
+    assert (result.accept_errors, result.reject_errors) == (0, 0)
+    assert result.skip_rate == 1.0
+
+
+def test_no_examples():
+    result = calibrate([], target=0.95, min_support=1)
+
+    assert (result.accept, result.reject) == (None, None)
+    assert result.skip_rate == 0.0
+
+
+def test_sides_below_min_support_stay_unset():
+    examples = _examples((0.9, True, 3), (0.5, True, 2), (0.5, False, 2), (0.1, False, 3))
+
+    result = calibrate(examples, target=1.0, min_support=4)
+
+    assert (result.accept, result.reject) == (None, None)
+    assert result.skip_rate == 0.0
+
+
+def test_ties_are_decided_together():
+    examples = _examples((0.9, True, 5), (0.5, True, 1), (0.5, False, 1), (0.1, False, 5))
+
+    strict = calibrate(examples, target=1.0, min_support=3)
+    lenient = calibrate(examples, target=0.8, min_support=3)
+
+    # The 0.5 pair disagrees, so a strict cut stops above it
+    assert (strict.accept, strict.accepted) == (0.9, 5)
+    assert (strict.reject, strict.rejected) == (0.1, 5)
+    assert (lenient.accept, lenient.accepted, lenient.accept_errors) == (0.5, 7, 1)
+
+
+def test_reject_threshold_stays_below_accept():
+    examples = _examples((0.9, True, 10), (0.6, False, 10), (0.3, False, 10))
+
+    result = calibrate(examples, target=1.0, min_support=5)
+
+    assert result.accept == 0.9
+    assert result.reject == 0.6
+    assert result.reject < result.accept
+    assert result.accepted + result.rejected == result.total
+
+
+def test_all_relevant_has_no_reject_threshold():
+    result = calibrate(_examples((0.7, True, 10), (0.2, True, 10)), target=0.95, min_support=5)
+
+    assert result.accept == 0.2
+    assert result.reject is None
+
+
+def test_load_examples_uses_given_similarities(tmp_path):
+    path = tmp_path / "labelled.jsonl"
+    rows = [{"similarity": 0.83, "relevant": True}, {"similarity": 0.12, "relevant": False}]
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n\n", encoding="utf-8")
+
+    assert load_examples(path) == [(0.83, True), (0.12, False)]
+
+
+def test_env_lines_keep_full_precision():
+    result = calibrate(_examples((0.123456789, True, 10)), target=1.0, min_support=5)
+
+    assert _env_lines(result) == {
+        "GRADE_ACCEPT_SIMILARITY": "0.123456789",
+        "GRADE_REJECT_SIMILARITY": "",
+    }
@@ -0,0 +1,93 @@
+import pytest
+
+from utils import disk_cache
+from utils.disk_cache import DiskCache
+
+
+class Clock:
+    """Stands in for the ``time`` module so tests control entry ages."""
+
+    def __init__(self):
+        self.now = 1_000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(disk_cache, "time", clock)
+    return clock
+
+
+def test_entries_expire_after_the_ttl(clock, tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", ttl_seconds=60)
+    cache.set("key", b"value")
+
+    clock.now += 60
+    assert cache.get("key") == b"value"
+    clock.now += 1
+    assert cache.get("key") is None
+
+    # Expired entries are removed on lookup
+    assert len(cache) == 0
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_without_ttl_entries_do_not_expire(clock, tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite")
+    cache.set("key", b"value")
+
+    clock.now += 10 * 365 * 24 * 3600
+
+    assert cache.get("key") == b"value"
+
+
+def test_least_recently_used_entry_is_evicted(clock, tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite", max_entries=2)
+    for key in ("a", "b"):
+        cache.set(key, key.encode())
+        clock.now += 1
+    cache.get("a")  # "b" is now least recently used
+    clock.now += 1
+
+    cache.set("c", b"c")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"a"
+    assert cache.get("c") == b"c"
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+
+
+def test_namespaces_share_a_file_but_not_entries(tmp_path):
+    path = tmp_path / "cache.sqlite"
+    llm = DiskCache(path, namespace="llm", max_entries=1)
+    search = DiskCache(path, namespace="search")
+    search.set("key", b"search")
+    search.set("other", b"search")
+
+    llm.set("key", b"llm")
+    llm.clear()
+
+    assert search.get("key") == b"search"
+    assert len(search) == 2
+    assert len(llm) == 0
+
+
+def test_stats_report_the_hit_rate(tmp_path):
+    cache = DiskCache(tmp_path / "cache.sqlite")
+    cache.set("key", b"value")
+
+    cache.get("key")
+    cache.get("key")
+    cache.get("missing")
+
+    assert cache.stats() == {
+        "hits": 2,
+        "misses": 1,
+        "hit_rate": pytest.approx(2 / 3),
+        "evictions": 0,
+        "entries": 1,
+    }
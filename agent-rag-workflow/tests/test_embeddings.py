@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+
+from benchmarks.fakes import HashEmbeddings
+from model.embeddings import CachedEmbeddings
+from utils.disk_cache import DiskCache
+
+
+class CountingEmbeddings(HashEmbeddings):
+    """HashEmbeddings that records which texts reached the model."""
+
+    def __init__(self):
+        super().__init__()
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def underlying():
+    return CountingEmbeddings()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DiskCache(tmp_path / "embeddings.sqlite", namespace="embeddings")
+
+
+def test_only_unseen_texts_reach_the_model(underlying, store):
+    embeddings = CachedEmbeddings(underlying, store, "model-a")
+
+    first = embeddings.embed_documents(["agents plan", "tools help"])
+    second = embeddings.embed_documents(["tools help", "memory lasts", "memory lasts"])
+
+    # Duplicates inside one batch are embedded once
+    assert underlying.embedded == ["agents plan", "tools help", "memory lasts"]
+    assert (embeddings.hits, embeddings.misses) == (1, 4)
+    assert embeddings.hit_rate == pytest.approx(0.2)
+    np.testing.assert_allclose(second[0], first[1], rtol=1e-6)
+    assert second[1] == second[2]
+
+
+def test_cache_keys_include_the_model_name(underlying, store):
+    CachedEmbeddings(underlying, store, "model-a").embed_documents(["agents plan"])
+    other = CachedEmbeddings(underlying, store, "model-b")
+
+    other.embed_documents(["agents plan"])
+
+    assert underlying.embedded == ["agents plan", "agents plan"]
+    assert (other.hits, other.misses) == (0, 1)
+
+
+def test_vectors_round_trip_as_float32(underlying, store):
+    embeddings = CachedEmbeddings(underlying, store, "model-a")
+    original = underlying.embed_documents(["agents plan with memory"])[0]
+    embeddings.embed_documents(["agents plan with memory"])
+
+    # A fresh wrapper over the same file reads the stored vector back
+    reopened = DiskCache(store.path, namespace="embeddings")
+    cached = CachedEmbeddings(underlying, reopened, "model-a").embed_documents(
+        ["agents plan with memory"]
+    )[0]
+
+    assert len(cached) == len(original)
+    assert cached == np.asarray(original, dtype=np.float32).tolist()
+    np.testing.assert_allclose(cached, original, rtol=1e-6)
+
+
+def test_queries_are_not_cached(underlying, store):
+    embeddings = CachedEmbeddings(underlying, store, "model-a")
+
+    embeddings.embed_query("agents plan")
+
+    assert len(store) == 0
+    assert (embeddings.hits, embeddings.misses) == (0, 0)
+
+
+def test_reset_stats(underlying, store):
+    embeddings = CachedEmbeddings(underlying, store, "model-a")
+    embeddings.embed_documents(["agents plan"])
+
+    embeddings.reset_stats()
+
+    assert (embeddings.hits, embeddings.misses, embeddings.hit_rate) == (0, 0, 0.0)
@@ -0,0 +1,287 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+import ingestion
+from benchmarks.fakes import HashEmbeddings
+from graph import similarity_gate
+from model.embeddings import CachedEmbeddings
+from retrieval.bm25 import open_bm25
+from retrieval.centroids import load_centroids
+from retrieval.hybrid import HybridRetriever
+from retrieval.index import FLAT, build_vectorstore
+from retrieval.manifest import MANIFEST_FILENAME, chunk_ids, content_hash, load_manifest
+from retrieval.persistence import (
+    CHUNKS_FILENAME,
+    CorruptVectorstoreError,
+    has_store,
+    load_vectorstore,
+    save_vectorstore,
+)
+from retrieval.sources import CHANGED, FAILED, UNCHANGED, FetchResult
+from utils.disk_cache import DiskCache
+
+REPO = Path(__file__).resolve().parents[1]
+SOURCES = {
+    "https://example.com/agents": ["agents plan with memory", "agents call tools"],
+    "https://example.com/prompts": ["few-shot prompting helps"],
+}
+
+
+def _build():
+    documents = [
+        Document(page_content=text, metadata={"source": url})
+        for url, texts in SOURCES.items()
+        for text in texts
+    ]
+    ids = [f"chunk-{i}" for i in range(len(documents))]
+    return build_vectorstore(documents, ids, HashEmbeddings(), FLAT)
+
+
+@pytest.fixture
+def store_path(monkeypatch, tmp_path):
+    path = tmp_path / "vectorstore" / "agent_rag_collection"
+    monkeypatch.setattr(ingestion, "VECTORSTORE_PATH", path)
+    monkeypatch.setattr(ingestion, "get_embeddings", HashEmbeddings)
+    return path
+
+
+def test_legacy_pickle_store_is_migrated_once(store_path, monkeypatch):
+    _build().save_local(str(store_path))
+    assert not has_store(store_path)
+
+    migrated = ingestion._load_vectorstore()
+
+    assert has_store(store_path)
+    assert migrated.index.ntotal == 3
+    assert migrated.docstore.search("chunk-2").page_content == "few-shot prompting helps"
+    assert load_manifest(store_path)["sources"] == {
+        "https://example.com/agents": {"chunk_ids": ["chunk-0", "chunk-1"]},
+        "https://example.com/prompts": {"chunk_ids": ["chunk-2"]},
+    }
+
+    def fail():
+        raise AssertionError("migrated again")
+
+    monkeypatch.setattr(ingestion, "_migrate_legacy_vectorstore", fail)
+    assert ingestion._load_vectorstore().index.ntotal == 3
+
+
+def test_vectorstore_verify_checks_checksums_on_load(store_path, monkeypatch):
+    save_vectorstore(_build(), store_path)
+    chunks = store_path / CHUNKS_FILENAME
+    chunks.write_bytes(chunks.read_bytes().replace(b"few-shot", b"FEW-SHOT"))
+
+    assert ingestion._load_vectorstore().index.ntotal == 3
+    monkeypatch.setattr(ingestion, "VECTORSTORE_VERIFY", True)
+    with pytest.raises(CorruptVectorstoreError, match="Checksum mismatch"):
+        ingestion._load_vectorstore()
+
+
+@pytest.fixture
+def gate_warning(store_path, monkeypatch):
+    save_vectorstore(_build(), store_path)
+    monkeypatch.setattr(ingestion, "RETRIEVAL_MODE", "dense")
+    monkeypatch.setattr(ingestion, "_similarity_gate_warned", False)
+    monkeypatch.setattr(similarity_gate, "GRADE_ACCEPT_SIMILARITY", 0.8)
+
+
+@pytest.mark.parametrize("mode", ["dense", "hybrid"])
+def test_similarity_gate_without_scores_warns_once(gate_warning, monkeypatch, capsys, mode):
+    monkeypatch.setattr(ingestion, "RETRIEVAL_MODE", mode)
+    monkeypatch.setattr(ingestion, "MMR_IMPL", "langchain")
+
+    retriever = ingestion._build_retriever(ingestion._load_vectorstore())
+    ingestion._build_retriever(ingestion._load_vectorstore())
+
+    assert isinstance(retriever, HybridRetriever) == (mode == "hybrid")
+    assert capsys.readouterr().out.count("Set MMR_IMPL=native to use the similarity gate") == 1
+
+
+def test_similarity_gate_with_native_mmr_does_not_warn(gate_warning, monkeypatch, capsys):
+    monkeypatch.setattr(ingestion, "MMR_IMPL", "native")
+
+    retriever = ingestion._build_retriever(ingestion._load_vectorstore())
+
+    assert "similarity gate" not in capsys.readouterr().out
+    assert all("similarity" in doc.metadata for doc in retriever.invoke("agents memory"))
+
+
+def test_disabled_similarity_gate_does_not_warn(gate_warning, monkeypatch, capsys):
+    monkeypatch.setattr(similarity_gate, "GRADE_ACCEPT_SIMILARITY", None)
+    monkeypatch.setattr(ingestion, "MMR_IMPL", "langchain")
+
+    ingestion._build_retriever(ingestion._load_vectorstore())
+
+    assert "similarity gate" not in capsys.readouterr().out
+
+
+def _verify_cli(cwd: Path) -> subprocess.CompletedProcess:
+    env = {**os.environ, "PYTHONPATH": str(REPO), "OPENAI_API_KEY": "sk-offline-test"}
+    return subprocess.run(
+        [sys.executable, str(REPO / "ingestion.py"), "--verify"],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+
+
+def test_verify_cli(tmp_path):
+    # The CLI uses the relative VECTORSTORE_PATH, so run it from tmp_path
+    store = tmp_path / ingestion.VECTORSTORE_PATH
+    save_vectorstore(_build(), store)
+
+    intact = _verify_cli(tmp_path)
+    chunks = store / CHUNKS_FILENAME
+    chunks.write_bytes(chunks.read_bytes().replace(b"few-shot", b"FEW-SHOT"))
+    corrupt = _verify_cli(tmp_path)
+
+    assert intact.returncode == 0, intact.stderr
+    assert "Index and chunks match the manifest" in intact.stdout
+    assert corrupt.returncode != 0
+    assert f"CorruptVectorstoreError: Checksum mismatch for {CHUNKS_FILENAME}" in corrupt.stderr
+
+
+class FakeSite:
+    """Stands in for fetch_sources: pages by URL, changed when their ETag changes."""
+
+    def __init__(self, pages):
+        self.pages = dict(pages)  # url -> (etag, text)
+
+    def fetch(self, urls, previous=None):
+        results = []
+        for url in urls:
+            if url not in self.pages:
+                results.append(FetchResult(url, FAILED, error="404 Not Found"))
+                continue
+            etag, text = self.pages[url]
+            known = (previous or {}).get(url)
+            if known and known.get("etag") == etag:
+                results.append(FetchResult(url, UNCHANGED, fingerprint=known))
+                continue
+            fingerprint = {"etag": etag, "last_modified": None, "content_hash": content_hash(text)}
+            document = Document(page_content=text, metadata={"source": url})
+            results.append(FetchResult(url, CHANGED, document=document, fingerprint=fingerprint))
+        return results
+
+
+def _page(topic, count=6):
+    return " ".join(f"{topic} sentence {i} about {topic}." for i in range(count))
+
+
+def _expected_ids(url, text):
+    splits = _splitter().split_text(text)
+    return chunk_ids(url, splits)
+
+
+def _splitter():
+    # The real splitter counts tiktoken tokens; characters keep the test offline
+    return RecursiveCharacterTextSplitter(chunk_size=120, chunk_overlap=0)
+
+
+@pytest.fixture
+def site(store_path, monkeypatch):
+    site = FakeSite(
+        {
+            "https://example.com/agents": ("a1", _page("agents")),
+            "https://example.com/prompts": ("p1", _page("prompts")),
+            "https://example.com/attacks": ("x1", _page("attacks")),
+        }
+    )
+    monkeypatch.setattr(ingestion, "fetch_sources", site.fetch)
+    monkeypatch.setattr(ingestion, "_get_text_splitter", _splitter)
+    monkeypatch.setattr(ingestion, "URLS", list(site.pages))
+    monkeypatch.setattr(ingestion, "INDEX_TYPE", FLAT)
+    ingestion._create_vectorstore()
+    return site
+
+
+def test_incremental_refresh_updates_adds_and_removes_sources(site, store_path, monkeypatch):
+    agents, prompts, attacks = ingestion.URLS
+    added = "https://example.com/memory"
+    before = load_manifest(store_path)["sources"]
+    site.pages[agents] = ("a2", _page("planning", 4))
+    site.pages[added] = ("m1", _page("memory"))
+    monkeypatch.setattr(ingestion, "URLS", [agents, prompts, added])
+
+    vectorstore = ingestion._update_vectorstore()
+
+    sources = load_manifest(store_path)["sources"]
+    expected = {
+        agents: _expected_ids(agents, site.pages[agents][1]),
+        prompts: before[prompts]["chunk_ids"],
+        added: _expected_ids(added, site.pages[added][1]),
+    }
+    assert {url: entry["chunk_ids"] for url, entry in sources.items()} == expected
+    assert sources[agents]["etag"] == "a2"
+    assert sources[prompts] == before[prompts]
+
+    all_ids = [doc_id for ids in expected.values() for doc_id in ids]
+    assert sorted(vectorstore.index_to_docstore_id.values()) == sorted(all_ids)
+    reloaded = load_vectorstore(store_path, HashEmbeddings(), verify_checksums=True)
+    assert sorted(reloaded.index_to_docstore_id.values()) == sorted(all_ids)
+
+    bm25 = open_bm25(store_path)
+    assert len(bm25) == len(all_ids)
+    assert {doc_id for doc_id, _ in bm25.search("planning", k=10)} == set(expected[agents])
+    assert bm25.search("attacks", k=10) == []
+
+    assert set(load_centroids(store_path).topics) == {agents, prompts, added}
+    assert not set(before[attacks]["chunk_ids"]) & set(all_ids)
+
+
+def test_failed_source_keeps_its_chunks(site, store_path):
+    agents = ingestion.URLS[0]
+    before = load_manifest(store_path)["sources"]
+    del site.pages[agents]
+
+    vectorstore = ingestion._update_vectorstore()
+
+    assert load_manifest(store_path)["sources"] == before
+    indexed = set(vectorstore.index_to_docstore_id.values())
+    assert set(before[agents]["chunk_ids"]) <= indexed
+
+
+def test_refresh_without_changes_does_not_rewrite_the_store(site, store_path):
+    manifest = store_path / MANIFEST_FILENAME
+    written = manifest.stat().st_mtime_ns
+
+    vectorstore = ingestion._update_vectorstore()
+
+    assert manifest.stat().st_mtime_ns == written
+    assert vectorstore.index.ntotal == sum(
+        len(entry["chunk_ids"]) for entry in load_manifest(store_path)["sources"].values()
+    )
+
+
+@pytest.fixture
+def cached_embeddings(store_path, monkeypatch, tmp_path):
+    store = DiskCache(tmp_path / "embeddings.sqlite", namespace="embeddings")
+    embeddings = CachedEmbeddings(HashEmbeddings(), store, "hash")
+    monkeypatch.setattr(ingestion, "get_embeddings", lambda: embeddings)
+    return embeddings
+
+
+def test_refresh_reports_embedding_cache_hits(cached_embeddings, site, capsys):
+    agents = ingestion.URLS[0]
+    old_splits = set(_splitter().split_text(site.pages[agents][1]))
+    # Appending keeps the leading chunks identical, so only the tail is re-embedded
+    new_text = site.pages[agents][1] + " " + _page("planning", 2)
+    new_splits = _splitter().split_text(new_text)
+    reused = sum(split in old_splits for split in new_splits)
+    assert 0 < reused < len(new_splits)
+    site.pages[agents] = ("a2", new_text)
+    capsys.readouterr()
+
+    ingestion._update_vectorstore()
+
+    rate = reused / len(new_splits)
+    expected = f"Embedding cache: {reused}/{len(new_splits)} chunks reused ({rate:.0%} hit rate)"
+    assert expected in capsys.readouterr().out
@@ -0,0 +1,97 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from benchmarks.fakes import TEXT, FakeChatModel
+from graph.chains import generation as generation_chains
+from graph.chains.retrieval_grader import GradeDocuments
+from graph.nodes.generate import generate
+from model.cache import SQLiteLLMCache
+from utils import disk_cache
+
+QUESTION = "How do agents use memory?"
+DOCUMENTS = [Document(page_content="Agents keep short-term and long-term memory.")]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return SQLiteLLMCache(str(tmp_path / "llm.sqlite"))
+
+
+@pytest.fixture
+def models(cache, monkeypatch):
+    """Separate cached and uncached models behind the generation chains."""
+    cached = FakeChatModel(cache=cache)
+    uncached = FakeChatModel(cache=False)
+    cached.set_script({TEXT: ["cached answer"]})
+    uncached.set_script({TEXT: ["fresh answer"]})
+    monkeypatch.setattr(generation_chains, "llm", cached)
+    monkeypatch.setattr(generation_chains, "uncached_llm", uncached)
+    for chain in (generation_chains.get_generation_chain, generation_chains.get_regeneration_chain):
+        chain.cache_clear()
+    yield cached, uncached
+    for chain in (generation_chains.get_generation_chain, generation_chains.get_regeneration_chain):
+        chain.cache_clear()
+
+
+def test_structured_output_round_trips_as_a_dict(cache):
+    message = AIMessage(
+        content="", additional_kwargs={"parsed": GradeDocuments(binary_score="yes")}
+    )
+
+    cache.update("prompt", "llm-string", [ChatGeneration(message=message)])
+    (generation,) = cache.lookup("prompt", "llm-string")
+
+    assert generation.message.additional_kwargs["parsed"] == {"binary_score": "yes"}
+    assert generation.message.response_metadata["cache_hit"] is True
+    # The caller's message is left as it was
+    assert isinstance(message.additional_kwargs["parsed"], GradeDocuments)
+
+
+def test_key_includes_the_llm_string(cache):
+    cache.update("prompt", "model-a", [ChatGeneration(message=AIMessage(content="a"))])
+
+    assert cache.lookup("prompt", "model-b") is None
+    assert cache.lookup("other prompt", "model-a") is None
+    assert cache.lookup("prompt", "model-a")[0].message.content == "a"
+
+
+def test_expired_responses_are_not_replayed(tmp_path, monkeypatch):
+    cache = SQLiteLLMCache(str(tmp_path / "llm.sqlite"), ttl_seconds=60)
+    cache.update("prompt", "llm", [ChatGeneration(message=AIMessage(content="a"))])
+    later = time.time() + 61
+    monkeypatch.setattr(disk_cache, "time", SimpleNamespace(time=lambda: later))
+
+    assert cache.lookup("prompt", "llm") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_first_generation_is_served_from_cache(models, cache):
+    cached, uncached = models
+    state = {"question": QUESTION, "documents": DOCUMENTS}
+
+    first = generate(state)
+    second = generate(state)
+
+    assert first["generation"] == second["generation"] == "cached answer"
+    assert cached.calls() == {TEXT: 1}
+    assert cache.stats()["hits"] == 1
+    assert uncached.calls() == {}
+
+
+def test_regeneration_skips_the_cache(models, cache):
+    cached, uncached = models
+    state = {"question": QUESTION, "documents": DOCUMENTS}
+    generate(state)
+    lookups = cache.stats()["hits"] + cache.stats()["misses"]
+
+    update = generate({**state, "generation": "cached answer"})
+
+    assert update["generation"] == "fresh answer"
+    assert update["regenerations"] == 1
+    assert uncached.calls() == {TEXT: 1}
+    assert cache.stats()["hits"] + cache.stats()["misses"] == lookups
@@ -0,0 +1,32 @@
+import time
+
+from benchmarks.fakes import TEXT
+from graph import budget
+from graph.budget import initial_state
+from graph.checkpoint import new_thread_id, thread_config
+from main import _get_app, resume_query
+
+QUESTION = "How do agents use memory?"
+
+
+def test_resume_gets_a_fresh_deadline(fakes, monkeypatch, tmp_path):
+    db = str(tmp_path / "checkpoints.sqlite")
+    app = _get_app(db)
+    config = thread_config(new_thread_id())
+    fakes.llm.set_script({"GradeHallucinations": [RuntimeError("grader down")]})
+    try:
+        app.invoke(initial_state(QUESTION, deadline_seconds=0.2), config)
+    except RuntimeError:
+        pass
+    assert app.get_state(config).next == ("grade_generation",)
+    time.sleep(0.25)
+
+    fakes.llm.set_script({})
+    monkeypatch.setattr(budget, "DEADLINE_SECONDS", 60.0)
+    resume_query(config["configurable"]["thread_id"], db)
+
+    result = app.get_state(config).values
+    assert result.get("verified", True) is True
+    assert "budget_exhausted" not in result
+    assert result["deadline"] > time.time()
+    assert fakes.llm.calls().get(TEXT, 0) == 0
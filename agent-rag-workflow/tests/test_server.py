@@ -0,0 +1,130 @@
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.fakes import DEFAULT_SCRIPT, TEXT
+from graph.graph import app
+from server import MAX_BODY_BYTES, RAGServer
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+async def _http(server: RAGServer, raw: bytes):
+    """Send a raw request to a listening server; return the status and JSON payload."""
+    listener = await asyncio.start_server(server.handle_connection, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    async with listener:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(raw)
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def _post(body: bytes, content_length: str) -> bytes:
+    return (
+        b"POST /query HTTP/1.1\r\nHost: test\r\n"
+        + f"Content-Length: {content_length}\r\n\r\n".encode("latin-1")
+        + body
+    )
+
+
+class BlockingApp:
+    """Graph stand-in whose runs wait until released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def ainvoke(self, state, config=None):
+        await self.release.wait()
+        return {"generation": "done", "documents": []}
+
+
+def test_query_answers_with_the_graph(fakes):
+    status, payload = _run(
+        RAGServer(app).handle_request("POST", "/query", b'{"question": "What is agent memory?"}')
+    )
+
+    assert status == 200
+    assert payload["generation"] == DEFAULT_SCRIPT[TEXT][0]
+    assert payload["verified"] is True
+    assert payload["web_search"] is False
+    assert payload["sources"]
+    assert payload["usage"]["llm_calls"] > 0
+
+
+def test_query_over_http(fakes):
+    body = b'{"question": "What is agent memory?"}'
+
+    status, payload = _run(_http(RAGServer(app), _post(body, str(len(body)))))
+
+    assert status == 200
+    assert payload["question"] == "What is agent memory?"
+
+
+@pytest.mark.parametrize(
+    "method, path, body, expected",
+    [
+        ("GET", "/health", b"", 200),
+        ("POST", "/health", b"", 405),
+        ("GET", "/query", b"", 405),
+        ("GET", "/nope", b"", 404),
+        ("POST", "/query", b"not json", 400),
+        ("POST", "/query", b"[1, 2]", 400),
+        ("POST", "/query", b'{"question": "  "}', 400),
+    ],
+)
+def test_request_validation(method, path, body, expected):
+    status, payload = _run(RAGServer(app).handle_request(method, path, body))
+
+    assert status == expected
+    assert ("error" in payload) == (expected != 200)
+
+
+@pytest.mark.parametrize("content_length", ["abc", "-1", "1.5"])
+def test_malformed_content_length_is_a_bad_request(content_length):
+    status, payload = _run(_http(RAGServer(app), _post(b"{}", content_length)))
+
+    assert status == 400
+    assert payload == {"error": "Malformed request"}
+
+
+def test_oversized_body_is_rejected():
+    status, _ = _run(_http(RAGServer(app), _post(b"", str(MAX_BODY_BYTES + 1))))
+
+    assert status == 413
+
+
+def test_full_queue_is_rejected_with_503():
+    async def scenario():
+        blocking = BlockingApp()
+        server = RAGServer(blocking, max_in_flight=1, max_queue=1)
+        body = b'{"question": "q"}'
+        first = asyncio.create_task(server.handle_request("POST", "/query", body))
+        second = asyncio.create_task(server.handle_request("POST", "/query", body))
+        await asyncio.sleep(0.01)
+
+        health = await server.handle_request("GET", "/health", b"")
+        rejected = await server.handle_request("POST", "/query", body)
+        blocking.release.set()
+        return health, rejected, await first, await second
+
+    health, rejected, first, second = _run(scenario())
+
+    assert health == (200, {"status": "ok", "in_flight": 1, "queued": 1})
+    assert rejected[0] == 503
+    assert first[0] == second[0] == 200
+
+
+def test_slow_query_times_out_with_504():
+    server = RAGServer(BlockingApp(), request_timeout=0.05)
+
+    status, payload = _run(server.handle_request("POST", "/query", b'{"question": "q"}'))
+
+    assert status == 504
+    assert "Timed out" in payload["error"]
@@ -0,0 +1,81 @@
+import io
+
+import pytest
+
+from benchmarks.fakes import TEXT
+from graph.budget import initial_state
+from graph.graph import app
+from streaming import stream_query
+from utils import events
+
+QUESTION = "How do agents use memory?"
+
+
+class RecordingSink:
+    def __init__(self):
+        self.events = []
+
+    def emit(self, event):
+        self.events.append(event)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def sink():
+    recording = RecordingSink()
+    previous = events.get_sink()
+    events.set_sink(recording)
+    yield recording
+    events.set_sink(previous)
+
+
+def _stream_events(sink):
+    return [event for event in sink.events if event.step == "STREAM"]
+
+
+def test_tokens_and_draft_status_go_to_out(fakes, sink):
+    out = io.StringIO()
+
+    result = stream_query(app, initial_state(QUESTION), out=out)
+
+    text = out.getvalue()
+    assert "Draft 1: " in text
+    assert result["generation"] in text
+    assert "✓ Draft 1 accepted" in text
+    assert "First token after" in text
+    grades = [event for event in _stream_events(sink) if isinstance(event, events.Grade)]
+    assert [(grade.subject, grade.passed) for grade in grades] == [("draft", True)]
+
+
+def test_rejected_drafts_are_reported_as_failed_grades(fakes, sink):
+    fakes.llm.set_script(
+        {
+            TEXT: ["A", "B"],
+            "GradeHallucinations": [{"binary_score": False}, {"binary_score": True}],
+        }
+    )
+    out = io.StringIO()
+
+    stream_query(app, initial_state(QUESTION), out=out)
+
+    text = out.getvalue()
+    assert text.index("Draft 1: ") < text.index("✗ Draft 1 rejected") < text.index("Draft 2: ")
+    assert "✓ Draft 2 accepted" in text
+
+    grades = [event for event in _stream_events(sink) if isinstance(event, events.Grade)]
+    assert [grade.passed for grade in grades] == [False, True]
+    assert "not grounded" in grades[0].message
+
+
+def test_budget_exhaustion_is_a_decision_event(fakes, sink):
+    fakes.llm.set_script({"GradeHallucinations": [{"binary_score": False}]})
+
+    out = io.StringIO()
+
+    stream_query(app, initial_state(QUESTION, max_regenerations=0), out=out)
+
+    assert "⚠ Budget spent: draft 1 is unverified" in out.getvalue()
+    decisions = [event for event in _stream_events(sink) if isinstance(event, events.Decision)]
+    assert [decision.outcome for decision in decisions] == ["budget exhausted"]
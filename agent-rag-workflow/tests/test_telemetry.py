@@ -0,0 +1,171 @@
+import json
+import re
+
+import pytest
+
+from graph.budget import initial_state
+from graph.graph import app
+from model.cache import SQLiteLLMCache
+from utils import telemetry
+from utils.telemetry import MetricsRegistry, RunTelemetry, estimate_cost, export_run
+
+QUESTION = "How do agents use memory?"
+NODES = {"retrieve", "grade_documents", "generate", "grade_generation"}
+
+# name{labels} value, as in the Prometheus text exposition format
+SAMPLE = re.compile(r'^[a-z_]+(\{([a-z_]+="[^"]*",?)+\})? [0-9.e+-]+$')
+
+
+def _run() -> RunTelemetry:
+    run = RunTelemetry()
+    app.invoke(initial_state(QUESTION), config={"callbacks": [run]})
+    return run
+
+
+def _llm_spans(run: RunTelemetry):
+    return [span for span in run.spans.values() if span.kind == "llm"]
+
+
+@pytest.fixture
+def exports(monkeypatch, tmp_path):
+    """Fresh registry, with both export files under ``tmp_path``."""
+    monkeypatch.setattr(telemetry, "metrics", MetricsRegistry())
+    monkeypatch.setattr(telemetry, "TELEMETRY_METRICS_PATH", None)
+    monkeypatch.setattr(telemetry, "TELEMETRY_TRACE_PATH", None)
+    paths = tmp_path / "metrics.prom", tmp_path / "traces" / "spans.jsonl"
+    telemetry.configure_exports(metrics_path=str(paths[0]), trace_path=str(paths[1]))
+    return paths
+
+
+def test_node_spans_are_timed(fakes, monkeypatch):
+    monkeypatch.setattr(fakes.llm, "latency", 0.01)
+
+    summary = _run().summary()
+
+    nodes = summary["nodes"]
+    assert NODES <= set(nodes)
+    assert all(nodes[node]["calls"] == 1 for node in NODES)
+    # One generation, four document grades, each at least one LLM latency
+    assert nodes["generate"]["time_s"] >= 0.01
+    assert nodes["grade_documents"]["time_s"] >= 0.01
+    assert sum(node["time_s"] for node in nodes.values()) <= summary["time_s"]
+
+
+def test_token_totals_add_up(fakes):
+    run = _run()
+    summary = run.summary()
+
+    spans = _llm_spans(run)
+    assert summary["llm_calls"] == len(spans) == sum(fakes.llm.calls().values())
+    assert summary["prompt_tokens"] == sum(span.attributes["prompt_tokens"] for span in spans)
+    assert summary["completion_tokens"] > 0
+    for key in ("llm_calls", "prompt_tokens", "completion_tokens"):
+        assert sum(node[key] for node in summary["nodes"].values()) == summary[key]
+        assert sum(chain[key] for chain in summary["chains"].values()) == summary[key]
+    assert summary["chains"]["grade_documents"]["llm_calls"] == 4
+    assert summary["cost_usd"] == 0.0  # the fake's model name has no price
+
+
+def test_cache_hits_are_counted_without_tokens(fakes, monkeypatch, tmp_path):
+    monkeypatch.setattr(fakes.llm, "cache", SQLiteLLMCache(str(tmp_path / "llm.sqlite")))
+
+    first = _run().summary()
+    second = _run().summary()
+
+    assert first["cache_hits"] == 0
+    assert second["cache_hits"] == second["llm_calls"] == first["llm_calls"]
+    assert second["prompt_tokens"] == second["completion_tokens"] == 0
+    assert sum(fakes.llm.calls().values()) == first["llm_calls"]
+
+
+def test_cost_uses_the_reported_model(fakes, monkeypatch):
+    monkeypatch.setattr(fakes.llm, "model_name", "gpt-4o-mini-2024-07-18")
+
+    summary = _run().summary()
+
+    expected = estimate_cost("gpt-4o-mini", summary["prompt_tokens"], summary["completion_tokens"])
+    assert summary["cost_usd"] == pytest.approx(expected)
+    assert summary["cost_usd"] > 0
+
+
+def test_estimate_cost_matches_the_longest_prefix():
+    # gpt-4o-mini, not gpt-4o
+    assert estimate_cost("gpt-4o-mini-2024-07-18", 1_000_000, 1_000_000) == pytest.approx(0.75)
+    assert estimate_cost("gpt-4o-2024-08-06", 1_000_000, 0) == pytest.approx(2.50)
+    assert estimate_cost("claude-or-unknown", 1000, 1000) == 0.0
+    assert estimate_cost(None, 1000, 1000) == 0.0
+
+
+def test_estimate_cost_env_override(monkeypatch):
+    monkeypatch.setattr(telemetry, "_PRICE_INPUT", "1")
+    monkeypatch.setattr(telemetry, "_PRICE_OUTPUT", "2")
+
+    assert estimate_cost("anything", 500_000, 250_000) == pytest.approx(1.0)
+
+
+def test_prometheus_export(fakes, exports):
+    metrics_path, _ = exports
+
+    for _ in range(2):
+        export_run(_run())
+
+    lines = metrics_path.read_text(encoding="utf-8").splitlines()
+    assert not metrics_path.with_name(metrics_path.name + ".tmp").exists()
+    assert "rag_runs_total 2" in lines
+    declared = set()
+    for line in lines:
+        if line.startswith("# TYPE "):
+            _, _, metric, kind = line.split(" ")
+            assert kind in {"counter", "histogram"}
+            declared.add(metric)
+        elif not line.startswith("# HELP "):
+            assert SAMPLE.match(line), line
+            name = line.split("{")[0].split(" ")[0]
+            assert re.sub(r"_(bucket|sum|count)$", "", name) in declared or name in declared
+
+    buckets = [
+        line
+        for line in lines
+        if line.startswith('rag_node_duration_seconds_bucket{node="generate"')
+    ]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert buckets[-1] == 'rag_node_duration_seconds_bucket{node="generate",le="+Inf"} 2'
+    assert 'rag_node_duration_seconds_count{node="generate"} 2' in lines
+    assert 'rag_llm_calls_total{node="grade_documents",chain="grade_documents"} 8' in lines
+
+
+def test_otlp_json_export(fakes, exports):
+    _, trace_path = exports
+    run = _run()
+
+    export_run(run)
+    export_run(_run())
+
+    documents = [json.loads(line) for line in trace_path.read_text(encoding="utf-8").splitlines()]
+    assert len(documents) == 2
+    (resource_spans,) = documents[0]["resourceSpans"]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": telemetry.SERVICE_NAME}}
+    ]
+    (scope,) = resource_spans["scopeSpans"]
+    spans = scope["spans"]
+    assert len(spans) == len(run.spans)
+
+    span_ids = {span["spanId"] for span in spans}
+    assert {span["traceId"] for span in spans} == {run.root_id.hex}
+    for span in spans:
+        assert re.fullmatch(r"[0-9a-f]{16}", span["spanId"])
+        assert span["parentSpanId"] == "" or span["parentSpanId"] in span_ids
+        assert int(span["startTimeUnixNano"]) <= int(span["endTimeUnixNano"])
+        assert span["status"] == {"code": 1}
+        for attribute in span["attributes"]:
+            (value_type,) = attribute["value"]
+            assert value_type in {"stringValue", "intValue", "doubleValue", "boolValue"}
+
+    llm_spans = [span for span in spans if span["kind"] == 3]
+    assert len(llm_spans) == len(_llm_spans(run))
+    attributes = {a["key"]: a["value"] for a in llm_spans[0]["attributes"]}
+    assert attributes["rag.kind"] == {"stringValue": "llm"}
+    assert "intValue" in attributes["prompt_tokens"]
+    assert "rag.chain" in attributes
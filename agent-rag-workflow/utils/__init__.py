@@ -9,6 +9,7 @@ from utils.pretty_print import (
     print_success,
     print_workflow_start,
 )
+from utils.stats import latency_summary, percentile
 
 __all__ = [
     "get_logger",
@@ -19,4 +20,6 @@ __all__ = [
     "print_workflow_start",
     "print_error",
     "print_success",
+    "latency_summary",
+    "percentile",
 ]
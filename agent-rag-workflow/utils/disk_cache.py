@@ -0,0 +1,163 @@
+"""SQLite-backed key/value cache with TTL, LRU eviction and hit/miss counters."""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+
+class DiskCache:
+    """
+    Small persistent key/value store shared by the LLM, embedding and search caches.
+
+    Entries live in a single SQLite table partitioned by namespace. Reads refresh
+    an entry's access time so eviction is least-recently-used once the namespace
+    grows past ``max_entries``. Expired entries count as misses and are removed
+    lazily on lookup. Safe to share between threads; WAL mode lets several
+    processes use the same file.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        namespace: str = "default",
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Open (or create) a cache file.
+
+        Args:
+            path: SQLite database file
+            namespace: Logical partition inside the file
+            ttl_seconds: Entry lifetime; None keeps entries until evicted
+            max_entries: LRU size bound for this namespace; None means unbounded
+        """
+        self.path = Path(path)
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, accessed_at)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value for ``key``, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+
+            if row is not None and self._expired(row[1], now):
+                self._conn.execute(
+                    "DELETE FROM cache WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                self._conn.commit()
+                row = None
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key),
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store ``value`` under ``key``, evicting least-recently-used entries if full."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, value, now, now),
+            )
+            if self.max_entries is not None:
+                self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key)
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace."""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions and entries
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(self),
+        }
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _evict(self) -> None:
+        count = self._conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        self._conn.execute(
+            """
+            DELETE FROM cache WHERE namespace = ? AND key IN (
+                SELECT key FROM cache WHERE namespace = ?
+                ORDER BY accessed_at ASC LIMIT ?
+            )
+            """,
+            (self.namespace, self.namespace, overflow),
+        )
+        self.evictions += overflow
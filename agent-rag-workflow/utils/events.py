@@ -0,0 +1,244 @@
+"""
+Structured workflow events and pluggable sinks.
+
+Graph nodes and routing functions report progress by emitting typed events
+(:class:`NodeStart`, :class:`NodeEnd`, :class:`Decision`, :class:`Grade`)
+through :func:`emit`. Where they go is decided once, by the process-wide sink:
+
+- :class:`NullSink` (default): drops events; costs a no-op call per event
+- :class:`ConsoleSink`: the Rich step-by-step output (``main.py --verbose``)
+- :class:`JSONLSink`: buffered JSON lines written by a background thread
+  (``main.py --events-file``), safe to use from batch and server mode
+- :class:`FanoutSink`: several of the above at once
+
+Events carry the ID of the run that emitted them (see :func:`bind_run`), so
+interleaved output from concurrent runs can be told apart.
+"""
+
+import atexit
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import KW_ONLY, asdict, dataclass, field
+from pathlib import Path
+from typing import ClassVar, Iterator, List, Optional, Protocol
+
+# Levels, rendered by the console sink in the colours print_step always used
+START = "start"
+CHECK = "check"
+OK = "ok"
+NOTICE = "notice"
+FAIL = "fail"
+INFO = "info"
+
+LEVEL_STYLES = {
+    START: "cyan",
+    CHECK: "yellow",
+    OK: "green",
+    NOTICE: "magenta",
+    FAIL: "red",
+    INFO: "dim",
+}
+
+current_run: ContextVar[Optional[str]] = ContextVar("current_run", default=None)
+
+
+@dataclass(frozen=True, slots=True)
+class Event:
+    """Base event: a display step name and a human-readable message."""
+
+    type: ClassVar[str] = "event"
+
+    step: str
+    message: str
+    _: KW_ONLY
+    level: str = INFO
+    ts: float = field(default_factory=time.time)
+    run: Optional[str] = field(default_factory=current_run.get)
+
+    def as_dict(self) -> dict:
+        return {"type": self.type, **asdict(self)}
+
+
+@dataclass(frozen=True, slots=True)
+class NodeStart(Event):
+    """A graph node or routing function started."""
+
+    type: ClassVar[str] = "node_start"
+
+    node: str = ""
+    level: str = field(default=START, kw_only=True)
+
+
+@dataclass(frozen=True, slots=True)
+class NodeEnd(Event):
+    """A graph node finished."""
+
+    type: ClassVar[str] = "node_end"
+
+    node: str = ""
+    level: str = field(default=OK, kw_only=True)
+
+
+@dataclass(frozen=True, slots=True)
+class Decision(Event):
+    """A routing decision; ``outcome`` is the branch taken."""
+
+    type: ClassVar[str] = "decision"
+
+    outcome: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class Grade(Event):
+    """A grader verdict on a document, a generation's grounding or an answer."""
+
+    type: ClassVar[str] = "grade"
+
+    subject: str = ""
+    passed: bool = False
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "level", OK if self.passed else FAIL)
+
+
+class EventSink(Protocol):
+    def emit(self, event: Event) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class NullSink:
+    """Discards every event."""
+
+    def emit(self, event: Event) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class ConsoleSink:
+    """Renders events as the Rich step lines of :func:`utils.pretty_print.print_step`."""
+
+    def emit(self, event: Event) -> None:
+        from utils.pretty_print import print_step
+
+        print_step(event.step, event.message, LEVEL_STYLES.get(event.level, "cyan"))
+
+    def close(self) -> None:
+        pass
+
+
+class JSONLSink:
+    """
+    Appends events to a JSON lines file from a background thread.
+
+    ``emit`` only enqueues; the writer thread drains the queue in batches and
+    flushes at most every ``flush_interval`` seconds, so request threads never
+    wait on disk. :meth:`close` (also run at exit) writes whatever is left.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        """
+        Args:
+            path: Output file (appended to; parent directories are created)
+            flush_interval: Longest time an event may sit unwritten
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._queue: "queue.SimpleQueue[Optional[Event]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="event-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, event: Event) -> None:
+        self._queue.put(event)
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    def _run(self) -> None:
+        with self.path.open("a", encoding="utf-8") as f:
+            while True:
+                batch: List[Event] = []
+                deadline = time.monotonic() + self.flush_interval
+                stop = False
+                while (timeout := deadline - time.monotonic()) > 0:
+                    try:
+                        event = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                    if event is None:
+                        stop = True
+                        break
+                    batch.append(event)
+
+                if batch:
+                    f.writelines(
+                        json.dumps(event.as_dict(), ensure_ascii=False) + "\n" for event in batch
+                    )
+                    f.flush()
+                if stop:
+                    return
+
+
+class FanoutSink:
+    """Sends every event to several sinks."""
+
+    def __init__(self, sinks: List[EventSink]):
+        self.sinks = sinks
+
+    def emit(self, event: Event) -> None:
+        for sink in self.sinks:
+            sink.emit(event)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+
+_sink: EventSink = NullSink()
+
+
+def set_sink(sink: EventSink) -> EventSink:
+    """
+    Replace the process-wide sink, closing the previous one.
+
+    Args:
+        sink: Sink receiving all subsequent events
+
+    Returns:
+        The sink now in use
+    """
+    global _sink
+    previous, _sink = _sink, sink
+    if previous is not sink:
+        previous.close()
+    return sink
+
+
+def get_sink() -> EventSink:
+    """The process-wide sink."""
+    return _sink
+
+
+def emit(event: Event) -> None:
+    """Send an event to the process-wide sink."""
+    _sink.emit(event)
+
+
+@contextmanager
+def bind_run(run: str) -> Iterator[None]:
+    """Tag events emitted inside the block (and tasks it starts) with ``run``."""
+    token = current_run.set(run)
+    try:
+        yield
+    finally:
+        current_run.reset(token)
@@ -1,6 +1,6 @@
 """Pretty printing utilities for terminal output."""
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from rich.console import Console
 from rich.markdown import Markdown
@@ -22,12 +22,13 @@ def print_step(step_name: str, message: str, style: str = "cyan") -> None:
     console.print(f"[bold {style}]→ {step_name}:[/bold {style}] {message}")
 
 
-def print_final_result(result: Dict[str, Any]) -> None:
+def print_final_result(result: Dict[str, Any], telemetry: Optional[Dict[str, Any]] = None) -> None:
     """
     Format and display the final result beautifully.
 
     Args:
         result: Dictionary containing question, generation, web_search, and documents
+        telemetry: Optional run summary from utils.telemetry.RunTelemetry.summary()
     """
     console.print("\n")
 
@@ -60,6 +61,10 @@ def print_final_result(result: Dict[str, Any]) -> None:
     web_search_icon = "✅" if result["web_search"] else "❌"
     table.add_row("Web Search Used", f"{web_search_icon} {'Yes' if result['web_search'] else 'No'}")
 
+    # Budget ran out before the answer passed grading
+    if result.get("verified") is False:
+        table.add_row("Unverified", f"⚠️ {result.get('budget_exhausted', 'retry limit reached')}")
+
     # Documents Count
     doc_count = len(result["documents"])
     table.add_row("Documents Retrieved", str(doc_count))
@@ -80,9 +85,46 @@ def print_final_result(result: Dict[str, Any]) -> None:
             table.add_row("Sources", source_text)
 
     console.print(table)
+
+    if telemetry:
+        print_telemetry(telemetry)
+
     console.print("\n")
 
 
+def print_telemetry(telemetry: Dict[str, Any]) -> None:
+    """
+    Display per-node latency, LLM calls, tokens and estimated cost for one run.
+
+    Args:
+        telemetry: Run summary from utils.telemetry.RunTelemetry.summary()
+    """
+    table = Table(title="⏱️ Performance", show_header=True, header_style="bold magenta")
+    table.add_column("Node", style="cyan")
+    table.add_column("Time", justify="right", style="yellow")
+    table.add_column("LLM Calls", justify="right")
+    table.add_column("Cache Hits", justify="right")
+    table.add_column("Tokens (in/out)", justify="right")
+    table.add_column("Cost", justify="right", style="green")
+
+    def add_row(name: str, stats: Dict[str, Any], **kwargs: Any) -> None:
+        table.add_row(
+            name,
+            f"{stats['time_s']:.2f}s",
+            str(stats["llm_calls"]),
+            str(stats["cache_hits"]),
+            f"{stats['prompt_tokens']}/{stats['completion_tokens']}",
+            f"${stats['cost_usd']:.4f}",
+            **kwargs,
+        )
+
+    for node, stats in telemetry["nodes"].items():
+        add_row(node, stats)
+    add_row("Total", telemetry, style="bold", end_section=True)
+
+    console.print(table)
+
+
 def print_header() -> None:
     """Print the application header."""
     console.print("\n")
@@ -0,0 +1,42 @@
+"""Latency statistics helpers for benchmarks and run summaries."""
+
+import math
+from typing import Dict, Sequence
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Samples (any order)
+        pct: Percentile in [0, 100]
+
+    Returns:
+        The percentile value, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def latency_summary(values: Sequence[float]) -> Dict[str, float]:
+    """
+    Summarize latency samples.
+
+    Args:
+        values: Latencies in seconds
+
+    Returns:
+        Dictionary with count, mean, p50, p95, p99 and max
+    """
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values) if values else 0.0,
+    }
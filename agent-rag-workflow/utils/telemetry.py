@@ -0,0 +1,568 @@
+"""
+Per-run latency, token and cost instrumentation for the RAG graph.
+
+A :class:`RunTelemetry` is a LangChain callback handler passed to one graph
+invocation (``app.invoke(..., config={"callbacks": [run]})``). It records a span
+for every node, chain, LLM, retriever and tool call, and rolls LLM calls, token
+usage, estimated cost and response-cache hits up per node and per chain.
+
+Finished runs are handed to :func:`export_run`, which aggregates them in the
+process-wide :data:`metrics` registry and, when configured, writes:
+
+- Prometheus text exposition (``TELEMETRY_METRICS_PATH``), rewritten atomically
+  after every run so a node_exporter textfile collector can scrape it
+- OpenTelemetry-style JSON spans (``TELEMETRY_TRACE_PATH``), one OTLP
+  ``resourceSpans`` document appended per run (JSON lines)
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+from uuid import UUID
+
+from dotenv import load_dotenv
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from utils.stats import latency_summary
+
+load_dotenv()
+
+TELEMETRY_METRICS_PATH = os.getenv("TELEMETRY_METRICS_PATH")
+TELEMETRY_TRACE_PATH = os.getenv("TELEMETRY_TRACE_PATH")
+
+# USD per 1M (input, output) tokens, matched by longest model-name prefix
+MODEL_PRICES = {
+    "gpt-5": (1.25, 10.00),
+    "gpt-5-mini": (0.25, 2.00),
+    "gpt-5-nano": (0.05, 0.40),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+}
+
+# Set both to override the table (e.g. for a model it does not list)
+_PRICE_INPUT = os.getenv("LLM_PRICE_INPUT_PER_1M")
+_PRICE_OUTPUT = os.getenv("LLM_PRICE_OUTPUT_PER_1M")
+
+# Histogram buckets (seconds) for node and run durations
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+SERVICE_NAME = "agent-rag-workflow"
+
+
+def estimate_cost(model: Optional[str], prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Estimate the USD cost of one LLM call.
+
+    Args:
+        model: Model name as reported by the provider (e.g. "gpt-5-mini-2025-08-07")
+        prompt_tokens: Input tokens
+        completion_tokens: Output tokens
+
+    Returns:
+        Estimated cost, or 0.0 for unknown models
+    """
+    if _PRICE_INPUT and _PRICE_OUTPUT:
+        prices = (float(_PRICE_INPUT), float(_PRICE_OUTPUT))
+    else:
+        matches = [name for name in MODEL_PRICES if model and model.startswith(name)]
+        if not matches:
+            return 0.0
+        prices = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+@dataclass
+class Span:
+    """One traced call: a graph node, chain, LLM, retriever or tool run."""
+
+    run_id: UUID
+    parent_id: Optional[UUID]
+    name: str
+    kind: str  # "graph", "node", "chain", "llm", "retriever" or "tool"
+    start_ns: int
+    end_ns: Optional[int] = None
+    node: Optional[str] = None
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_s(self) -> float:
+        if self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+def _usage_totals() -> Dict[str, Any]:
+    return {
+        "calls": 0,
+        "time_s": 0.0,
+        "llm_calls": 0,
+        "cache_hits": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cost_usd": 0.0,
+    }
+
+
+class RunTelemetry(BaseCallbackHandler):
+    """
+    Callback handler collecting spans for a single graph run.
+
+    Thread-safe: grader batches and async runs deliver callbacks from worker
+    threads. Create one instance per invocation.
+    """
+
+    run_inline = True
+
+    def __init__(self):
+        self.spans: Dict[UUID, Span] = {}
+        self.root_id: Optional[UUID] = None
+        self._lock = threading.Lock()
+
+    # Callback hooks
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        name = _run_name(serialized, kwargs)
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            kind = "graph"
+        elif node is not None and name == node:
+            kind = "node"
+        else:
+            kind = "chain"
+        self._start(run_id, parent_run_id, name, kind, node)
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def on_chat_model_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        messages: Any,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start_llm(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        prompts: List[str],
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        self._start_llm(serialized, run_id, parent_run_id, metadata, kwargs)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        prompt_tokens, completion_tokens, cache_hit = _token_usage(response)
+        if cache_hit:
+            # Replayed usage was paid for by the original call; count the hit instead
+            prompt_tokens = completion_tokens = 0
+        llm_output = response.llm_output or {}
+
+        with self._lock:
+            span = self.spans.get(run_id)
+            if span is None:
+                return
+            model = llm_output.get("model_name") or span.attributes.get("model")
+            span.attributes.update(
+                {
+                    "model": model,
+                    "cache_hit": cache_hit,
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "cost_usd": estimate_cost(model, prompt_tokens, completion_tokens),
+                }
+            )
+            span.end_ns = time.time_ns()
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def on_retriever_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        query: str,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        self._start(run_id, parent_run_id, _run_name(serialized, kwargs), "retriever", node)
+
+    def on_retriever_end(self, documents: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_retriever_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    def on_tool_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        input_str: str,
+        *,
+        run_id: UUID,
+        parent_run_id: Optional[UUID] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        self._start(run_id, parent_run_id, _run_name(serialized, kwargs), "tool", node)
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error)
+
+    # Bookkeeping
+
+    def _start(
+        self,
+        run_id: UUID,
+        parent_id: Optional[UUID],
+        name: str,
+        kind: str,
+        node: Optional[str],
+    ) -> Span:
+        span = Span(run_id, parent_id, name, kind, time.time_ns(), node=node)
+        with self._lock:
+            self.spans[run_id] = span
+            if parent_id is None and self.root_id is None:
+                self.root_id = run_id
+        return span
+
+    def _start_llm(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        run_id: UUID,
+        parent_id: Optional[UUID],
+        metadata: Optional[Dict[str, Any]],
+        kwargs: Dict[str, Any],
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        span = self._start(run_id, parent_id, _run_name(serialized, kwargs), "llm", node)
+        params = kwargs.get("invocation_params") or {}
+        span.attributes["model"] = params.get("model") or params.get("model_name")
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            span = self.spans.get(run_id)
+            if span is not None:
+                span.end_ns = time.time_ns()
+                if error is not None:
+                    span.error = f"{type(error).__name__}: {error}"
+
+    def _chain_for(self, span: Span) -> str:
+        # Nearest named ancestor; anonymous RunnableSequence/RunnableParallel wrappers are skipped
+        parent = self.spans.get(span.parent_id)
+        while parent is not None and parent.kind == "chain":
+            if not parent.name.startswith("Runnable"):
+                return parent.name
+            parent = self.spans.get(parent.parent_id)
+        return span.node or "unknown"
+
+    # Reporting
+
+    @property
+    def wall_time_s(self) -> float:
+        root = self.spans.get(self.root_id)
+        return root.duration_s if root else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Roll the run up per node and per chain.
+
+        Returns:
+            Dictionary with run totals plus ``nodes`` and ``chains`` breakdowns,
+            each entry holding calls, time_s, llm_calls, cache_hits,
+            prompt_tokens, completion_tokens and cost_usd
+        """
+        with self._lock:
+            spans = list(self.spans.values())
+
+        totals = _usage_totals()
+        nodes: Dict[str, Dict[str, Any]] = defaultdict(_usage_totals)
+        chains: Dict[str, Dict[str, Any]] = defaultdict(_usage_totals)
+
+        for span in spans:
+            if span.kind == "node":
+                nodes[span.name]["calls"] += 1
+                nodes[span.name]["time_s"] += span.duration_s
+            elif span.kind == "llm":
+                chain = chains[self._chain_for(span)]
+                chain["calls"] += 1
+                chain["time_s"] += span.duration_s
+                for bucket in (totals, nodes[span.node or "unknown"], chain):
+                    bucket["llm_calls"] += 1
+                    bucket["cache_hits"] += int(bool(span.attributes.get("cache_hit")))
+                    bucket["prompt_tokens"] += span.attributes.get("prompt_tokens", 0)
+                    bucket["completion_tokens"] += span.attributes.get("completion_tokens", 0)
+                    bucket["cost_usd"] += span.attributes.get("cost_usd", 0.0)
+
+        totals["calls"] = 1
+        totals["time_s"] = self.wall_time_s
+        return {**totals, "nodes": dict(nodes), "chains": dict(chains)}
+
+    def otel_json(self) -> Dict[str, Any]:
+        """
+        Export the run as an OTLP/JSON ``ExportTraceServiceRequest`` document.
+
+        Returns:
+            Dictionary ready for ``json.dumps``; the trace ID is the graph run ID
+        """
+        with self._lock:
+            spans = list(self.spans.values())
+
+        trace_id = (self.root_id or spans[0].run_id).hex if spans else ""
+        otel_spans = []
+        for span in spans:
+            attributes = {"rag.kind": span.kind, **span.attributes}
+            if span.node:
+                attributes["rag.node"] = span.node
+            if span.kind == "llm":
+                attributes["rag.chain"] = self._chain_for(span)
+            otel_spans.append(
+                {
+                    "traceId": trace_id,
+                    "spanId": _span_id(span.run_id),
+                    "parentSpanId": _span_id(span.parent_id) if span.parent_id else "",
+                    "name": span.name,
+                    "kind": 3 if span.kind == "llm" else 1,  # CLIENT for API calls, else INTERNAL
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                    "attributes": [
+                        _otel_attribute(key, value)
+                        for key, value in attributes.items()
+                        if value is not None
+                    ],
+                    "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+                }
+            )
+
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [_otel_attribute("service.name", SERVICE_NAME)]
+                    },
+                    "scopeSpans": [{"scope": {"name": __name__}, "spans": otel_spans}],
+                }
+            ]
+        }
+
+
+def _run_name(serialized: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> str:
+    if kwargs.get("name"):
+        return kwargs["name"]
+    if serialized:
+        return serialized.get("name") or (serialized.get("id") or ["unknown"])[-1]
+    return "unknown"
+
+
+def _token_usage(response: LLMResult) -> tuple:
+    prompt_tokens = completion_tokens = 0
+    cache_hit = False
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            if message is None:
+                continue
+            cache_hit = cache_hit or bool(message.response_metadata.get("cache_hit"))
+            usage = getattr(message, "usage_metadata", None) or {}
+            prompt_tokens += usage.get("input_tokens", 0)
+            completion_tokens += usage.get("output_tokens", 0)
+
+    if not prompt_tokens and not completion_tokens:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        completion_tokens = usage.get("completion_tokens", 0)
+    return prompt_tokens, completion_tokens, cache_hit
+
+
+def _span_id(run_id: UUID) -> str:
+    return run_id.hex[:16]
+
+
+def _otel_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class _Histogram:
+    def __init__(self, buckets=DURATION_BUCKETS, max_samples: int = 10_000):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        # Raw samples (bounded) for exact percentiles in run summaries
+        self.samples: Deque[float] = deque(maxlen=max_samples)
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.count += 1
+        self.sum += value
+        self.samples.append(value)
+
+
+class MetricsRegistry:
+    """Process-wide aggregate of finished runs, rendered as Prometheus text."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.runs = 0
+        self.run_duration = _Histogram()
+        self.node_duration: Dict[str, _Histogram] = defaultdict(_Histogram)
+        # (node, chain) -> counters
+        self.llm: Dict[tuple, Dict[str, Any]] = defaultdict(_usage_totals)
+
+    def record(self, run: RunTelemetry) -> None:
+        """Add a finished run to the aggregate."""
+        with run._lock:
+            spans = list(run.spans.values())
+
+        with self._lock:
+            self.runs += 1
+            self.run_duration.observe(run.wall_time_s)
+            for span in spans:
+                if span.kind == "node":
+                    self.node_duration[span.name].observe(span.duration_s)
+                elif span.kind == "llm":
+                    counters = self.llm[(span.node or "unknown", run._chain_for(span))]
+                    counters["llm_calls"] += 1
+                    counters["cache_hits"] += int(bool(span.attributes.get("cache_hit")))
+                    counters["prompt_tokens"] += span.attributes.get("prompt_tokens", 0)
+                    counters["completion_tokens"] += span.attributes.get("completion_tokens", 0)
+                    counters["cost_usd"] += span.attributes.get("cost_usd", 0.0)
+                    counters["time_s"] += span.duration_s
+
+    def node_latency(self) -> Dict[str, Dict[str, float]]:
+        """Latency summary (mean, p50, p95, p99, max) per node across recorded runs."""
+        with self._lock:
+            return {
+                node: latency_summary(list(histogram.samples))
+                for node, histogram in sorted(self.node_duration.items())
+            }
+
+    def prometheus_text(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                "# HELP rag_runs_total Graph runs completed.",
+                "# TYPE rag_runs_total counter",
+                f"rag_runs_total {self.runs}",
+            ]
+            lines += _histogram_lines(
+                "rag_run_duration_seconds", "End-to-end graph run time.", {"": self.run_duration}
+            )
+            lines += _histogram_lines(
+                "rag_node_duration_seconds", "Time spent per graph node.", self.node_duration
+            )
+
+            counters = (
+                ("rag_llm_calls_total", "LLM calls, including cache hits.", "llm_calls"),
+                ("rag_llm_cache_hits_total", "LLM calls served from cache.", "cache_hits"),
+                ("rag_llm_prompt_tokens_total", "Prompt tokens used.", "prompt_tokens"),
+                ("rag_llm_completion_tokens_total", "Completion tokens used.", "completion_tokens"),
+                ("rag_llm_cost_usd_total", "Estimated LLM spend in USD.", "cost_usd"),
+                ("rag_llm_duration_seconds_total", "Time spent waiting on LLM calls.", "time_s"),
+            )
+            for metric, help_text, key in counters:
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                for (node, chain), values in sorted(self.llm.items()):
+                    lines.append(f'{metric}{{node="{node}",chain="{chain}"}} {values[key]:g}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric: str, help_text: str, histograms: Dict[str, _Histogram]) -> List[str]:
+    lines = [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+    for node, histogram in sorted(histograms.items()):
+        labels = f'node="{node}",' if node else ""
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f'{metric}_bucket{{{labels}le="{bound:g}"}} {count}')
+        lines.append(f'{metric}_bucket{{{labels}le="+Inf"}} {histogram.count}')
+        suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+        lines.append(f"{metric}_sum{suffix} {histogram.sum:g}")
+        lines.append(f"{metric}_count{suffix} {histogram.count}")
+    return lines
+
+
+metrics = MetricsRegistry()
+
+_export_lock = threading.Lock()
+
+
+def configure_exports(metrics_path: Optional[str] = None, trace_path: Optional[str] = None) -> None:
+    """
+    Override the export files set by ``TELEMETRY_METRICS_PATH`` / ``TELEMETRY_TRACE_PATH``.
+
+    Args:
+        metrics_path: Prometheus text file rewritten after every run
+        trace_path: JSON lines file receiving one OTLP document per run
+    """
+    global TELEMETRY_METRICS_PATH, TELEMETRY_TRACE_PATH
+    if metrics_path:
+        TELEMETRY_METRICS_PATH = metrics_path
+    if trace_path:
+        TELEMETRY_TRACE_PATH = trace_path
+
+
+def export_run(run: RunTelemetry) -> None:
+    """
+    Record a finished run in :data:`metrics` and write the configured export files.
+
+    Args:
+        run: Telemetry collected for one graph invocation
+    """
+    metrics.record(run)
+
+    with _export_lock:
+        if TELEMETRY_TRACE_PATH:
+            path = Path(TELEMETRY_TRACE_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as f:
+                f.write(json.dumps(run.otel_json()) + "\n")
+
+        if TELEMETRY_METRICS_PATH:
+            path = Path(TELEMETRY_METRICS_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(metrics.prometheus_text(), encoding="utf-8")
+            os.replace(tmp_path, path)
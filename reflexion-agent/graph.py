@@ -1,4 +1,8 @@
-from typing import TypedDict, Literal
+import sqlite3
+from pathlib import Path
+from typing import TypedDict, Literal, Optional
+from langgraph.checkpoint.base import BaseCheckpointSaver
+from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.graph import StateGraph, END
 
 from chains import actor_chain, revisor_chain
@@ -99,8 +103,13 @@ def should_continue(state: GraphState) -> Literal["execute_tools", "end"]:
 
 
 # Build the graph
-def create_graph():
-    """Create and compile the reflexion agent graph."""
+def create_graph(checkpointer: Optional[BaseCheckpointSaver] = None):
+    """Create and compile the reflexion agent graph.
+
+    With a checkpointer, state is saved after every node so a failed run can be
+    resumed (``graph.invoke(None, {"configurable": {"thread_id": ...}})``)
+    without redoing the draft and revisions that already completed.
+    """
 
     # Initialize the graph with our state schema
     workflow = StateGraph(GraphState)
@@ -131,7 +140,15 @@ def create_graph():
     )
 
     # Compile the graph
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def open_checkpointer(path: str) -> SqliteSaver:
+    """Open (creating if needed) a SQLite checkpoint database in WAL mode."""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return SqliteSaver(conn)
 
 
 # Create the compiled graph
@@ -1,9 +1,35 @@
-from graph import graph
+import argparse
+import uuid
+
+from graph import create_graph, graph, open_checkpointer
 
 
 def main():
     """Run the Reflexion agent with a research question."""
 
+    parser = argparse.ArgumentParser(description="Reflexion agent - AI research assistant")
+    parser.add_argument(
+        "--checkpoint-db",
+        metavar="PATH",
+        help="Checkpoint the run in this SQLite file so a failed run can be resumed",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="THREAD_ID",
+        help="Resume a failed checkpointed run from its last completed step",
+    )
+    args = parser.parse_args()
+
+    if args.resume and not args.checkpoint_db:
+        parser.error("--resume requires --checkpoint-db")
+
+    app = graph
+    config = None
+    if args.checkpoint_db:
+        app = create_graph(open_checkpointer(args.checkpoint_db))
+        thread_id = args.resume or uuid.uuid4().hex[:12]
+        config = {"configurable": {"thread_id": thread_id}}
+
     # Example research question
     # question = "What are the key architectural components of a Reflexion agent?"
     question = "What is the key difference in Reflection agent and Reflexion agent?"
@@ -11,7 +37,6 @@ def main():
     print("=" * 80)
     print("REFLEXION AGENT - AI Research Assistant")
     print("=" * 80)
-    print(f"\nQuestion: {question}\n")
 
     # Initial state
     initial_state = {
@@ -24,9 +49,21 @@ def main():
         "max_revisions": 2,  # Allow up to 2 revisions
     }
 
+    if args.resume:
+        snapshot = app.get_state(config)
+        if not snapshot.values:
+            print(f"\n❌ No checkpoint for thread {args.resume}")
+            return
+        print(f"\nQuestion: {snapshot.values['question']}\n")
+        print(f"Resuming thread {args.resume} at: {', '.join(snapshot.next) or 'end'}")
+        # None input continues from the last checkpoint instead of starting over
+        initial_state = None
+    else:
+        print(f"\nQuestion: {question}\n")
+
     # Run the graph
     try:
-        final_state = graph.invoke(initial_state)
+        final_state = app.invoke(initial_state, config=config)
 
         # Display final results
         print("\n" + "=" * 80)
@@ -40,6 +77,11 @@ def main():
 
     except Exception as e:
         print(f"\n❌ Error running agent: {e}")
+        if config:
+            print(
+                f"Resume with: python main.py --checkpoint-db {args.checkpoint_db} "
+                f"--resume {config['configurable']['thread_id']}"
+            )
         raise
 
 